@@ -1,11 +1,19 @@
 """Flask 애플리케이션 메인 파일"""
+import importlib.util
+import click
 from flask import Flask, jsonify
 from flask_cors import CORS
 import logging
 import atexit
 from config import Config
-from routes import news_bp, health_bp
-from services import cleanup_resources
+from routes import news_bp, health_bp, async_news_bp, stream_bp
+from services.async_service import is_available as async_service_available
+from services.news_service import close_backend_session
+from services.quote_stream import quote_hub
+from services.news_pages import build_news_pages, start_page_builder, stop_page_builder
+from utils.json_provider import TimedJSONProvider
+from utils.tracing import flush_stage_stats
+from services import cleanup_resources, start_hot_ticker_refresher, load_cache_snapshot, start_snapshot_timer
 
 # 로깅 설정
 logging.basicConfig(
@@ -15,10 +23,29 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _register_async_routes(app):
+    """의존성(httpx, Flask[async])이 있을 때만 /api/async/* 라우트를 등록합니다."""
+    if not Config.ENABLE_ASYNC_ROUTES:
+        return
+    
+    # Flask async 뷰 실행에 필요 (import하지 않고 설치 여부만 확인)
+    if importlib.util.find_spec('asgiref') is None:
+        logger.warning("Async routes disabled: asgiref is not installed (install Flask[async] to enable them)")
+        return
+    
+    if not async_service_available():
+        logger.warning("Async routes disabled: install httpx to enable them")
+        return
+    
+    app.register_blueprint(async_news_bp)
+
+
 def create_app():
     """Flask 앱을 생성하고 설정합니다."""
     app = Flask(__name__)
     app.config.from_object(Config)
+    # 응답 직렬화 시간을 단계별 메트릭스에 기록
+    app.json = TimedJSONProvider(app)
     
     # CORS 설정 - 프론트엔드(React) 개발 서버에서의 요청을 허용
     CORS(app)
@@ -29,6 +56,10 @@ def create_app():
     # Blueprint 등록
     app.register_blueprint(news_bp)
     app.register_blueprint(health_bp)
+    # gthread 워커에서는 구독 연결마다 요청 스레드를 하나씩 차지하므로 운영에서는 create_stream_app으로 분리
+    if Config.QUOTE_STREAM_IN_APP:
+        app.register_blueprint(stream_bp)
+    _register_async_routes(app)
     
     # 에러 핸들러 등록
     @app.errorhandler(404)
@@ -40,16 +71,66 @@ def create_app():
         logger.error(f"Internal server error: {str(error)}")
         return jsonify({"error": "Internal server error"}), 500
     
+    # 이전 실행의 캐시 스냅샷으로 warm start (선택)
+    load_cache_snapshot()
+    start_snapshot_timer()
+    
+    # 인기 티커 선제 갱신 (선택)
+    if Config.HOT_REFRESH_ENABLED:
+        start_hot_ticker_refresher()
+    
+    # 오늘/최근 날짜 뉴스 페이지 사전 생성 (선택)
+    if Config.PRECOMPUTE_ENABLED:
+        start_page_builder(app)
+    
+    @app.cli.command('build-news-pages')
+    def build_news_pages_command():
+        """오늘/최근 날짜 뉴스 페이지를 한 번 만들고 페이지별 빌드 시간을 출력합니다."""
+        for key, result in build_news_pages(app).items():
+            build_ms = result.get('build_ms')
+            click.echo(f"{key}: {result['status']}" + (f" ({build_ms:.0f}ms)" if build_ms is not None else ""))
+    
     # 종료 시 리소스 정리
+    atexit.register(stop_page_builder)
+    atexit.register(quote_hub.stop)
     atexit.register(cleanup_resources)
+    atexit.register(close_backend_session)
+    atexit.register(flush_stage_stats)
     
     logger.info(f"Flask app created in {Config.ENVIRONMENT} mode")
-    logger.info(f"Cache settings: size={Config.STOCK_CACHE_SIZE}, duration={Config.CACHE_DURATION}s")
+    logger.info(f"Cache settings: size={Config.STOCK_CACHE_SIZE}, duration={Config.CACHE_DURATION}s, hard_duration={Config.CACHE_HARD_DURATION}s")
     logger.info(f"Thread pool: max_workers={Config.MAX_WORKERS}")
     
     return app
 
 
+def create_stream_app():
+    """실시간 시세 구독(/api/stock-stream)만 제공하는 앱을 생성합니다.
+    
+    gevent 워커(gunicorn -k gevent)로 띄우면 구독 연결이 요청 스레드 대신 greenlet을 차지하므로,
+    동시 구독 수가 메인 앱의 --threads에 묶이지 않습니다.
+    """
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.json = TimedJSONProvider(app)
+    CORS(app)
+    Config.validate_config()
+    
+    app.register_blueprint(stream_bp)
+    app.register_blueprint(health_bp)
+    
+    @app.errorhandler(404)
+    def not_found(error):
+        return jsonify({"error": "Endpoint not found"}), 404
+    
+    atexit.register(quote_hub.stop)
+    atexit.register(cleanup_resources)
+    atexit.register(flush_stage_stats)
+    
+    logger.info(f"Quote stream app created (max_subscribers={Config.QUOTE_STREAM_MAX_SUBSCRIBERS})")
+    return app
+
+
 if __name__ == '__main__':
     app = create_app()
     app.run(debug=Config.DEBUG, port=5000)
@@ -0,0 +1,8 @@
+"""오프라인 부하 테스트/벤치마크 도구
+
+- fake_backend: 합성 뉴스 페이로드를 주는 Spring 백엔드 대역 서버
+- stub_quotes: 지연/에러율을 조절할 수 있는 yfinance 대역 (yf.download, yf.Ticker 대체)
+- run: 시나리오를 test client 또는 gunicorn으로 실행하고 결과를 출력
+
+사용 예: python -m bench.run --scenario warm --requests 500 --concurrency 8
+"""
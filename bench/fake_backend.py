@@ -0,0 +1,133 @@
+"""Spring 백엔드 대역 서버
+
+/api/news/by-date, /api/news/top, /api/news/list, /api/news/detail 형식의
+합성 페이로드를 응답합니다. 같은 파라미터에는 항상 같은 페이로드를 주므로
+실행 간 결과를 비교할 수 있습니다.
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+CATEGORIES = ('economy', 'tech', 'energy', 'finance', 'healthcare', 'consumer', 'industrial', 'global')
+
+
+def make_universe(size, invalid_ratio=0.0, seed=0):
+    """합성 티커 목록 (X로 시작하는 티커는 stub_quotes에서 존재하지 않는 티커로 처리)"""
+    rng = random.Random(seed)
+    invalid_count = int(size * invalid_ratio)
+    tickers = [f"T{i:04d}" for i in range(size - invalid_count)]
+    tickers += [f"X{i:04d}" for i in range(invalid_count)]
+    rng.shuffle(tickers)
+    return tickers
+
+
+class FakeBackend:
+    """합성 뉴스 페이로드를 주는 HTTP 서버 (별도 스레드에서 실행)"""
+    def __init__(self, port=0, categories=4, articles=20, tickers_per_article=3,
+                 universe=None, latency=0.0, seed=0):
+        self.categories = CATEGORIES[:categories]
+        self.articles = articles
+        self.tickers_per_article = tickers_per_article
+        self.universe = universe or make_universe(500, seed=seed)
+        self.latency = latency
+        self.seed = seed
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _articles(self, key, count):
+        rng = random.Random(f"{self.seed}-{key}")
+        return [
+            {
+                "id": f"{key}-{i}",
+                "title": f"Synthetic article {i} for {key}",
+                "summary": "Lorem ipsum dolor sit amet. " * 5,
+                "companies": rng.sample(self.universe, min(self.tickers_per_article, len(self.universe)))
+            }
+            for i in range(count)
+        ]
+
+    def payload(self, path, params):
+        if path in ('/api/news/by-date', '/api/news/top'):
+            date = params.get('date', 'today')
+            return {
+                category: self._articles(f"{path}-{date}-{category}", self.articles)
+                for category in self.categories
+            }
+        if path == '/api/news/list':
+            return self._articles(f"topic-{params.get('topic')}", self.articles)
+        if path == '/api/news/detail':
+            return self._articles(f"detail-{params.get('newsId')}", 1)[0]
+        return None
+
+    def _handler_class(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with backend.lock:
+                    backend.requests += 1
+                if backend.latency:
+                    time.sleep(backend.latency)
+
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                payload = backend.payload(url.path, params)
+                status = 200 if payload is not None else 404
+                body = json.dumps(payload if payload is not None else {"error": "not found"}).encode()
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fake Spring backend for benchmarks")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--articles', type=int, default=20)
+    parser.add_argument('--categories', type=int, default=4)
+    parser.add_argument('--tickers-per-article', type=int, default=3)
+    parser.add_argument('--universe', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeBackend(
+        port=args.port,
+        categories=args.categories,
+        articles=args.articles,
+        tickers_per_article=args.tickers_per_article,
+        universe=make_universe(args.universe),
+        latency=args.latency
+    )
+    print(f"Fake backend listening on {server.url}")
+    server.server.serve_forever()
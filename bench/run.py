@@ -0,0 +1,351 @@
+"""벤치마크 시나리오 실행기
+
+가짜 백엔드와 stub 시세 제공자로 앱을 띄우고, 시나리오별 요청을 동시에 보낸 뒤
+처리량(req/s), 지연 시간 분위수, 업스트림 호출 수, 캐시 히트율을 출력합니다.
+
+  python -m bench.run --scenario warm --requests 500 --concurrency 8
+  python -m bench.run --scenario cold --mode gunicorn --workers 4
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from bench.fake_backend import FakeBackend, make_universe
+
+# 시나리오별 설정
+#  path: 요청 번호 -> 요청 경로
+#  universe/invalid_ratio: 백엔드가 뉴스에 넣는 티커 집합
+#  quote: StubQuoteProvider 인자
+#  env: 앱 Config를 덮어쓸 환경 변수
+SCENARIOS = {
+    # 매 요청이 새로운 날짜 -> 뉴스/시세 캐시 미스 위주
+    'cold': {
+        'path': lambda i, rng: f"/api/date-news-with-stock?date=2024-01-{i % 28 + 1:02d}&n={i}",
+        'universe': 5000,
+        'quote': {'latency': 0.05}
+    },
+    # 같은 날짜 반복 -> 캐시 히트 위주 (첫 요청으로 예열)
+    'warm': {
+        'path': lambda i, rng: "/api/date-news-with-stock-ticker?date=2024-01-15",
+        'universe': 500,
+        'quote': {'latency': 0.05},
+        'warmup': 1
+    },
+    # 단일 티커 조회 (작은 유니버스에서 무작위)
+    'company': {
+        'path': lambda i, rng: f"/api/company-stockInfo?company=T{rng.randrange(200):04d}",
+        'universe': 200,
+        'quote': {'latency': 0.05}
+    },
+    # 존재하지 않는 티커와 업스트림 에러가 섞인 경우 (네거티브 캐시 확인용)
+    'errors': {
+        'path': lambda i, rng: f"/api/date-news-with-stock?date=2024-02-{i % 5 + 1:02d}",
+        'universe': 500,
+        'invalid_ratio': 0.2,
+        'quote': {'latency': 0.05, 'error_rate': 0.1}
+    },
+    # 업스트림이 느린 경우 (요청 데드라인 확인용)
+    'slow': {
+        'path': lambda i, rng: f"/api/date-news-with-stock?date=2024-03-{i % 28 + 1:02d}",
+        'universe': 2000,
+        'quote': {'latency': 1.5},
+        'env': {'STOCK_DATA_DEADLINE': '1'}
+    }
+}
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(q / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def encode_summary(stats):
+    """단계 통계({(endpoint, stage): values})에서 응답 직렬화('encode') 횟수와 시간을 합산합니다."""
+    count = 0
+    total = 0.0
+    for (_, stage), values in stats.items():
+        if stage == 'encode':
+            count += sum(values[:-1])
+            total += values[-1]
+    return count, total
+
+
+def parse_encode_metrics(text):
+    """/metrics 텍스트에서 encode 단계의 (count, sum)을 합산합니다."""
+    count = 0
+    total = 0.0
+    for line in text.splitlines():
+        if 'stage="encode"' not in line:
+            continue
+        metric, value = line.rsplit(' ', 1)
+        if metric.startswith('aivestor_stage_duration_seconds_count'):
+            count += int(float(value))
+        elif metric.startswith('aivestor_stage_duration_seconds_sum'):
+            total += float(value)
+    return count, total
+
+
+def _encode_report(before, after):
+    count = after[0] - before[0]
+    total = after[1] - before[1]
+    return {
+        "count": count,
+        "total_ms": round(total * 1000, 2),
+        "avg_ms": round(total / count * 1000, 3) if count else 0.0
+    }
+
+
+def run_load(send_factory, paths, concurrency):
+    """paths를 concurrency개 스레드로 나눠 보내고 (지연 시간 목록, 에러 수, 경과 시간)을 반환합니다.
+
+    각 스레드는 send_factory()로 만든 자기 전용 send(path)를 쓰며,
+    send는 HTTP 상태 코드를 반환해야 합니다.
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    next_index = [0]
+
+    def worker():
+        client = send_factory()
+        while True:
+            with lock:
+                if next_index[0] >= len(paths):
+                    return
+                path = paths[next_index[0]]
+                next_index[0] += 1
+
+            start = time.perf_counter()
+            try:
+                status = client(path)
+            except Exception:
+                status = None
+            elapsed = time.perf_counter() - start
+
+            with lock:
+                latencies.append(elapsed)
+                if status is None or status >= 500:
+                    errors[0] += 1
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.perf_counter() - start_time
+
+
+def _client_mode(args, scenario, paths, warmup_paths):
+    """같은 프로세스에서 Flask test client로 실행"""
+    from bench.stub_quotes import StubQuoteProvider
+
+    stub = StubQuoteProvider(seed=args.seed, **scenario.get('quote', {})).install()
+
+    # stub 설치와 환경 변수 설정이 끝난 뒤에 앱을 import
+    from app import create_app
+    from utils.metrics import get_metrics, get_cache_hit_ratio
+    from utils.tracing import collect_stage_stats
+    from utils.json_provider import JSON_BACKEND, FRAGMENTS_SUPPORTED
+
+    app = create_app()
+
+    def send_factory():
+        client = app.test_client()
+
+        def send(path):
+            response = client.get(path)
+            response.get_data()
+            return response.status_code
+        return send
+
+    if warmup_paths:
+        run_load(send_factory, warmup_paths, 1)
+
+    before = get_metrics()
+    encode_before = encode_summary(collect_stage_stats())
+    stub.reset()
+    latencies, errors, elapsed = run_load(send_factory, paths, args.concurrency)
+    after = get_metrics()
+    encode_after = encode_summary(collect_stage_stats())
+
+    hits = after['cache_hits'] - before['cache_hits']
+    misses = after['cache_misses'] - before['cache_misses']
+    return latencies, errors, elapsed, {
+        "upstream": stub.stats(),
+        "cache_hit_ratio": hits / (hits + misses) if hits + misses else get_cache_hit_ratio(),
+        "coalesced_requests": after['coalesced_requests'] - before['coalesced_requests'],
+        "negative_cache_hits": after['negative_cache_hits'] - before['negative_cache_hits'],
+        "json_backend": f"{JSON_BACKEND}{' (fragments)' if FRAGMENTS_SUPPORTED else ''}",
+        "encode": _encode_report(encode_before, encode_after)
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _gunicorn_mode(args, scenario, paths, warmup_paths):
+    """gunicorn 워커 여러 개로 실행 (bench.wsgi, --preload)"""
+    if shutil.which('gunicorn') is None:
+        sys.exit("gunicorn is not installed: pip install gunicorn, or use --mode client")
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    quote = scenario.get('quote', {})
+    env = {
+        **os.environ,
+        'BENCH_QUOTE_LATENCY': str(quote.get('latency', 0.05)),
+        'BENCH_QUOTE_ERROR_RATE': str(quote.get('error_rate', 0)),
+        'BENCH_QUOTE_THROTTLE_RATE': str(quote.get('throttle_rate', 0))
+    }
+    process = subprocess.Popen(
+        ['gunicorn', '--preload', '-w', str(args.workers), '--threads', str(args.threads),
+         '-b', f"127.0.0.1:{port}", '--log-level', 'warning', 'bench.wsgi:app'],
+        env=env
+    )
+
+    def fetch_json(path):
+        with urllib.request.urlopen(base_url + path, timeout=10) as response:
+            return json.loads(response.read())
+
+    def fetch_encode_metrics():
+        with urllib.request.urlopen(base_url + '/metrics', timeout=10) as response:
+            return parse_encode_metrics(response.read().decode())
+
+    try:
+        for _ in range(100):
+            try:
+                fetch_json('/api/health')
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            sys.exit("gunicorn did not start")
+
+        def send_factory():
+            def send(path):
+                try:
+                    with urllib.request.urlopen(base_url + path, timeout=30) as response:
+                        response.read()
+                        return response.status
+                except urllib.error.HTTPError as e:
+                    return e.code
+            return send
+
+        if warmup_paths:
+            run_load(send_factory, warmup_paths, 1)
+
+        encode_before = fetch_encode_metrics()
+        latencies, errors, elapsed = run_load(send_factory, paths, args.concurrency)
+        encode_after = fetch_encode_metrics()
+
+        # 워커별 메트릭스이므로 공유 캐시 백엔드 통계가 있으면 그쪽을 사용
+        cache = fetch_json('/api/health')['cache']
+        shared = cache.get('shared')
+        return latencies, errors, elapsed, {
+            "upstream": fetch_json('/bench/upstream'),
+            "cache_hit_ratio": shared['hit_ratio'] if shared else cache['hit_ratio'],
+            "coalesced_requests": cache['coalesced_requests'],
+            # 워커 합산은 METRICS_MULTIPROC_DIR이 설정돼 있을 때만 (아니면 응답한 워커 값)
+            "encode": _encode_report(encode_before, encode_after)
+        }
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=10)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AIvestor Flask benchmark")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='warm')
+    parser.add_argument('--mode', choices=['client', 'gunicorn'], default='client')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=4, help="gunicorn workers")
+    parser.add_argument('--threads', type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument('--articles', type=int, default=20)
+    parser.add_argument('--categories', type=int, default=4)
+    parser.add_argument('--tickers-per-article', type=int, default=3)
+    parser.add_argument('--backend-latency', type=float, default=0.02)
+    parser.add_argument('--upstream-rate', type=float, default=1000,
+                        help="UPSTREAM_RATE_LIMIT for the stub (the real Yahoo default is much lower)")
+    parser.add_argument('--json-backend', choices=['auto', 'orjson', 'stdlib'],
+                        help="JSON_BACKEND for the app (default: app setting)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    scenario = SCENARIOS[args.scenario]
+    backend = FakeBackend(
+        categories=args.categories,
+        articles=args.articles,
+        tickers_per_article=args.tickers_per_article,
+        universe=make_universe(scenario['universe'], scenario.get('invalid_ratio', 0), seed=args.seed),
+        latency=args.backend_latency,
+        seed=args.seed
+    ).start()
+
+    # Config는 import 시점에 환경 변수를 읽음
+    os.environ['BACKEND_URL'] = backend.url
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    os.environ['UPSTREAM_RATE_LIMIT'] = str(args.upstream_rate)
+    os.environ['UPSTREAM_BURST'] = str(max(int(args.upstream_rate), 1))
+    os.environ.setdefault('HOT_REFRESH_ENABLED', 'false')
+    os.environ.update(scenario.get('env', {}))
+    if args.json_backend:
+        os.environ['JSON_BACKEND'] = args.json_backend
+
+    rng = random.Random(args.seed)
+    paths = [scenario['path'](i, rng) for i in range(args.requests)]
+    warmup_paths = paths[:scenario.get('warmup', 0)]
+
+    run_mode = _gunicorn_mode if args.mode == 'gunicorn' else _client_mode
+    try:
+        backend_requests_before = backend.requests
+        latencies, errors, elapsed, extra = run_mode(args, scenario, paths, warmup_paths)
+    finally:
+        backend.stop()
+
+    latencies.sort()
+    report = {
+        "scenario": args.scenario,
+        "mode": args.mode,
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "req_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0,
+        "latency_ms": {
+            name: round(percentile(latencies, q) * 1000, 2)
+            for name, q in (('p50', 50), ('p90', 90), ('p99', 99), ('max', 100))
+        },
+        "backend_requests": backend.requests - backend_requests_before,
+        **extra
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for key, value in report.items():
+            print(f"{key:>20}: {value}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
+    # 데드라인으로 버려진 조회가 executor에 남아 있으면 종료가 늦어지므로 바로 종료
+    sys.stdout.flush()
+    os._exit(0)
@@ -0,0 +1,164 @@
+"""yfinance 대역 - 네트워크 없이 지연 시간과 에러율을 조절할 수 있는 시세 제공자
+
+install()은 yfinance.download와 yfinance.Ticker를 교체합니다. 호출 횟수는
+multiprocessing.Value에 쌓이므로 gunicorn --preload로 fork된 워커끼리 공유됩니다.
+"""
+import logging
+import multiprocessing
+import random
+import time
+import zlib
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+# fake_backend.make_universe와 같은 규칙: X로 시작하는 티커는 존재하지 않음
+INVALID_PREFIX = 'X'
+
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class StubQuoteProvider:
+    def __init__(self, latency=0.05, jitter=0.5, error_rate=0.0, throttle_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rng = random.Random(seed)
+        self.counters = {
+            name: multiprocessing.Value('i', 0)
+            for name in ('download_calls', 'downloaded_tickers', 'info_calls', 'history_calls', 'history_bars', 'errors')
+        }
+
+    def _count(self, name, amount=1):
+        with self.counters[name].get_lock():
+            self.counters[name].value += amount
+
+    def stats(self):
+        return {name: counter.value for name, counter in self.counters.items()}
+
+    def reset(self):
+        for counter in self.counters.values():
+            with counter.get_lock():
+                counter.value = 0
+
+    def _sleep(self):
+        if self.latency:
+            time.sleep(self.latency * (1 + self.rng.uniform(-self.jitter, self.jitter)))
+
+    @staticmethod
+    def _price(ticker):
+        # 티커마다 고정된 가격대 (실행 간 재현 가능)
+        return 10 + zlib.crc32(ticker.encode()) % 490
+
+    def download(self, tickers, period='5d', **kwargs):
+        """yf.download 대역 - 실제 라이브러리처럼 예외를 던지지 않습니다.
+
+        실패한 티커는 'yfinance' 로거에 에러로만 남기고 NaN 컬럼으로 돌려주며,
+        모두 실패하면 빈 프레임을 돌려줍니다.
+        """
+        if isinstance(tickers, str):
+            tickers = tickers.split()
+        tickers = [ticker.upper() for ticker in tickers]
+        self._count('download_calls')
+        self._count('downloaded_tickers', len(tickers))
+        self._sleep()
+
+        errors = {}
+        roll = self.rng.random()
+        if roll < self.throttle_rate:
+            errors = {ticker: "YFRateLimitError('Too Many Requests. Rate limited. Try after a while.')" for ticker in tickers}
+        elif roll < self.throttle_rate + self.error_rate:
+            errors = {ticker: "ReadTimeout('stub upstream timed out')" for ticker in tickers}
+        else:
+            for ticker in tickers:
+                if ticker.startswith(INVALID_PREFIX):
+                    errors[ticker] = 'possibly delisted; no price data found'
+
+        if errors:
+            self._count('errors', len(errors))
+            logger = logging.getLogger('yfinance')
+            logger.error('\n%d Failed download%s:' % (len(errors), 's' if len(errors) > 1 else ''))
+            for ticker, message in errors.items():
+                logger.error(f"['{ticker}']: {message}")
+
+        columns = pd.MultiIndex.from_product([tickers, PRICE_FIELDS], names=['Ticker', 'Price'])
+        if len(errors) == len(tickers):
+            return pd.DataFrame(columns=columns)
+
+        index = pd.date_range(end=pd.Timestamp.today().normalize(), periods=3)
+        data = np.full((len(index), len(columns)), np.nan)
+        for i, ticker in enumerate(tickers):
+            if ticker in errors:
+                continue
+            base = self._price(ticker)
+            closes = base * (1 + np.array([-0.01, 0.0, 0.012]))
+            data[:, i * 5:i * 5 + 5] = np.column_stack([closes, closes * 1.01, closes * 0.99, closes, np.full(3, 1e6)])
+        return pd.DataFrame(data, index=index, columns=columns)
+
+    def history(self, ticker, start=None, period='1y'):
+        """Ticker.history 대역 - 오늘까지의 영업일 일봉 (가격은 티커별로 고정된 파형)"""
+        end = pd.Timestamp.today().normalize()
+        if start is None:
+            # '2y', '6mo', '5d' 형식만 지원
+            count, unit = int(period.rstrip('ymod')), period.lstrip('0123456789')
+            start = end - pd.Timedelta(days=count * {'y': 365, 'mo': 30, 'd': 1}[unit])
+        index = pd.bdate_range(start=pd.Timestamp(start), end=end)
+        self._count('history_bars', len(index))
+
+        base = self._price(ticker)
+        # 날짜에만 의존하도록 만들어 꼬리만 다시 받아도 기존 봉과 값이 이어짐
+        days = index.values.astype('datetime64[D]').astype(np.int64)
+        closes = base * (1 + 0.1 * np.sin(days / 20.0))
+        return pd.DataFrame({
+            'Open': closes * 0.995,
+            'High': closes * 1.01,
+            'Low': closes * 0.99,
+            'Close': closes,
+            'Volume': np.full(len(index), 1e6)
+        }, index=index)
+
+    def ticker(self, symbol):
+        """yf.Ticker 대역 (.info/.history만 지원)"""
+        provider = self
+
+        class StubTicker:
+            def __init__(self, ticker):
+                self.ticker = ticker
+
+            @property
+            def info(self):
+                provider._count('info_calls')
+                provider._sleep()
+                if provider.rng.random() < provider.error_rate:
+                    provider._count('errors')
+                    raise ConnectionError("stub upstream error")
+                if self.ticker.upper().startswith(INVALID_PREFIX):
+                    return {"trailingPegRatio": None}
+
+                price = provider._price(self.ticker.upper())
+                return {
+                    "shortName": f"{self.ticker.upper()} Holdings",
+                    "exchange": "NMS",
+                    "currency": "USD",
+                    "regularMarketPrice": price * 1.012,
+                    "previousClose": float(price)
+                }
+
+            def history(self, start=None, period='1y', **kwargs):
+                provider._count('history_calls')
+                provider._sleep()
+                if provider.rng.random() < provider.error_rate:
+                    provider._count('errors')
+                    raise ConnectionError("stub upstream error")
+                if self.ticker.upper().startswith(INVALID_PREFIX):
+                    return pd.DataFrame()
+                return provider.history(self.ticker.upper(), start=start, period=period)
+
+        return StubTicker(symbol)
+
+    def install(self):
+        """yfinance 모듈의 download/Ticker를 이 대역으로 교체합니다."""
+        yf.download = self.download
+        yf.Ticker = self.ticker
+        return self
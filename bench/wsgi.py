@@ -0,0 +1,23 @@
+"""gunicorn 벤치마크용 엔트리포인트 (시세 조회를 stub으로 교체한 앱)
+
+gunicorn --preload -w 4 'bench.wsgi:app' 처럼 --preload로 실행해야
+업스트림 호출 카운터가 워커 간에 공유됩니다.
+"""
+import os
+from bench.stub_quotes import StubQuoteProvider
+
+stub = StubQuoteProvider(
+    latency=float(os.getenv('BENCH_QUOTE_LATENCY', 0.05)),
+    error_rate=float(os.getenv('BENCH_QUOTE_ERROR_RATE', 0)),
+    throttle_rate=float(os.getenv('BENCH_QUOTE_THROTTLE_RATE', 0))
+).install()
+
+from app import create_app  # noqa: E402  stub 설치 후에 서비스 모듈을 로드
+
+app = create_app()
+
+
+@app.route('/bench/upstream')
+def upstream_stats():
+    """모든 워커의 stub 호출 횟수 합계 (카운터는 fork 전에 만들어져 공유됨)"""
+    return stub.stats()
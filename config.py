@@ -14,13 +14,99 @@ class Config:
     
     # 캐시 관련 설정
     CACHE_DURATION = int(os.getenv('CACHE_DURATION', 60))  # 추가: 캐시 유지 시간 (초)
+    CACHE_HARD_DURATION = int(os.getenv('CACHE_HARD_DURATION', 300))  # 추가: stale 시세를 제공할 수 있는 최대 시간 (초)
     STOCK_CACHE_SIZE = int(os.getenv('STOCK_CACHE_SIZE', 1000))  # 추가: 캐시 최대 크기
     
+    # 실패한 티커 조회 결과 캐시 (negative cache) 설정
+    NEGATIVE_CACHE_SIZE = int(os.getenv('NEGATIVE_CACHE_SIZE', 5000))  # 추가: 에러 결과 캐시 최대 크기
+    INVALID_TICKER_CACHE_DURATION = int(os.getenv('INVALID_TICKER_CACHE_DURATION', 6 * 3600))  # 추가: 존재하지 않거나 상장 폐지된 티커 캐시 시간 (초)
+    TRANSIENT_ERROR_CACHE_DURATION = int(os.getenv('TRANSIENT_ERROR_CACHE_DURATION', 15))  # 추가: 일시적 업스트림 실패 캐시 시간 (초)
+    
+    # 종목 유니버스 설정 (알 수 없는 티커는 업스트림 호출 전에 거절)
+    SYMBOL_UNIVERSE_PATH = os.getenv('SYMBOL_UNIVERSE_PATH', '')  # 추가: 종목 목록 CSV/JSON 파일 경로 (비우면 형식 검증만)
+    SYMBOL_UNIVERSE_REFRESH = int(os.getenv('SYMBOL_UNIVERSE_REFRESH', 3600))  # 추가: 파일 변경을 확인하는 주기 (초)
+    
+    # 티커 메타데이터(회사명, 거래소, 통화) 캐시 설정
+    METADATA_CACHE_DURATION = int(os.getenv('METADATA_CACHE_DURATION', 7 * 86400))  # 추가: 메타데이터 캐시 유지 시간 (초)
+    METADATA_CACHE_SIZE = int(os.getenv('METADATA_CACHE_SIZE', 10000))  # 추가: 메타데이터 캐시 최대 크기
+    METADATA_DB_PATH = os.getenv('METADATA_DB_PATH', '')  # 추가: 메타데이터를 영속 저장할 SQLite 파일 경로 (선택사항)
+    
+    # 캐시 백엔드 설정 (memory: 워커별, shm: 단일 호스트 워커 간 공유, redis: 외부 Redis 공유)
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory').lower()  # 추가: 캐시 저장소 종류 (memory/shm/redis)
+    CACHE_SHM_DIR = os.getenv('CACHE_SHM_DIR', '')  # 추가: 공유 캐시 파일 디렉토리 (기본값: /dev/shm 또는 임시 디렉토리)
+    CACHE_SHM_SLOT_SIZE = int(os.getenv('CACHE_SHM_SLOT_SIZE', 1024))  # 추가: 공유 캐시 항목당 최대 크기 (바이트)
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')  # 추가: Redis 접속 URL
+    CACHE_REDIS_PREFIX = os.getenv('CACHE_REDIS_PREFIX', 'aivestor')  # 추가: Redis 키 접두사
+    CACHE_REDIS_TIMEOUT = float(os.getenv('CACHE_REDIS_TIMEOUT', 0.5))  # 추가: Redis 소켓 타임아웃 (초)
+    
+    # 뉴스 페이로드 캐시 설정
+    NEWS_CACHE_ENABLED = os.getenv('NEWS_CACHE_ENABLED', 'true').lower() == 'true'  # 추가: 백엔드 뉴스 응답 캐시 활성화
+    NEWS_CACHE_SIZE = int(os.getenv('NEWS_CACHE_SIZE', 500))  # 추가: 뉴스 캐시 최대 크기
+    NEWS_CACHE_DURATION = int(os.getenv('NEWS_CACHE_DURATION', 30))  # 추가: 오늘/최근 날짜 뉴스 캐시 유지 시간 (초)
+    NEWS_CACHE_STALE_DURATION = int(os.getenv('NEWS_CACHE_STALE_DURATION', 600))  # 추가: ETag 재검증을 위해 만료된 뉴스를 보관하는 시간 (초)
+    NEWS_ARCHIVE_CACHE_DURATION = int(os.getenv('NEWS_ARCHIVE_CACHE_DURATION', 86400))  # 추가: 지난 날짜 뉴스 캐시 유지 시간 (초)
+    
+    # 캐시 스냅샷 설정 (재시작 후 warm start)
+    CACHE_SNAPSHOT_PATH = os.getenv('CACHE_SNAPSHOT_PATH', '')  # 추가: 스냅샷 파일 경로 (비어 있으면 비활성화)
+    CACHE_SNAPSHOT_INTERVAL = int(os.getenv('CACHE_SNAPSHOT_INTERVAL', 300))  # 추가: 주기적 스냅샷 저장 간격 (초, 0이면 종료 시에만 저장)
+    
+    # 일괄 시세 조회 설정
+    BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 50))  # 추가: 한 번의 다운로드 요청에 포함할 최대 티커 수
+    BULK_DOWNLOAD_PERIOD = os.getenv('BULK_DOWNLOAD_PERIOD', '5d')  # 추가: 전일 종가 계산을 위한 조회 기간 (휴장일 대비)
+    BATCH_QUOTE_MAX_TICKERS = int(os.getenv('BATCH_QUOTE_MAX_TICKERS', 200))  # 추가: /api/stock-quotes 한 번에 요청할 수 있는 최대 티커 수
+    
+    # 실시간 시세 구독(SSE) 설정
+    QUOTE_STREAM_INTERVAL = float(os.getenv('QUOTE_STREAM_INTERVAL', 5))  # 추가: 구독 중인 티커를 다시 조회하는 주기 (초)
+    QUOTE_STREAM_HEARTBEAT = float(os.getenv('QUOTE_STREAM_HEARTBEAT', 15))  # 추가: 변경이 없을 때 keep-alive 주석을 보내는 주기 (초)
+    QUOTE_STREAM_MAX_TICKERS = int(os.getenv('QUOTE_STREAM_MAX_TICKERS', 50))  # 추가: 연결 하나가 구독할 수 있는 최대 티커 수
+    QUOTE_STREAM_MAX_SUBSCRIBERS = int(os.getenv('QUOTE_STREAM_MAX_SUBSCRIBERS', 500))  # 추가: 워커당 최대 동시 구독 연결 수 (gevent 스트림 프로세스의 --worker-connections보다 작게)
+    QUOTE_STREAM_IN_APP = os.getenv('QUOTE_STREAM_IN_APP', 'true').lower() == 'true'  # 추가: 메인 앱에서도 /api/stock-stream을 제공할지 여부 (전용 스트림 프로세스를 띄우면 false)
+    
+    # 가격 이력(OHLCV) 캐시 설정
+    HISTORY_CACHE_SIZE = int(os.getenv('HISTORY_CACHE_SIZE', 500))  # 추가: 메모리에 보관할 최대 티커 수
+    HISTORY_PERIOD = os.getenv('HISTORY_PERIOD', '2y')  # 추가: 처음 조회할 때 받아 둘 이력 기간
+    HISTORY_REFRESH_INTERVAL = int(os.getenv('HISTORY_REFRESH_INTERVAL', 300))  # 추가: 마지막 봉 이후 꼬리 구간을 다시 확인하는 주기 (초)
+    HISTORY_CACHE_DIR = os.getenv('HISTORY_CACHE_DIR', '')  # 추가: 티커별 .npy 파일 저장 경로 (비우면 메모리만 사용)
+    
+    # 인기 티커 선제 갱신 설정
+    HOT_REFRESH_ENABLED = os.getenv('HOT_REFRESH_ENABLED', 'false').lower() == 'true'  # 추가: 인기 티커 백그라운드 갱신 활성화
+    HOT_REFRESH_TOP_N = int(os.getenv('HOT_REFRESH_TOP_N', 50))  # 추가: 선제 갱신할 인기 티커 수
+    HOT_REFRESH_INTERVAL = int(os.getenv('HOT_REFRESH_INTERVAL', 10))  # 추가: 선제 갱신 주기 (초)
+    HOT_REFRESH_MARGIN = int(os.getenv('HOT_REFRESH_MARGIN', 15))  # 추가: 만료 몇 초 전부터 갱신할지 (초)
+    
+    # 날짜별 뉴스 페이지 사전 생성 설정
+    PRECOMPUTE_ENABLED = os.getenv('PRECOMPUTE_ENABLED', 'false').lower() == 'true'  # 추가: 오늘/최근 날짜 뉴스 페이지를 백그라운드에서 미리 생성
+    PRECOMPUTE_DAYS = int(os.getenv('PRECOMPUTE_DAYS', 3))  # 추가: 미리 만들 날짜 수 (오늘 포함)
+    PRECOMPUTE_INTERVAL = int(os.getenv('PRECOMPUTE_INTERVAL', 30))  # 추가: 페이지를 다시 만드는 주기 (초, 최대 CACHE_DURATION의 절반)
+    PRECOMPUTE_DB_PATH = os.getenv('PRECOMPUTE_DB_PATH', '')  # 추가: 워커들이 공유하는 페이지 SQLite 파일 (기본값: 공유 캐시 디렉토리, CACHE_BACKEND=redis면 Redis 사용)
+    
     # 스레드 풀 설정
     MAX_WORKERS = int(os.getenv('MAX_WORKERS', 20))  # 추가: 최대 동시 작업 스레드 수
     
+    # async 경로 설정 (httpx, Flask[async] 필요)
+    ENABLE_ASYNC_ROUTES = os.getenv('ENABLE_ASYNC_ROUTES', 'true').lower() == 'true'  # 추가: /api/async/* 라우트 등록 여부
+    ASYNC_CONCURRENCY_LIMIT = int(os.getenv('ASYNC_CONCURRENCY_LIMIT', 100))  # 추가: 요청당 동시 업스트림 호출 수 제한
+    
     # 타임아웃 설정
     REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', 10))  # 추가: API 요청 타임아웃 (초)
+    STOCK_DATA_DEADLINE = float(os.getenv('STOCK_DATA_DEADLINE', 3))  # 추가: 요청당 시세 조회를 기다리는 최대 시간 (초, 넘으면 pending으로 응답)
+    
+    # 백엔드 HTTP 클라이언트(커넥션 풀) 설정
+    BACKEND_POOL_SIZE = int(os.getenv('BACKEND_POOL_SIZE', 20))  # 추가: 호스트당 최대 유지 커넥션 수
+    BACKEND_POOL_CONNECTIONS = int(os.getenv('BACKEND_POOL_CONNECTIONS', 4))  # 추가: 커넥션 풀을 유지할 호스트 수
+    BACKEND_POOL_BLOCK = os.getenv('BACKEND_POOL_BLOCK', 'false').lower() == 'true'  # 추가: 풀이 가득 차면 대기할지 여부
+    BACKEND_CONNECT_TIMEOUT = float(os.getenv('BACKEND_CONNECT_TIMEOUT', 3.05))  # 추가: 백엔드 연결 타임아웃 (초)
+    BACKEND_READ_TIMEOUT = float(os.getenv('BACKEND_READ_TIMEOUT', REQUEST_TIMEOUT))  # 추가: 백엔드 응답 읽기 타임아웃 (초)
+    BACKEND_MAX_RETRIES = int(os.getenv('BACKEND_MAX_RETRIES', 2))  # 추가: 연결 실패/5xx 재시도 횟수
+    
+    # 업스트림(Yahoo) 보호 설정 - 서킷 브레이커와 적응형 토큰 버킷
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))  # 추가: 서킷을 여는 연속 실패 횟수
+    CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv('CIRCUIT_RECOVERY_TIMEOUT', 30))  # 추가: 서킷이 열린 뒤 시험 호출까지 대기 시간 (초)
+    CIRCUIT_HALF_OPEN_CALLS = int(os.getenv('CIRCUIT_HALF_OPEN_CALLS', 1))  # 추가: half-open 상태에서 허용할 시험 호출 수
+    UPSTREAM_RATE_LIMIT = float(os.getenv('UPSTREAM_RATE_LIMIT', 5))  # 추가: 초당 최대 업스트림 호출 수 (429를 받으면 자동으로 낮춤)
+    UPSTREAM_MIN_RATE = float(os.getenv('UPSTREAM_MIN_RATE', 0.5))  # 추가: 자동 조절 시 최저 초당 호출 수
+    UPSTREAM_BURST = int(os.getenv('UPSTREAM_BURST', 10))  # 추가: 토큰 버킷 최대 크기 (순간 허용 호출 수)
+    UPSTREAM_MAX_WAIT = float(os.getenv('UPSTREAM_MAX_WAIT', 0.5))  # 추가: 토큰을 기다리는 최대 시간 (초, 넘으면 바로 실패)
     
     # 재시도 설정
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', 3))  # 추가: 최대 재시도 횟수
@@ -33,13 +119,20 @@ class Config:
     # 보안 설정
     # SECRET_KEY = os.getenv('SECRET_KEY')  # 추가: Flask 시크릿 키
     
-    # yfinance API 관련 설정 (향후 확장을 위해)
-    # STOCK_API_BASE_URL = os.getenv('STOCK_API_BASE_URL', '')  # 추가: 대체 주식 API URL (선택사항)
-    # STOCK_API_KEY = os.getenv('STOCK_API_KEY', '')  # 추가: 주식 API 키 (선택사항)
+    # 시세 제공자 설정 (yfinance/http/fixture)
+    QUOTE_PROVIDERS = os.getenv('QUOTE_PROVIDERS', 'yfinance')  # 추가: 사용할 시세 제공자 (쉼표로 여러 개 지정 시 앞에서부터 failover)
+    STOCK_API_BASE_URL = os.getenv('STOCK_API_BASE_URL', '')  # 추가: 대체 주식 API URL (http 제공자, 선택사항)
+    STOCK_API_KEY = os.getenv('STOCK_API_KEY', '')  # 추가: 주식 API 키 (선택사항)
+    QUOTE_FIXTURE_PATH = os.getenv('QUOTE_FIXTURE_PATH', '')  # 추가: fixture 제공자가 읽을 시세 JSON 파일 경로
+    
+    # 응답 직렬화 설정
+    JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto').lower()  # 추가: JSON 인코더 (auto: orjson이 설치돼 있으면 사용, orjson, stdlib)
     
     # 성능 모니터링 설정
     ENABLE_METRICS = os.getenv('ENABLE_METRICS', 'true').lower() == 'true'  # 추가: 메트릭스 수집 활성화
     METRICS_RETENTION_HOURS = int(os.getenv('METRICS_RETENTION_HOURS', 24))  # 추가: 메트릭스 보관 시간 (시간)
+    METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', '')  # 추가: 워커별 단계 메트릭스 파일 디렉토리 (gunicorn 다중 워커 합산용, 비어 있으면 프로세스 단위)
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))  # 추가: 워커별 메트릭스 파일 저장 주기 (초)
     
     @classmethod
     def validate_config(cls):
@@ -0,0 +1,15 @@
+"""gunicorn 설정 훅
+
+METRICS_MULTIPROC_DIR의 워커별 단계 메트릭스 파일을 정리합니다.
+- 마스터 시작 시: 이전 실행이 남긴 파일 삭제
+- 워커 종료 시: 종료된 워커의 파일을 보관 파일에 합친 뒤 삭제
+"""
+from utils.tracing import reset_stage_files, retire_worker_stats
+
+
+def on_starting(server):
+    reset_stage_files()
+
+
+def child_exit(server, worker):
+    retire_worker_stats(worker.pid)
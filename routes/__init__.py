@@ -1,5 +1,7 @@
 """라우트 패키지"""
 from .news_routes import news_bp
 from .health_routes import health_bp
+from .async_news_routes import async_news_bp
+from .stream_routes import stream_bp
 
-__all__ = ['news_bp', 'health_bp']
+__all__ = ['news_bp', 'health_bp', 'async_news_bp', 'stream_bp']
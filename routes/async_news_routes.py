@@ -0,0 +1,83 @@
+"""뉴스 관련 async 라우트 (/api/async/*)
+
+news_routes의 주요 엔드포인트와 같은 응답을 반환하지만, 백엔드 호출과
+시세 조회를 코루틴으로 처리해 스레드 풀을 점유하지 않습니다.
+"""
+from flask import Blueprint, jsonify, request
+from services.async_service import (
+    create_async_client,
+    fetch_from_backend_async,
+    get_stock_data_batch_async,
+    enrich_news_payload_async
+)
+from services.stock_service import stock_data_status
+from utils.validators import validate_date_format
+from utils.decorators import track_performance
+
+async_news_bp = Blueprint('async_news', __name__, url_prefix='/api/async')
+
+
+@async_news_bp.route('/company-stockInfo')
+@track_performance('async-company-stockInfo')
+async def get_company_stock_info_async():
+    ticker = request.args.get('company')
+    
+    if not ticker:
+        return jsonify({"error": "Missing 'company' query parameter"}), 400
+    
+    async with create_async_client() as client:
+        companies_name, companies_info, _ = await get_stock_data_batch_async(client, [ticker])
+    
+    if not companies_info:
+        return jsonify({"error": "Invalid ticker format", "ticker": ticker}), 400
+    
+    company_stock_data = companies_info[companies_name[0]]
+    # 동기 경로(/api/company-stockInfo)와 같은 기준으로 분류
+    status = stock_data_status(company_stock_data)
+    if status != 'ok':
+        error_message = company_stock_data['error']
+        
+        if status == 'not_found':
+            return jsonify({"error": error_message, "ticker": ticker}), 404
+        
+        return jsonify({"error": "Internal server error", "details": error_message, "ticker": ticker}), 500
+    
+    return jsonify(company_stock_data)
+
+
+async def _date_news(endpoint, key_type='name'):
+    date = request.args.get('date')
+    if not date:
+        return jsonify({"error": "Date parameter is required"}), 400
+    
+    if not validate_date_format(date):
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+    
+    async with create_async_client() as client:
+        news_data, error = await fetch_from_backend_async(client, endpoint, {'date': date})
+        if error:
+            return jsonify(error), 500
+        
+        if news_data:
+            processed_news_data = await enrich_news_payload_async(client, news_data, key_type=key_type)
+            return jsonify(processed_news_data)
+    
+    return jsonify({"error": "No news data available"}), 500
+
+
+@async_news_bp.route('/news-with-stock')
+@track_performance('async-news-with-stock')
+async def get_news_with_stock_info_async():
+    return await _date_news('/api/news/top')
+
+
+@async_news_bp.route('/date-news-with-stock')
+@track_performance('async-date-news-with-stock')
+async def get_date_news_with_stock_info_async():
+    return await _date_news('/api/news/by-date')
+
+
+@async_news_bp.route('/date-news-with-stock-ticker')
+@track_performance('async-date-news-with-stock-ticker')
+async def get_date_news_with_stock_ticker_info_async():
+    return await _date_news('/api/news/by-date', key_type='ticker')
@@ -1,8 +1,23 @@
 """시스템 상태 및 메트릭스 관련 라우트"""
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify
 from datetime import datetime
-from services.stock_service import stock_cache
-from utils.metrics import metrics, get_cache_hit_ratio, get_avg_response_times
+from services.stock_service import (
+    stock_cache,
+    metadata_cache,
+    invalid_ticker_cache,
+    transient_error_cache,
+    snapshot_stats,
+    yahoo_guard,
+    quote_provider,
+    history_cache
+)
+from services.news_service import get_backend_pool_stats, news_cache, archive_news_cache
+from services.quote_stream import quote_hub
+from services.news_pages import page_stats
+from utils.metrics import get_metrics as get_metrics_snapshot, get_cache_hit_ratio
+from utils.tracing import render_prometheus
+from utils.json_provider import JSON_BACKEND, FRAGMENTS_SUPPORTED
+from utils.symbol_universe import symbol_universe
 from config import Config
 
 health_bp = Blueprint('health', __name__)
@@ -13,30 +28,75 @@ def health_check():
     """헬스체크 및 시스템 상태 확인"""
     # 캐시 정리
     expired_count = stock_cache.clear_expired()
+    invalid_ticker_cache.clear_expired()
+    transient_error_cache.clear_expired()
     
-    # 평균 응답 시간 계산
-    avg_response_times = get_avg_response_times()
+    # 카운터 스냅샷 (응답 시간은 보관 기간 내 히스토그램 요약)
+    metrics = get_metrics_snapshot()
+    avg_response_times = {
+        endpoint: summary['avg']
+        for endpoint, summary in metrics['response_times'].items()
+        if summary['count']
+    }
+    
+    # 서킷이 닫혀 있지 않으면 stale 캐시 또는 빠른 실패로 응답 중
+    upstream = yahoo_guard.stats()
+    status = "healthy" if upstream["circuit_breaker"]["state"] == "closed" else "degraded"
     
     health_data = {
-        "status": "healthy",
+        "status": status,
         "timestamp": datetime.now().isoformat(),
         "cache": {
+            "backend": Config.CACHE_BACKEND,
             "size": stock_cache.size(),
             "max_size": Config.STOCK_CACHE_SIZE,
             "hits": metrics['cache_hits'],
             "misses": metrics['cache_misses'],
             "hit_ratio": get_cache_hit_ratio(),
+            "coalesced_requests": metrics['coalesced_requests'],
+            "in_flight": stock_cache.inflight.in_flight(),
+            "stale_hits": metrics['stale_hits'],
+            "background_refreshes": metrics['background_refreshes'],
+            # 공유 백엔드일 때 모든 워커 합산 히트/미스
+            "shared": stock_cache.shared_stats(),
+            "metadata_size": metadata_cache.size(),
+            "snapshot": {
+                "path": Config.CACHE_SNAPSHOT_PATH or None,
+                "last_load": snapshot_stats["last_load"],
+                "last_save": snapshot_stats["last_save"]
+            },
             "expired_cleaned": expired_count
         },
+        "negative_cache": {
+            "invalid_tickers": invalid_ticker_cache.size(),
+            "transient_errors": transient_error_cache.size(),
+            "hits": metrics['negative_cache_hits']
+        },
+        "upstream": upstream,
+        "quote_provider": quote_provider.stats(),
+        "symbol_universe": symbol_universe.stats(),
+        "news_cache": {
+            "size": news_cache.size(),
+            "archive_size": archive_news_cache.size(),
+            **metrics['news_cache']
+        },
+        "history_cache": history_cache.stats(),
+        "quote_stream": quote_hub.stats(),
+        "precomputed_pages": page_stats(),
         "performance": {
             "request_counts": dict(metrics['request_count']),
             "avg_response_times": avg_response_times,
-            "error_counts": dict(metrics['errors'])
+            "error_counts": dict(metrics['errors']),
+            "retention_hours": Config.METRICS_RETENTION_HOURS
         },
         "config": {
             "environment": Config.ENVIRONMENT,
             "max_workers": Config.MAX_WORKERS,
-            "cache_duration": Config.CACHE_DURATION
+            "cache_duration": Config.CACHE_DURATION,
+            "cache_hard_duration": Config.CACHE_HARD_DURATION,
+            "hot_refresh_enabled": Config.HOT_REFRESH_ENABLED,
+            "json_backend": JSON_BACKEND,
+            "json_fragments": FRAGMENTS_SUPPORTED
         }
     }
     
@@ -46,18 +106,23 @@ def health_check():
 @health_bp.route('/api/metrics')
 def get_metrics():
     """상세 메트릭스 정보"""
+    metrics = get_metrics_snapshot()
     return jsonify({
         "cache_metrics": {
             "hits": metrics['cache_hits'],
             "misses": metrics['cache_misses'],
+            "coalesced_requests": metrics['coalesced_requests'],
             "size": stock_cache.size()
         },
+        "backend_pool": get_backend_pool_stats(),
         "request_metrics": dict(metrics['request_count']),
         "error_metrics": dict(metrics['errors']),
-        "response_times": {k: {
-            "count": len(v),
-            "avg": sum(v) / len(v) if v else 0,
-            "min": min(v) if v else 0,
-            "max": max(v) if v else 0
-        } for k, v in metrics['response_times'].items()}
+        # 엔드포인트별 count/avg/min/max/p50/p95/p99 (METRICS_RETENTION_HOURS 이내)
+        "response_times": metrics['response_times']
     })
+
+
+@health_bp.route('/metrics')
+def prometheus_metrics():
+    """Prometheus 스크레이프용 단계별 지연 시간 히스토그램 (모든 워커 합산)"""
+    return Response(render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,12 +1,112 @@
 """뉴스 관련 라우트"""
-from flask import Blueprint, jsonify, request
-from services.news_service import fetch_from_backend
-from services.stock_service import get_stock_data, enrich_articles_with_stock_info, getName_StockInfo
-from utils.validators import validate_date_format
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from config import Config
+from services.news_service import fetch_from_backend, fetch_versioned_from_backend
+from services.news_pages import get_page, page_etag
+from services.stock_service import (
+    get_stock_data,
+    get_stock_quotes,
+    get_price_history,
+    HISTORY_INTERVALS,
+    enrich_articles_with_stock_info,
+    enrich_news_payload_versioned,
+    getName_StockInfo,
+    stream_news_payload,
+    quote_version,
+    stock_data_status
+)
+from utils.validators import validate_date_format, validate_ticker
 from utils.decorators import track_performance
+from utils.tracing import trace_stream
 
 news_bp = Blueprint('news', __name__)
 
+# ?stream= 값별 응답 MIME 타입
+STREAM_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
+
+def _format_event(event, stream_format):
+    body = current_app.json.dumps(event)
+    if stream_format == 'sse':
+        return f"event: {event['type']}\ndata: {body}\n\n"
+    return body + "\n"
+
+
+def _cached_json(payload, *version_parts):
+    """version_parts로 만든 weak ETag와 Cache-Control을 붙여 응답합니다.
+    
+    클라이언트의 If-None-Match와 같으면 본문을 직렬화하지 않고 304로 응답합니다.
+    버전을 알 수 없으면(None이 섞여 있으면, 예: 조회 중인 시세) 캐시하지 않습니다.
+    """
+    if any(part is None for part in version_parts):
+        response = jsonify(payload)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    
+    return _conditional_response(page_etag(*version_parts), lambda: jsonify(payload))
+
+
+def _conditional_response(etag, render, max_age=None):
+    """If-None-Match가 etag와 같으면 render를 호출하지 않고 304로 응답합니다.
+    
+    max_age(초)를 주지 않으면 Config.CACHE_DURATION 동안 캐시하도록 합니다.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = render()
+    # stockDataUpdated 등 요청 시각 필드는 버전에 넣지 않으므로 weak ETag
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = f"public, max-age={Config.CACHE_DURATION if max_age is None else max_age}"
+    return response
+
+
+def _prebuilt_page(name, date):
+    """미리 만들어 둔 페이지(services.news_pages)가 있으면 그 본문으로 응답합니다 (스트리밍 제외)."""
+    if not Config.PRECOMPUTE_ENABLED or request.args.get('stream'):
+        return None
+    page = get_page(name, date)
+    if page is None:
+        return None
+    # 페이지가 만들어진 뒤 지난 시간만큼 줄여, 클라이언트 캐시까지 합쳐도 CACHE_DURATION을 넘지 않게 함
+    return _conditional_response(
+        page['etag'],
+        lambda: current_app.response_class(page['body'], mimetype=current_app.json.mimetype),
+        max_age=max(int(Config.CACHE_DURATION - page['age']), 0)
+    )
+
+
+def _news_response(news_data, key_type='name', version=None):
+    """?stream=ndjson|sse면 캐시된 시세로 기사를 먼저 보내고 나머지 시세를 이어서 보냅니다.
+    
+    스트리밍이 아니면 백엔드 페이로드 버전(version)과 시세 버전으로 ETag를 붙입니다.
+    """
+    stream_format = request.args.get('stream')
+    if not stream_format:
+        payload, quotes_version = enrich_news_payload_versioned(news_data, key_type=key_type)
+        return _cached_json(payload, version, quotes_version, key_type)
+    
+    events = (
+        _format_event(event, stream_format)
+        for event in stream_news_payload(news_data, key_type=key_type)
+    )
+    response = Response(
+        stream_with_context(trace_stream(events)),
+        mimetype=STREAM_MIMETYPES[stream_format]
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    # nginx 등 리버스 프록시가 응답을 모아서 보내지 않도록
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _invalid_stream_format():
+    stream_format = request.args.get('stream')
+    return stream_format is not None and stream_format not in STREAM_MIMETYPES
+
 @news_bp.route('/api/company-stockInfo')
 @track_performance('company-stockInfo')
 def get_company_stock_info():
@@ -17,12 +117,20 @@ def get_company_stock_info():
     
     companies_name, company_stock_data = get_stock_data(ticker)
     
-    if 'error' in company_stock_data:
+    # /api/stock-quotes의 티커별 status와 같은 기준으로 분류
+    status = stock_data_status(company_stock_data)
+    if status == 'pending':
+        # 조회는 계속 진행 중이므로 잠시 후 다시 요청하면 캐시에서 응답
+        response = jsonify({"error": company_stock_data['error'], "ticker": companies_name, "pending": True})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    
+    if status != 'ok':
         error_message = company_stock_data['error']
         
-        if "Invalid ticker format" in error_message:
+        if status == 'invalid':
             return jsonify({"error": error_message, "ticker": companies_name}), 400
-        elif "No stock data available" in error_message:
+        elif status == 'not_found':
             return jsonify({"error": error_message, "ticker": companies_name}), 404
         
         else:
@@ -32,7 +140,118 @@ def get_company_stock_info():
         **company_stock_data  # company_stock_data 딕셔너리의 내용을 펼침
     }
     
-    return jsonify(response_data)
+    return _cached_json(response_data, companies_name, company_stock_data.get('lastUpdated'))
+
+
+def _batch_quote_request():
+    """GET ?tickers=A,B&deadline=2 또는 POST ["A", "B"] / {"tickers": [...], "deadline": 2}에서
+    (티커 목록, deadline, 에러 메시지)를 꺼냅니다."""
+    if request.method == 'POST':
+        body = request.get_json(silent=True)
+        if isinstance(body, dict):
+            tickers, deadline = body.get('tickers'), body.get('deadline')
+        else:
+            tickers, deadline = body, None
+        if not isinstance(tickers, list) or not all(isinstance(ticker, str) for ticker in tickers):
+            return None, None, "Request body must be a JSON array of tickers or {\"tickers\": [...]}"
+    else:
+        tickers = (request.args.get('tickers') or '').split(',')
+        deadline = request.args.get('deadline')
+    
+    # 공백 제거 후 순서를 유지한 채 중복 제거
+    tickers = list(dict.fromkeys(ticker.strip() for ticker in tickers if ticker.strip()))
+    if not tickers:
+        return None, None, "Missing 'tickers' parameter"
+    if len(tickers) > Config.BATCH_QUOTE_MAX_TICKERS:
+        return None, None, f"Too many tickers (max {Config.BATCH_QUOTE_MAX_TICKERS})"
+    
+    if deadline is not None:
+        try:
+            deadline = float(deadline)
+        except (TypeError, ValueError):
+            return None, None, "Invalid deadline. Use a positive number of seconds"
+        if deadline <= 0:
+            return None, None, "Invalid deadline. Use a positive number of seconds"
+        deadline = min(deadline, Config.REQUEST_TIMEOUT)
+    
+    return tickers, deadline, None
+
+
+@news_bp.route('/api/stock-quotes', methods=['GET', 'POST'])
+@track_performance('stock-quotes')
+def get_stock_quotes_batch():
+    """여러 티커의 시세를 한 번에 조회합니다 (티커별 status: ok/pending/not_found/error/invalid)."""
+    tickers, deadline, error = _batch_quote_request()
+    if error:
+        return jsonify({"error": error}), 400
+    
+    fetched = get_stock_quotes(tickers, deadline=deadline)
+    
+    quotes = {}
+    pending = []
+    for ticker in tickers:
+        if ticker not in fetched:
+            quotes[ticker] = {"status": "invalid", "error": "Invalid ticker format"}
+            continue
+        
+        company_name, stock_data = fetched[ticker]
+        status = stock_data_status(stock_data)
+        if status == 'ok':
+            quotes[ticker] = {"status": status, "name": company_name, "data": stock_data}
+        else:
+            quotes[ticker] = {"status": status, "name": company_name, "error": stock_data['error']}
+        if status == 'pending':
+            pending.append(ticker)
+    
+    payload = {"quotes": quotes, "pending": pending, "count": len(quotes)}
+    if request.method == 'GET':
+        response = _cached_json(payload, quote_version({ticker: data for ticker, (_, data) in fetched.items()}))
+    else:
+        response = jsonify(payload)
+    
+    if pending:
+        # 남은 조회는 백그라운드에서 캐시에 저장되므로 잠시 후 다시 요청하면 됨
+        response.headers['Retry-After'] = '1'
+    return response
+
+
+@news_bp.route('/api/stock-history')
+@track_performance('stock-history')
+def get_stock_history():
+    """티커의 OHLCV 이력을 열 단위 배열로 반환합니다 (?company=&interval=1d|1wk&start=&end=)."""
+    ticker = request.args.get('company')
+    if not ticker:
+        return jsonify({"error": "Company parameter is required"}), 400
+    if not validate_ticker(ticker):
+        return jsonify({"error": "Invalid ticker format"}), 400
+    
+    interval = request.args.get('interval', '1d')
+    if interval not in HISTORY_INTERVALS:
+        return jsonify({"error": f"Invalid interval. Use one of: {', '.join(HISTORY_INTERVALS)}"}), 400
+    
+    start = request.args.get('start')
+    end = request.args.get('end')
+    for value in (start, end):
+        if value is not None and not validate_date_format(value):
+            return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+    
+    history = get_price_history(ticker, start=start, end=end, interval=interval)
+    if 'error' in history:
+        if history.get('retry'):
+            response = jsonify({"error": history['error']})
+            response.headers['Retry-After'] = '1'
+            return response, 503
+        if history.get('unsupported'):
+            return jsonify({"error": history['error']}), 501
+        status = 404 if history['error'] == "No price history available" else 500
+        return jsonify({"error": history['error']}), status
+    
+    # 마지막 봉(날짜, 종가)과 봉 개수가 같으면 같은 응답
+    return _cached_json(
+        history, history['ticker'], interval, start or '', end or '',
+        len(history['dates']), history['dates'][-1], history['close'][-1]
+    )
+
 
 @news_bp.route('/api/news-with-stock')
 @track_performance('news-with-stock')
@@ -43,17 +262,20 @@ def get_news_with_stock_info():
     
     if not validate_date_format(date):
         return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+    
+    if _invalid_stream_format():
+        return jsonify({"error": "Invalid stream format. Use ndjson or sse"}), 400
 
-    news_data, error = fetch_from_backend('/api/news/top', {'date': date})
+    prebuilt = _prebuilt_page('news-with-stock', date)
+    if prebuilt is not None:
+        return prebuilt
+    
+    news_data, version, error = fetch_versioned_from_backend('/api/news/top', {'date': date})
     if error:
         return jsonify(error), 500
 
     if news_data:
-        processed_news_data = {}
-        for category, articles in news_data.items():
-            processed_news_data[category] = enrich_articles_with_stock_info(articles)
-        
-        return jsonify(processed_news_data)
+        return _news_response(news_data, version=version)
     
     return jsonify({"error": "No news data available"}), 500
 
@@ -103,16 +325,20 @@ def get_date_news_with_stock_info():
     
     if not validate_date_format(date):
         return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+    
+    if _invalid_stream_format():
+        return jsonify({"error": "Invalid stream format. Use ndjson or sse"}), 400
 
-    news_data, error = fetch_from_backend('/api/news/by-date', {'date': date})
+    prebuilt = _prebuilt_page('date-news-with-stock', date)
+    if prebuilt is not None:
+        return prebuilt
+    
+    news_data, version, error = fetch_versioned_from_backend('/api/news/by-date', {'date': date})
     if error:
         return jsonify(error), 500
 
     if news_data:
-        processed_news_data = {}
-        for category, articles in news_data.items():
-            processed_news_data[category] = enrich_articles_with_stock_info(articles)
-        return jsonify(processed_news_data)
+        return _news_response(news_data, version=version)
     
     return jsonify({"error": "No news data available"}), 500
 
@@ -125,15 +351,19 @@ def get_date_news_with_stock_ticker_info():
     
     if not validate_date_format(date):
         return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+    
+    if _invalid_stream_format():
+        return jsonify({"error": "Invalid stream format. Use ndjson or sse"}), 400
 
-    news_data, error = fetch_from_backend('/api/news/by-date', {'date': date})
+    prebuilt = _prebuilt_page('date-news-with-stock-ticker', date)
+    if prebuilt is not None:
+        return prebuilt
+    
+    news_data, version, error = fetch_versioned_from_backend('/api/news/by-date', {'date': date})
     if error:
         return jsonify(error), 500
 
     if news_data:
-        processed_news_data = {}
-        for category, articles in news_data.items():
-            processed_news_data[category] = enrich_articles_with_stock_info(articles, key_type='ticker')
-        return jsonify(processed_news_data)
+        return _news_response(news_data, key_type='ticker', version=version)
     
     return jsonify({"error": "No news data available"}), 500
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""실시간 시세 구독(SSE) 라우트
+
+연결 하나가 응답이 끝날 때까지 열려 있으므로, 운영에서는 gevent 워커로 띄운
+전용 스트림 프로세스(app:create_stream_app())에서 제공합니다.
+"""
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from config import Config
+from services.quote_stream import quote_hub
+from utils.validators import validate_ticker
+from utils.symbol_universe import symbol_universe
+from utils.decorators import track_performance
+from .news_routes import STREAM_MIMETYPES, _format_event
+
+stream_bp = Blueprint('stream', __name__)
+
+
+@stream_bp.route('/api/stock-stream')
+@track_performance('stock-stream')
+def stream_stock_quotes():
+    """?tickers=A,B를 구독해 시세가 바뀔 때마다 바뀐 필드만 SSE로 보냅니다.
+    
+    이미 조회된 티커는 구독 즉시 현재 값 전체를 받고, 이후에는 변경분만 받습니다.
+    이벤트의 티커는 정규 표기입니다 (예: BRK.B -> BRK-B).
+    """
+    requested = [ticker.strip() for ticker in (request.args.get('tickers') or '').split(',') if ticker.strip()]
+    if not requested:
+        return jsonify({"error": "Missing 'tickers' parameter"}), 400
+    if len(requested) > Config.QUOTE_STREAM_MAX_TICKERS:
+        return jsonify({"error": f"Too many tickers (max {Config.QUOTE_STREAM_MAX_TICKERS})"}), 400
+    invalid = [ticker for ticker in requested if not validate_ticker(ticker)]
+    if invalid:
+        return jsonify({"error": f"Invalid ticker format: {', '.join(invalid)}"}), 400
+    
+    # 표기가 달라도 같은 종목이면 같은 폴링 대상을 구독
+    resolved = {ticker: symbol_universe.resolve(ticker) for ticker in requested}
+    unknown = [ticker for ticker, canonical in resolved.items() if canonical is None]
+    if unknown:
+        return jsonify({"error": f"Unknown ticker symbol: {', '.join(unknown)}"}), 400
+    tickers = list(dict.fromkeys(resolved.values()))
+    
+    subscription = quote_hub.subscribe(tickers)
+    if subscription is None:
+        response = jsonify({"error": "Too many subscribers"})
+        response.headers['Retry-After'] = str(int(Config.QUOTE_STREAM_INTERVAL) or 1)
+        return response, 503
+    
+    def events():
+        yield _format_event({"type": "subscribed", "tickers": tickers}, 'sse')
+        while True:
+            updates = subscription.wait(Config.QUOTE_STREAM_HEARTBEAT)
+            if updates:
+                yield _format_event({"type": "quotes", "quotes": updates}, 'sse')
+            else:
+                # 끊긴 연결은 쓰기에 실패해야 감지되므로 주기적으로 주석을 보냄
+                yield ": keep-alive\n\n"
+    
+    response = Response(stream_with_context(events()), mimetype=STREAM_MIMETYPES['sse'])
+    # 제너레이터가 시작되기 전에 연결이 끊겨도 WSGI 서버가 응답을 닫을 때 구독을 해제
+    response.call_on_close(lambda: quote_hub.unsubscribe(subscription))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
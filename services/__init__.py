@@ -2,17 +2,38 @@
 from .stock_service import (
     get_stock_data,
     get_stock_data_batch,
+    get_stock_quotes,
+    get_ticker_metadata,
+    get_price_history,
+    stock_data_status,
     getName_StockInfo,
     enrich_articles_with_stock_info,
+    enrich_news_payload,
+    enrich_news_payload_versioned,
+    stream_news_payload,
+    start_hot_ticker_refresher,
+    load_cache_snapshot,
+    start_snapshot_timer,
     cleanup_resources
 )
-from .news_service import fetch_from_backend
+from .news_service import fetch_from_backend, fetch_versioned_from_backend
 
 __all__ = [
     'get_stock_data',
     'get_stock_data_batch',
+    'get_stock_quotes',
+    'get_ticker_metadata',
+    'get_price_history',
+    'stock_data_status',
     'getName_StockInfo',
     'enrich_articles_with_stock_info',
+    'enrich_news_payload',
+    'enrich_news_payload_versioned',
+    'stream_news_payload',
+    'start_hot_ticker_refresher',
+    'load_cache_snapshot',
+    'start_snapshot_timer',
     'cleanup_resources',
-    'fetch_from_backend'
+    'fetch_from_backend',
+    'fetch_versioned_from_backend'
 ]
@@ -0,0 +1,311 @@
+"""asyncio 기반 뉴스/주식 데이터 서비스
+
+백엔드 호출과 캐시 미스 티커의 시세 조회를 스레드 대신 코루틴으로 실행합니다.
+요청당 동시 업스트림 호출 수는 Config.ASYNC_CONCURRENCY_LIMIT로 제한되며,
+캐시/메타데이터/single-flight는 동기 경로(stock_service)와 그대로 공유합니다.
+시세는 QUOTE_PROVIDERS가 yfinance 하나일 때만 Yahoo chart API를 직접 호출하고,
+그 밖의 제공자 구성(fixture, http, failover)에서는 동기 경로와 같은 제공자 체인으로 조회합니다.
+
+httpx가 설치돼 있어야 하며, Flask async 뷰를 쓰려면 Flask[async]도 필요합니다.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from config import Config
+from utils.metrics import increment_coalesced_requests, increment_news_cache
+from utils.tracing import stage_span, trace_stage_async, with_current_endpoint
+from utils.json_provider import json_fragments
+from services.news_service import _select_news_cache, _news_cache_key, _make_news_entry
+from utils.resilience import UpstreamThrottledError
+from services.stock_service import (
+    stock_cache,
+    quote_provider,
+    yahoo_guard,
+    UPSTREAM_UNAVAILABLE_ERRORS,
+    _unavailable_stock_data,
+    _store_stock_data,
+    _split_cached,
+    _resolve_tickers,
+    _unknown_stock_data,
+    metadata_cache,
+    get_ticker_metadata,
+    _build_stock_data,
+    _fetch_stock_data_bulk,
+    _company_name,
+    _collect_tickers,
+    _apply_stock_info
+)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+YAHOO_CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart/{ticker}'
+# 기본 User-Agent로는 Yahoo가 요청을 거부하는 경우가 많음
+YAHOO_HEADERS = {'User-Agent': 'Mozilla/5.0 (compatible; AIvestor/1.0)'}
+
+
+def uses_chart_api():
+    """Yahoo chart API를 직접 호출할지 여부 (QUOTE_PROVIDERS가 yfinance 하나일 때만)"""
+    return quote_provider.name == 'yfinance'
+
+
+def is_available():
+    """async 경로에 필요한 의존성이 설치돼 있는지 확인합니다."""
+    return httpx is not None
+
+
+def create_async_client():
+    """요청 단위로 사용할 AsyncClient를 생성합니다."""
+    return httpx.AsyncClient(
+        timeout=Config.REQUEST_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=Config.ASYNC_CONCURRENCY_LIMIT,
+            max_keepalive_connections=Config.ASYNC_CONCURRENCY_LIMIT
+        )
+    )
+
+
+@trace_stage_async('backend_fetch')
+async def fetch_from_backend_async(client, endpoint, params):
+    """백엔드 API로부터 데이터를 비동기로 가져옵니다 (동기 경로와 같은 뉴스 페이로드 캐시 사용)."""
+    backend_url = f"{Config.BACKEND_URL}{endpoint}"
+    cache = _select_news_cache(params) if Config.NEWS_CACHE_ENABLED else None
+    key = _news_cache_key(endpoint, params)
+    
+    entry, is_stale = cache.lookup(key) if cache is not None else (None, False)
+    if entry is not None and not is_stale:
+        increment_news_cache('hit')
+        return json.loads(entry["body"]), None
+    
+    if cache is not None:
+        increment_news_cache('stale' if entry is not None else 'miss')
+    headers = {'If-None-Match': entry['etag']} if entry and entry.get('etag') else None
+    
+    try:
+        logger.debug(f"Fetching from backend (async): {backend_url} with params: {params}")
+        with stage_span('backend_request'):
+            response = await client.get(backend_url, params=params, headers=headers)
+        
+        if response.status_code == 304 and entry is not None:
+            increment_news_cache('not_modified')
+            cache.set(key, entry)
+            return json.loads(entry["body"]), None
+        
+        response.raise_for_status()
+        data = response.json()
+        if cache is not None:
+            cache.set(key, _make_news_entry(response.content, response.headers.get('ETag')))
+        logger.info(f"Successfully fetched data from {endpoint}")
+        return data, None
+    except (httpx.HTTPError, ValueError) as e:
+        if entry is not None:
+            logger.warning(f"Serving stale news payload for {key}: {e}")
+            return json.loads(entry["body"]), None
+        error_msg = f"Failed to fetch from backend {endpoint}: {e}"
+        logger.error(error_msg)
+        return None, {"error": error_msg}
+
+
+async def _fetch_chart_quote(client, semaphore, ticker):
+    """Yahoo chart API에서 최근 종가 두 개와 메타데이터를 가져와 캐시에 저장합니다."""
+    try:
+        # chart API는 티커마다 요청 하나라 토큰도 티커마다 하나씩 쓰므로, 버스트를 넘는 티커는
+        # 실패시키지 않고 STOCK_DATA_DEADLINE 안에서 토큰을 예약해 기다림 (이벤트 루프는 막지 않음)
+        wait_time = yahoo_guard.reserve(Config.STOCK_DATA_DEADLINE)
+    except UPSTREAM_UNAVAILABLE_ERRORS as e:
+        return _unavailable_stock_data(ticker, e)
+    if wait_time:
+        await asyncio.sleep(wait_time)
+    
+    try:
+        try:
+            async with semaphore:
+                with stage_span('upstream_quote'):
+                    response = await client.get(
+                        YAHOO_CHART_URL.format(ticker=ticker),
+                        params={'range': Config.BULK_DOWNLOAD_PERIOD, 'interval': '1d'},
+                        headers=YAHOO_HEADERS
+                    )
+            if response.status_code == 429:
+                raise UpstreamThrottledError(f"Rate limited while fetching {ticker}")
+            # 존재하지 않는 심볼은 404로 응답함
+            if response.status_code != 404:
+                response.raise_for_status()
+        except Exception as e:
+            yahoo_guard.failure(e)
+            raise
+        yahoo_guard.success()
+        
+        result = None
+        if response.status_code != 404:
+            result = (response.json().get('chart', {}).get('result') or [None])[0]
+        
+        if response.status_code == 404:
+            # 업스트림이 심볼이 없다고 명시한 경우만 없는 티커로 확정
+            stock_data = {"error": "No stock data available"}
+        elif not result:
+            stock_data = {"error": f"No quote returned for {ticker}"}
+        else:
+            quote = (result.get('indicators', {}).get('quote') or [{}])[0]
+            closes = [close for close in quote.get('close') or [] if close is not None]
+            
+            if len(closes) < 2 or closes[-1] <= 0 or closes[-2] <= 0:
+                stock_data = {"error": f"No quote returned for {ticker}"}
+            else:
+                stock_data = _build_stock_data(ticker, float(closes[-1]), float(closes[-2]))
+                
+                # chart 응답에 포함된 메타데이터로 .info 호출 없이 캐시를 채움
+                meta = result.get('meta', {})
+                name = meta.get('shortName') or meta.get('longName')
+                if name and metadata_cache.get(ticker) is None:
+                    metadata_cache.set(ticker, {
+                        "name": name,
+                        "exchange": meta.get('exchangeName'),
+                        "currency": meta.get('currency')
+                    })
+    except Exception as e:
+        logger.error(f"Failed to fetch stock data for {ticker} (async): {str(e)}")
+        stock_data = {"error": str(e)}
+    
+    # 에러도 종류별 TTL로 캐시 (중복 요청 방지)
+    _store_stock_data(ticker, stock_data)
+    return stock_data
+
+
+async def _fetch_as_leader_async(client, semaphore, leader_tickers):
+    """leader로 등록된 티커들을 조회하고 대기자에게 결과를 전달합니다.
+    
+    chart API를 쓰지 않는 제공자 구성이면 동기 경로의 일괄 조회(제공자 체인, failover 포함)를
+    executor에서 실행합니다.
+    """
+    results = {}
+    try:
+        if uses_chart_api():
+            fetched = await asyncio.gather(
+                *(_fetch_chart_quote(client, semaphore, ticker) for ticker in leader_tickers)
+            )
+            results.update(zip(leader_tickers, fetched))
+        else:
+            results.update(
+                await asyncio.get_running_loop().run_in_executor(
+                    None, with_current_endpoint(_fetch_stock_data_bulk), leader_tickers
+                )
+            )
+    finally:
+        for ticker in leader_tickers:
+            if ticker in results:
+                stock_cache.inflight.resolve(ticker, results[ticker])
+            else:
+                stock_cache.inflight.resolve(ticker, exception=RuntimeError("Upstream fetch failed"))
+    return results
+
+
+async def _wait_for_inflight(ticker, future):
+    """다른 요청(스레드 또는 코루틴)이 가져오는 중인 결과를 기다립니다."""
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=Config.REQUEST_TIMEOUT)
+    except Exception as exc:
+        logger.error(f'{ticker} generated an exception: {exc}')
+        return {"error": str(exc)}
+
+
+@trace_stage_async('stock_batch')
+async def get_stock_data_batch_async(client, tickers):
+    """여러 티커의 주식 데이터를 비동기로 가져옵니다. 반환 형식은 get_stock_data_batch와 같습니다."""
+    if not tickers:
+        return [], {}, {}
+    
+    resolved = _resolve_tickers(tickers)
+    if not resolved:
+        logger.warning("No valid tickers provided")
+        return [], {}, {}
+    valid_tickers = list(dict.fromkeys(canonical for canonical in resolved.values() if canonical is not None))
+    
+    results, missing_tickers = _split_cached(valid_tickers)
+    if missing_tickers:
+        leader_tickers = []
+        waiting = {}
+        for ticker in missing_tickers:
+            future, is_leader = stock_cache.inflight.acquire(ticker)
+            if is_leader:
+                leader_tickers.append(ticker)
+            else:
+                waiting[ticker] = future
+        
+        if waiting:
+            increment_coalesced_requests(len(waiting))
+        
+        semaphore = asyncio.Semaphore(Config.ASYNC_CONCURRENCY_LIMIT)
+        tasks = [_fetch_as_leader_async(client, semaphore, leader_tickers)] if leader_tickers else []
+        tasks += [_wait_for_inflight(ticker, future) for ticker, future in waiting.items()]
+        outcomes = await asyncio.gather(*tasks)
+        
+        if leader_tickers:
+            results.update(outcomes.pop(0))
+        results.update(zip(waiting, outcomes))
+    
+    # chart API를 쓰면 응답으로 대부분 채워지므로 여기서는 보통 네트워크 호출이 없음
+    ok_tickers = [ticker for ticker in valid_tickers if 'error' not in results[ticker]]
+    cached_metadata = {ticker: metadata_cache.get(ticker) for ticker in ok_tickers}
+    missing_metadata = [ticker for ticker, metadata in cached_metadata.items() if metadata is None]
+    if missing_metadata:
+        cached_metadata.update(
+            await asyncio.get_running_loop().run_in_executor(
+                None, with_current_endpoint(get_ticker_metadata), missing_metadata
+            )
+        )
+    
+    companies_info = {}
+    companies_name = []
+    ticker_to_name = {}
+    for ticker, canonical in resolved.items():
+        if canonical is None:
+            stock_data = _unknown_stock_data()
+            company_name = ticker
+        else:
+            stock_data = results[canonical]
+            company_name = _company_name(canonical, stock_data, cached_metadata.get(canonical))
+        companies_info[company_name] = stock_data
+        companies_name.append(company_name)
+        ticker_to_name[ticker] = company_name
+    
+    logger.info(f"Successfully processed {len(companies_info)} tickers (async)")
+    return companies_name, companies_info, ticker_to_name
+
+
+async def enrich_news_payload_async(client, news_data, key_type='name'):
+    """enrich_news_payload의 비동기 버전"""
+    valid_categories = {
+        category: articles for category, articles in news_data.items()
+        if articles and isinstance(articles, list)
+    }
+    
+    all_tickers = set()
+    for articles in valid_categories.values():
+        all_tickers.update(_collect_tickers(articles))
+    
+    companies_info_map, ticker_to_name = {}, {}
+    if all_tickers:
+        _, companies_info_map, ticker_to_name = await get_stock_data_batch_async(client, list(all_tickers))
+    # 여러 기사/카테고리에 나오는 시세는 응답 인코딩 시 한 번만 직렬화
+    companies_info_map = json_fragments(companies_info_map)
+    
+    updated_at = datetime.now().isoformat()
+    processed_news_data = {}
+    for category, articles in news_data.items():
+        if category not in valid_categories:
+            logger.warning(f"Invalid articles data provided for category: {category}")
+            processed_news_data[category] = []
+        elif not all_tickers:
+            processed_news_data[category] = articles
+        else:
+            processed_news_data[category] = _apply_stock_info(
+                articles, companies_info_map, ticker_to_name, key_type, updated_at
+            )
+    
+    return processed_news_data
@@ -0,0 +1,274 @@
+"""미리 만들어 둔 날짜별 뉴스 페이지
+
+오늘과 최근 PRECOMPUTE_DAYS일의 날짜 뉴스 응답을 PRECOMPUTE_INTERVAL마다
+백엔드 조회 → 시세 매핑 → 직렬화까지 마친 본문으로 저장해 두고,
+요청은 CACHE_DURATION 안에 만든 페이지가 있으면 그 본문으로 바로 응답합니다.
+
+페이지는 워커 간 공유 저장소(CACHE_BACKEND=redis면 Redis, 아니면 SQLite 파일)에 두고,
+빌드는 파일 락을 잡은 워커 하나만 합니다. 그 워커가 종료되면 락이 풀려
+다음 주기에 다른 워커가 이어받습니다.
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from config import Config
+from utils.cache import LimitedCache
+from utils.cache_backends import create_cache_backend
+from services.news_service import fetch_versioned_from_backend
+from services.stock_service import enrich_news_payload_versioned
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 (워커가 하나뿐이라고 보고 항상 빌드)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 페이지 이름(엔드포인트 라벨) -> (백엔드 엔드포인트, key_type)
+PAGE_SPECS = {
+    'news-with-stock': ('/api/news/top', 'name'),
+    'date-news-with-stock': ('/api/news/by-date', 'name'),
+    'date-news-with-stock-ticker': ('/api/news/by-date', 'ticker')
+}
+
+
+def _store_path():
+    """페이지 SQLite 파일 경로 (PRECOMPUTE_DB_PATH, 기본값은 공유 캐시 디렉토리)"""
+    if Config.PRECOMPUTE_DB_PATH:
+        return Config.PRECOMPUTE_DB_PATH
+    directory = Config.CACHE_SHM_DIR or ('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+    return os.path.join(directory, 'aivestor_pages.db')
+
+
+# {"이름:날짜": {"body", "etag", "built_at", "build_ms"}} - 워커 간 공유
+# 페이지에 담긴 시세가 CACHE_DURATION보다 오래 쓰이지 않도록 페이지 수명도 CACHE_DURATION
+_PAGE_CACHE_SIZE = len(PAGE_SPECS) * max(Config.PRECOMPUTE_DAYS, 1) * 2
+# 사전 생성을 쓰지 않으면 저장소(SQLite 파일/Redis)를 만들지 않도록 처음 쓸 때 생성
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+# 마지막 빌드 결과 (이 프로세스에서 만든 페이지 기준)
+_stats_lock = threading.Lock()
+build_stats = {
+    "runs": 0,
+    "last_run": None,
+    "last_run_ms": None,
+    "served": 0,
+    "pages": {}
+}
+
+_builder_stop = threading.Event()
+_builder_thread = None
+# 빌더로 선출된 워커가 잡고 있는 락 파일 (프로세스가 끝나면 OS가 락을 풂)
+_builder_lock_file = None
+
+
+def _page_store():
+    """페이지 저장소 (처음 호출할 때 생성)"""
+    global _page_cache
+
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = LimitedCache(
+                max_size=_PAGE_CACHE_SIZE,
+                cache_duration=Config.CACHE_DURATION,
+                record_metrics=False,
+                backend=create_cache_backend(
+                    'redis' if Config.CACHE_BACKEND == 'redis' else 'sqlite',
+                    'news_pages',
+                    _PAGE_CACHE_SIZE,
+                    path=_store_path()
+                )
+            )
+        return _page_cache
+
+
+def page_etag(*version_parts):
+    """버전 구성 요소로 weak ETag 값을 만듭니다 (라우트의 조건부 응답과 같은 방식)."""
+    return f"{zlib.crc32('|'.join(map(str, version_parts)).encode()):08x}"
+
+
+def _page_key(name, date):
+    return f"{name}:{date}"
+
+
+def _page_dates():
+    """오늘부터 PRECOMPUTE_DAYS일 전까지의 날짜 (YYYY-MM-DD)"""
+    today = datetime.now().date()
+    return [(today - timedelta(days=offset)).isoformat() for offset in range(max(Config.PRECOMPUTE_DAYS, 1))]
+
+
+def _build_interval():
+    """실제 빌드 주기 - 페이지가 만료(CACHE_DURATION)되기 전에 다음 페이지가 만들어지도록 제한"""
+    return max(min(Config.PRECOMPUTE_INTERVAL, Config.CACHE_DURATION / 2), 1)
+
+
+def get_page(name, date):
+    """CACHE_DURATION 안에 만든 페이지를 반환합니다. 없거나 사전 생성을 쓰지 않으면 None.
+
+    반환값의 "age"는 페이지를 만든 뒤 지난 시간(초)입니다.
+    """
+    if not Config.PRECOMPUTE_ENABLED:
+        return None
+    page = _page_store().get(_page_key(name, date))
+    if page is None:
+        return None
+    with _stats_lock:
+        build_stats["served"] += 1
+    return {**page, "age": max(time.time() - page["built_at"], 0)}
+
+
+def build_page(app, name, date):
+    """페이지 하나를 만들어 저장하고 빌드 결과를 반환합니다.
+
+    아직 조회 중인 시세가 있으면 저장하지 않고 다음 주기에 다시 만듭니다
+    (그동안 요청은 기존처럼 처리되고, 조회는 백그라운드에서 캐시에 저장됨).
+    """
+    endpoint, key_type = PAGE_SPECS[name]
+    start_time = time.perf_counter()
+
+    news_data, version, error = fetch_versioned_from_backend(endpoint, {'date': date})
+    if error or not news_data:
+        return {"status": "error" if error else "empty", "build_ms": (time.perf_counter() - start_time) * 1000}
+
+    # 요청 경로가 아니므로 시세 조회는 STOCK_DATA_DEADLINE 대신 REQUEST_TIMEOUT까지 기다림
+    payload, quotes_version = enrich_news_payload_versioned(news_data, key_type=key_type, deadline=0)
+    if version is None or quotes_version is None:
+        return {"status": "pending", "build_ms": (time.perf_counter() - start_time) * 1000}
+
+    # 공유 저장소(Redis는 JSON)에 그대로 저장할 수 있도록 문자열로 둠
+    body = app.json.dumps(payload) + "\n"
+    build_ms = (time.perf_counter() - start_time) * 1000
+    _page_store().set(_page_key(name, date), {
+        "body": body,
+        "etag": page_etag(version, quotes_version, key_type),
+        "built_at": time.time(),
+        "build_ms": build_ms
+    })
+    return {"status": "ok", "build_ms": build_ms, "bytes": len(body.encode())}
+
+
+def build_news_pages(app):
+    """모든 페이지를 한 번 만들고 {"이름:날짜": 빌드 결과}를 반환합니다."""
+    start_time = time.perf_counter()
+    results = {}
+    with app.app_context():
+        for date in _page_dates():
+            for name in PAGE_SPECS:
+                try:
+                    result = build_page(app, name, date)
+                except Exception as e:
+                    logger.error(f"Failed to build page {name} for {date}: {str(e)}")
+                    result = {"status": "error", "error": str(e)}
+                results[_page_key(name, date)] = result
+
+    run_ms = (time.perf_counter() - start_time) * 1000
+    with _stats_lock:
+        build_stats["runs"] += 1
+        build_stats["last_run"] = datetime.now().isoformat()
+        build_stats["last_run_ms"] = run_ms
+        # 날짜가 바뀌면 지난 날짜 항목은 자연히 빠짐
+        build_stats["pages"] = results
+    logger.info(f"Built {sum(1 for r in results.values() if r['status'] == 'ok')}/{len(results)} news pages in {run_ms:.0f}ms")
+    return results
+
+
+def page_stats():
+    """페이지별 빌드 시간과 현재 저장된 페이지의 나이(초)
+
+    빌드 결과는 이 워커가 빌더일 때만 있고, 나이는 공유 저장소 기준이라 모든 워커에서 같습니다.
+    저장소를 아직 만들지 않았으면(사전 생성을 쓰지 않음) 저장소를 만들지 않고 나이를 비워 둡니다.
+    """
+    store = _page_cache
+    now = time.time()
+    with _stats_lock:
+        stats = {key: value for key, value in build_stats.items() if key != "pages"}
+        pages = dict(build_stats["pages"])
+
+    stats["pages"] = {}
+    for date in _page_dates():
+        for name in PAGE_SPECS:
+            key = _page_key(name, date)
+            result = pages.get(key, {})
+            stored = store.peek(key) if store is not None else None
+            stats["pages"][key] = {
+                "status": result.get("status"),
+                "build_ms": stored["build_ms"] if stored is not None else result.get("build_ms"),
+                "bytes": result.get("bytes"),
+                # 마지막 빌드가 실패했어도 이전에 만든 페이지가 아직 유효하면 그 페이지로 응답
+                "age": now - stored["built_at"] if stored is not None else None
+            }
+    return {
+        "enabled": Config.PRECOMPUTE_ENABLED,
+        "interval": _build_interval(),
+        "max_age": Config.CACHE_DURATION,
+        "builder": _builder_lock_file is not None or (fcntl is None and _builder_thread is not None),
+        **stats
+    }
+
+
+def _acquire_builder_lock():
+    """빌더 락을 잡아 봅니다 (기다리지 않음). 이 워커가 빌더면 True."""
+    global _builder_lock_file
+
+    if _builder_lock_file is not None or fcntl is None:
+        return True
+
+    lock_file = open(_store_path() + '.lock', 'a')
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+
+    _builder_lock_file = lock_file
+    logger.info(f"This worker (pid {os.getpid()}) builds the news pages")
+    return True
+
+
+def _release_builder_lock():
+    global _builder_lock_file
+
+    if _builder_lock_file is not None:
+        fcntl.flock(_builder_lock_file.fileno(), fcntl.LOCK_UN)
+        _builder_lock_file.close()
+        _builder_lock_file = None
+
+
+def _builder_loop(app):
+    """시작하자마자 한 번, 이후 빌드 주기마다 빌더 락을 잡은 워커만 페이지를 만듭니다."""
+    try:
+        while True:
+            try:
+                if _acquire_builder_lock():
+                    build_news_pages(app)
+            except Exception as e:
+                logger.error(f"News page build failed: {str(e)}")
+            if _builder_stop.wait(_build_interval()):
+                return
+    finally:
+        _release_builder_lock()
+
+
+def start_page_builder(app):
+    """뉴스 페이지 사전 생성 스레드를 시작합니다 (빌드는 워커 중 하나만)."""
+    global _builder_thread
+
+    if _builder_thread is not None and _builder_thread.is_alive():
+        return
+
+    _builder_stop.clear()
+    _builder_thread = threading.Thread(target=_builder_loop, args=(app,), name='news-page-builder', daemon=True)
+    _builder_thread.start()
+    logger.info(f"News page builder started: days={Config.PRECOMPUTE_DAYS}, interval={_build_interval()}s")
+
+
+def stop_page_builder():
+    """뉴스 페이지 사전 생성 스레드를 멈춥니다."""
+    _builder_stop.set()
+    if _builder_thread is not None:
+        _builder_thread.join(timeout=Config.REQUEST_TIMEOUT)
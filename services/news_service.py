@@ -1,27 +1,238 @@
 """뉴스 데이터 관련 서비스"""
 import requests
+import json
 import logging
-from flask import current_app
+import threading
+import zlib
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import Config
+from utils.cache import LimitedCache
+from utils.metrics import increment_news_cache
+from utils.tracing import stage_span, trace_stage
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_from_backend(endpoint, params):
-    """백엔드 API로부터 데이터를 가져옵니다."""
+def _create_backend_session():
+    """백엔드 호출용 커넥션 풀 세션을 생성합니다 (keep-alive, 재시도, gzip)."""
+    # 읽기 타임아웃은 재시도하지 않음 (느린 백엔드에 같은 요청을 다시 보내 대기 시간만 늘어남)
+    retry = Retry(
+        total=Config.BACKEND_MAX_RETRIES,
+        connect=Config.BACKEND_MAX_RETRIES,
+        read=0,
+        backoff_factor=Config.BACKOFF_FACTOR,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=Config.BACKEND_POOL_CONNECTIONS,
+        pool_maxsize=Config.BACKEND_POOL_SIZE,
+        pool_block=Config.BACKEND_POOL_BLOCK,
+        max_retries=retry
+    )
+    
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    return session, adapter
+
+
+# 워커 전체에서 공유하는 백엔드 세션 (urllib3 커넥션 풀은 스레드 안전)
+backend_session, backend_adapter = _create_backend_session()
+
+# 뉴스 페이로드 캐시 (오늘/최근 날짜는 짧게, 지난 날짜는 바뀌지 않으므로 길게 유지)
+# soft TTL이 지난 항목은 hard TTL까지 보관했다가 ETag로 재검증
+news_cache = LimitedCache(
+    max_size=Config.NEWS_CACHE_SIZE,
+    cache_duration=Config.NEWS_CACHE_DURATION,
+    hard_duration=Config.NEWS_CACHE_STALE_DURATION,
+    record_metrics=False
+)
+archive_news_cache = LimitedCache(
+    max_size=Config.NEWS_CACHE_SIZE,
+    cache_duration=Config.NEWS_ARCHIVE_CACHE_DURATION,
+    hard_duration=Config.NEWS_ARCHIVE_CACHE_DURATION * 7,
+    record_metrics=False
+)
+
+# 풀 사용률 집계
+_pool_lock = threading.Lock()
+pool_stats = {
+    "in_flight": 0,
+    "max_in_flight": 0,
+    "requests": 0
+}
+
+
+def _track_in_flight(delta):
+    with _pool_lock:
+        pool_stats["in_flight"] += delta
+        if delta > 0:
+            pool_stats["requests"] += 1
+            pool_stats["max_in_flight"] = max(pool_stats["max_in_flight"], pool_stats["in_flight"])
+
+
+def get_backend_pool_stats():
+    """백엔드 커넥션 풀 사용 현황을 반환합니다."""
+    connections_created = 0
+    idle_connections = 0
+    # urllib3 내부 상태를 읽는 것이라 근사치
+    for key in list(backend_adapter.poolmanager.pools.keys()):
+        pool = backend_adapter.poolmanager.pools.get(key)
+        if pool is None:
+            continue
+        connections_created += pool.num_connections
+        idle_connections += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    
+    with _pool_lock:
+        in_flight = pool_stats["in_flight"]
+        stats = dict(pool_stats)
+    
+    return {
+        **stats,
+        "pool_size": Config.BACKEND_POOL_SIZE,
+        "connections_created": connections_created,
+        "idle_connections": idle_connections,
+        "utilization": in_flight / Config.BACKEND_POOL_SIZE if Config.BACKEND_POOL_SIZE else 0
+    }
+
+
+def close_backend_session():
+    """백엔드 세션의 커넥션을 정리합니다."""
+    backend_session.close()
+
+
+def _news_cache_key(endpoint, params):
+    """엔드포인트와 정규화한 파라미터로 캐시 키를 만듭니다."""
+    normalized = sorted((key, str(value).strip()) for key, value in (params or {}).items())
+    return f"{endpoint}?{urlencode(normalized)}"
+
+
+def _select_news_cache(params):
+    """지난 날짜 요청이면 장기 캐시, 그 외(오늘, 주제, 상세)는 단기 캐시를 씁니다."""
+    date = (params or {}).get('date')
+    try:
+        requested = datetime.strptime(date, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return news_cache
+    
+    # 서버와 백엔드의 시간대 차이를 고려해 어제까지는 아직 바뀔 수 있는 것으로 봄
+    if requested < datetime.now().date() - timedelta(days=1):
+        return archive_news_cache
+    return news_cache
+
+
+def _make_news_entry(body, etag):
+    """캐시에 저장할 뉴스 페이로드 항목을 만듭니다."""
+    return {
+        "body": body,
+        "etag": etag,
+        # ETag가 없으면 본문 체크섬을 버전으로 사용
+        "version": etag or f"{zlib.crc32(body):08x}"
+    }
+
+
+def _request_backend(endpoint, params, etag=None):
+    """커넥션 풀 세션으로 백엔드를 호출합니다."""
     backend_url = f"{Config.BACKEND_URL}{endpoint}"
+    headers = {'If-None-Match': etag} if etag else None
     
+    _track_in_flight(1)
     try:
         logger.debug(f"Fetching from backend: {backend_url} with params: {params}")
-        response = requests.get(
-            backend_url, 
-            params=params, 
-            timeout=Config.REQUEST_TIMEOUT
+        with stage_span('backend_request'):
+            return backend_session.get(
+                backend_url,
+                params=params,
+                headers=headers,
+                timeout=(Config.BACKEND_CONNECT_TIMEOUT, Config.BACKEND_READ_TIMEOUT)
+            )
+    finally:
+        _track_in_flight(-1)
+
+
+def _load_news_entry(cache, key, endpoint, params, stale_entry):
+    """백엔드에서 페이로드를 가져와 캐시에 저장합니다. stale 항목이 있으면 ETag로 재검증합니다."""
+    etag = stale_entry.get('etag') if stale_entry else None
+    response = _request_backend(endpoint, params, etag=etag)
+    
+    if response.status_code == 304 and stale_entry:
+        increment_news_cache('not_modified')
+        cache.set(key, stale_entry)
+        return stale_entry
+    
+    response.raise_for_status()
+    # 잘못된 JSON은 캐시하지 않도록 저장 전에 검증
+    response.json()
+    
+    entry = _make_news_entry(response.content, response.headers.get('ETag'))
+    cache.set(key, entry)
+    logger.info(f"Successfully fetched data from {endpoint}")
+    return entry
+
+
+def get_news_payload_entry(endpoint, params):
+    """뉴스 페이로드 캐시 항목({body, etag, version})을 반환합니다.
+    
+    fresh 항목은 그대로, stale 항목은 ETag로 재검증하고, 미스면 백엔드에서 가져옵니다.
+    같은 키를 동시에 요청하면 백엔드 호출은 한 번만 일어납니다.
+    재검증에 실패하면 stale 항목을 대신 반환합니다.
+    """
+    cache = _select_news_cache(params)
+    key = _news_cache_key(endpoint, params)
+    
+    entry, is_stale = cache.lookup(key)
+    if entry is not None and not is_stale:
+        increment_news_cache('hit')
+        return entry
+    
+    increment_news_cache('stale' if entry is not None else 'miss')
+    try:
+        return cache.load_once(
+            key,
+            lambda: _load_news_entry(cache, key, endpoint, params, entry),
+            timeout=Config.BACKEND_READ_TIMEOUT
         )
-        response.raise_for_status()
-        logger.info(f"Successfully fetched data from {endpoint}")
-        return response.json(), None
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, FutureTimeoutError) as e:
+        if entry is None:
+            raise
+        logger.warning(f"Serving stale news payload for {key}: {e}")
+        return entry
+
+
+@trace_stage('backend_fetch')
+def fetch_versioned_from_backend(endpoint, params):
+    """fetch_from_backend와 같지만 페이로드 버전(ETag 또는 본문 체크섬)을 함께 반환합니다.
+    
+    (data, version, error) 형태이며, 응답 ETag 계산에 씁니다.
+    """
+    try:
+        if not Config.NEWS_CACHE_ENABLED:
+            response = _request_backend(endpoint, params)
+            response.raise_for_status()
+            logger.info(f"Successfully fetched data from {endpoint}")
+            return response.json(), _make_news_entry(response.content, response.headers.get('ETag'))["version"], None
+        
+        entry = get_news_payload_entry(endpoint, params)
+        # 기사 dict는 이후 주식 정보 추가 과정에서 수정되므로 요청마다 새로 파싱
+        return json.loads(entry["body"]), entry["version"], None
+    except (requests.exceptions.RequestException, FutureTimeoutError) as e:
         error_msg = f"Failed to fetch from backend {endpoint}: {e}"
         logger.error(error_msg)
-        return None, {"error": error_msg}
+        return None, None, {"error": error_msg}
+
+
+def fetch_from_backend(endpoint, params):
+    """백엔드 API로부터 데이터를 가져옵니다 (뉴스 페이로드 캐시 사용)."""
+    data, _, error = fetch_versioned_from_backend(endpoint, params)
+    return data, error
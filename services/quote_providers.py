@@ -0,0 +1,573 @@
+"""시세 제공자 (QuoteProvider) 구현
+
+모든 제공자는 같은 인터페이스를 따릅니다.
+- get_quotes(tickers): 여러 티커를 한 번에 조회해 (quotes, errors)를 반환
+  quotes는 {ticker: (price, prev_close)}, errors는 {ticker: 에러 메시지}
+  (둘 다에 없는 티커는 호출 측에서 일시적 실패로 처리)
+- get_info(ticker): yfinance .info 형식의 딕셔너리
+  (shortName, exchange, currency, regularMarketPrice, previousClose)
+- iter_infos(tickers): 여러 티커의 (ticker, info)를 조회되는 대로 yield (조회하지 못한 티커는 빠짐)
+  일괄 API가 있는 제공자는 호출 한 번(토큰 하나)으로, 없으면 티커별 get_info를 차례로 호출
+- get_history(ticker, start=None, period=None): 일봉 OHLCV를 (6, n) float64 배열로
+  반환 (행 순서는 utils.history_cache.OHLCV_FIELDS, 이력을 주지 않는 제공자는
+  NotImplementedError)
+
+http/fixture 제공자가 쓰는 레코드 형식은 같습니다.
+  {"AAPL": {"price": 190.1, "previousClose": 188.0, "name": "Apple Inc.",
+            "exchange": "NMS", "currency": "USD"},
+   "ZZZZ": {"error": "No data found, symbol may be delisted"}}
+"""
+import json
+import logging
+import os
+import re
+import threading
+import numpy as np
+import pandas as pd
+import requests
+import yfinance as yf
+from requests.adapters import HTTPAdapter
+from utils.resilience import (
+    CircuitBreaker,
+    AdaptiveRateLimiter,
+    ProviderGuard,
+    CircuitOpenError,
+    RateLimitExceeded,
+    UpstreamError,
+    UpstreamThrottledError,
+    is_throttle_message
+)
+from utils.history_cache import empty_series
+from utils.validators import validate_stock_data
+
+logger = logging.getLogger(__name__)
+
+# yf.download는 버전에 따라 모듈 전역 상태를 공유하므로 동시 호출을 직렬화
+_download_lock = threading.Lock()
+
+
+class _DownloadErrorLog(logging.Handler):
+    """yf.download가 예외 대신 'yfinance' 로거로만 남기는 티커별 에러 메시지를 모읍니다.
+
+    LOG_LEVEL이 ERROR보다 높으면 메시지가 오지 않으므로 요청 제한도 일반 실패로만 기록됩니다.
+    """
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+# yf.download 에러 로그 한 줄: "['AAA', 'BBB']: 에러 메시지"
+_DOWNLOAD_ERROR_LINE = re.compile(r"^\[(.*?)\]: (.*)$", re.S)
+# 예외가 그대로 기록된 메시지: "ReadTimeout('...')"
+_EXCEPTION_REPR = re.compile(r"^(\w+)\((.*)\)$", re.S)
+
+
+def _parse_download_errors(messages):
+    """yf.download 에러 로그를 ({TICKER: 티커 에러}, [전송 에러])로 나눕니다.
+
+    yfinance는 티커 자체의 문제(상장 폐지, 시간대/가격 없음)를 예외 이름 없는 문구나
+    YF*MissingError로, 네트워크/HTTP 실패는 repr(예외)로 남깁니다.
+    """
+    ticker_errors = {}
+    transport_errors = []
+    for message in messages:
+        match = _DOWNLOAD_ERROR_LINE.match(message.strip())
+        if match is None:
+            # "N Failed downloads:" 머리말
+            continue
+        symbols = re.findall(r"'([^']+)'", match.group(1))
+        error = match.group(2).strip()
+        exception = _EXCEPTION_REPR.match(error)
+        if exception is not None:
+            if 'Missing' not in exception.group(1):
+                transport_errors.append(error)
+                continue
+            error = exception.group(2).strip('\'"')
+        for symbol in symbols:
+            ticker_errors[symbol.upper()] = error
+    return ticker_errors, transport_errors
+
+
+class QuoteProvider:
+    """시세 제공자 기본 클래스"""
+    name = 'base'
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {'quote_calls': 0, 'info_calls': 0, 'history_calls': 0, 'failures': 0}
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def get_quotes(self, tickers):
+        raise NotImplementedError
+
+    def get_info(self, ticker):
+        raise NotImplementedError
+
+    def iter_infos(self, tickers):
+        """티커별 get_info를 차례로 호출해 (ticker, info)를 yield합니다.
+
+        병렬로 토큰을 한꺼번에 쓰지 않고 토큰 버킷 속도에 맞춰 하나씩 호출하며,
+        서킷이 열렸거나 토큰이 없으면 남은 티커는 건너뜁니다.
+        """
+        for index, ticker in enumerate(tickers):
+            try:
+                info = self.get_info(ticker)
+            except (CircuitOpenError, RateLimitExceeded) as e:
+                logger.warning(f"Skipping info lookup for {len(tickers) - index} tickers: {str(e)}")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to look up info for {ticker}: {str(e)}")
+                continue
+            if info:
+                yield ticker, info
+
+    def get_history(self, ticker, start=None, period=None):
+        raise NotImplementedError(f"Quote provider '{self.name}' does not support price history")
+
+    def stats(self):
+        with self.lock:
+            return {"name": self.name, **self.counters}
+
+
+def _info_from_record(ticker, record):
+    """http/fixture 레코드를 yfinance .info 형식으로 바꿉니다."""
+    return {
+        "shortName": record.get('name') or ticker,
+        "exchange": record.get('exchange'),
+        "currency": record.get('currency'),
+        "regularMarketPrice": record.get('price'),
+        "previousClose": record.get('previousClose')
+    }
+
+
+def _quotes_from_records(tickers, records):
+    """레코드 맵에서 (quotes, errors)를 만듭니다.
+
+    레코드의 error는 제공자가 명시한 에러로 그대로 전달하고, 레코드가 없거나
+    불완전한 티커는 일시적 실패 메시지로 보고합니다.
+    """
+    quotes = {}
+    errors = {}
+    for ticker in tickers:
+        record = records.get(ticker) or records.get(ticker.upper())
+        if not isinstance(record, dict):
+            errors[ticker] = f"No quote returned for {ticker}"
+        elif 'error' in record:
+            errors[ticker] = str(record['error'])
+        elif validate_stock_data(_info_from_record(ticker, record))[0]:
+            quotes[ticker] = (float(record['price']), float(record['previousClose']))
+        else:
+            errors[ticker] = f"Incomplete quote returned for {ticker}"
+    return quotes, errors
+
+
+class YFinanceProvider(QuoteProvider):
+    """yfinance(Yahoo) 제공자 - 일괄 조회는 yf.download, 단건은 .info"""
+    name = 'yfinance'
+
+    def __init__(self, guard, period='5d', timeout=10):
+        super().__init__()
+        self.guard = guard
+        self.period = period
+        self.timeout = timeout
+
+    @staticmethod
+    def _extract_closes(frame, ticker):
+        """yf.download 결과에서 티커의 종가 시리즈를 꺼냅니다."""
+        if isinstance(frame.columns, pd.MultiIndex):
+            if ticker not in frame.columns.get_level_values(0):
+                return None
+            closes = frame[ticker]['Close']
+        else:
+            if 'Close' not in frame.columns:
+                return None
+            closes = frame['Close']
+        return closes.dropna()
+
+    def _download_quotes(self, tickers):
+        """yf.download를 호출해 (quotes, errors)를 반환합니다.
+
+        yf.download는 티커별 실패를 예외 대신 로그로만 남기고 빈(NaN) 컬럼을 돌려주므로,
+        로그의 티커별 에러(상장 폐지 등)는 errors로 넘깁니다. 서킷 브레이커에는 업스트림 자체의
+        문제만 실패로 기록되도록, 요청 제한이면 UpstreamThrottledError를, 전송 에러(타임아웃,
+        연결/HTTP 실패)로 시세를 하나도 받지 못했으면 UpstreamError를 던집니다.
+        (없는 티커만 든 청크는 정상 응답이므로 실패로 세지 않음)
+        """
+        error_log = _DownloadErrorLog()
+        yf_logger = logging.getLogger('yfinance')
+        with _download_lock:
+            # 락 안에서만 붙여 두므로 다른 다운로드의 에러가 섞이지 않음
+            yf_logger.addHandler(error_log)
+            try:
+                frame = yf.download(
+                    tickers,
+                    period=self.period,
+                    interval='1d',
+                    group_by='ticker',
+                    auto_adjust=False,
+                    threads=True,
+                    progress=False,
+                    timeout=self.timeout
+                )
+            finally:
+                yf_logger.removeHandler(error_log)
+
+        if any(is_throttle_message(message) for message in error_log.messages):
+            raise UpstreamThrottledError(f"Rate limited while downloading {len(tickers)} tickers")
+
+        ticker_errors, transport_errors = _parse_download_errors(error_log.messages)
+
+        quotes = {}
+        if frame is not None and not frame.empty:
+            for ticker in tickers:
+                # yf.download는 티커를 대문자로 정규화해서 컬럼을 만든다
+                closes = self._extract_closes(frame, ticker.upper())
+                if closes is None or len(closes) < 2:
+                    continue
+
+                price, prev_close = float(closes.iloc[-1]), float(closes.iloc[-2])
+                if price <= 0 or prev_close <= 0:
+                    continue
+                quotes[ticker] = (price, prev_close)
+
+        # 시세도 에러 메시지도 없는 티커는 호출 측에서 일시적 실패로 처리
+        errors = {
+            ticker: f"{ticker}: {ticker_errors[ticker.upper()]}"
+            for ticker in tickers
+            if ticker not in quotes and ticker.upper() in ticker_errors
+        }
+        if not quotes and transport_errors:
+            raise UpstreamError(f"Download failed for {len(tickers)} tickers: {transport_errors[0]}")
+        return quotes, errors
+
+    def get_quotes(self, tickers):
+        self._count('quote_calls')
+        try:
+            return self.guard.call(self._download_quotes, tickers)
+        except Exception:
+            self._count('failures')
+            raise
+
+    def get_info(self, ticker):
+        self._count('info_calls')
+        try:
+            return self.guard.call(lambda: yf.Ticker(ticker).info) or {}
+        except Exception:
+            self._count('failures')
+            raise
+
+    @staticmethod
+    def _series_from_frame(frame):
+        """Ticker.history 결과를 (6, n) 배열로 바꿉니다. 날짜는 거래소 현지 날짜 기준 일수."""
+        if frame is None or frame.empty:
+            return empty_series()
+        frame = frame.dropna(subset=['Open', 'High', 'Low', 'Close'])
+        index = frame.index
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        days = index.normalize().values.astype('datetime64[D]').astype(np.int64)
+        return np.vstack([
+            days.astype(np.float64),
+            frame['Open'].to_numpy(dtype=np.float64),
+            frame['High'].to_numpy(dtype=np.float64),
+            frame['Low'].to_numpy(dtype=np.float64),
+            frame['Close'].to_numpy(dtype=np.float64),
+            frame['Volume'].fillna(0).to_numpy(dtype=np.float64)
+        ])
+
+    def get_history(self, ticker, start=None, period=None):
+        self._count('history_calls')
+        kwargs = {'start': start} if start else {'period': period or '1y'}
+        try:
+            frame = self.guard.call(
+                lambda: yf.Ticker(ticker).history(
+                    interval='1d', auto_adjust=False, timeout=self.timeout, **kwargs
+                )
+            )
+        except Exception:
+            self._count('failures')
+            raise
+        return self._series_from_frame(frame)
+
+    def stats(self):
+        return {**super().stats(), **self.guard.stats()}
+
+
+class HttpQuoteProvider(QuoteProvider):
+    """HTTP/JSON 시세 API 제공자
+
+    GET {base_url}/quotes?symbols=AAPL,MSFT 가 모듈 docstring의 레코드 맵을
+    응답한다고 가정합니다. api_key가 있으면 X-API-Key 헤더로 보냅니다.
+    """
+    name = 'http'
+
+    def __init__(self, base_url, api_key='', guard=None, timeout=10, pool_size=10):
+        super().__init__()
+        self.base_url = base_url.rstrip('/')
+        self.guard = guard
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Accept': 'application/json'})
+        if api_key:
+            self.session.headers['X-API-Key'] = api_key
+
+    def _request(self, tickers):
+        response = self.session.get(
+            f"{self.base_url}/quotes",
+            params={'symbols': ','.join(tickers)},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        records = response.json()
+        if not isinstance(records, dict):
+            raise ValueError("Unexpected quote API response")
+        return records
+
+    def _fetch(self, tickers):
+        try:
+            if self.guard is not None:
+                return self.guard.call(self._request, tickers)
+            return self._request(tickers)
+        except Exception:
+            self._count('failures')
+            raise
+
+    def get_quotes(self, tickers):
+        self._count('quote_calls')
+        return _quotes_from_records(tickers, self._fetch(tickers))
+
+    def get_info(self, ticker):
+        self._count('info_calls')
+        record = self._fetch([ticker]).get(ticker) or {}
+        if 'error' in record:
+            raise ValueError(record['error'])
+        return _info_from_record(ticker, record) if record else {}
+
+    def iter_infos(self, tickers):
+        # 시세와 같은 레코드에 메타데이터가 있으므로 요청 한 번으로 조회
+        self._count('info_calls')
+        records = self._fetch(tickers)
+        for ticker in tickers:
+            record = records.get(ticker)
+            if isinstance(record, dict) and 'error' not in record:
+                yield ticker, _info_from_record(ticker, record)
+
+    def stats(self):
+        stats = super().stats()
+        if self.guard is not None:
+            stats.update(self.guard.stats())
+        return stats
+
+
+class FixtureQuoteProvider(QuoteProvider):
+    """JSON 파일에 저장된 시세를 그대로 돌려주는 제공자 (네트워크 없이 테스트/벤치마크/재현용)
+
+    파일이 바뀌면 다음 조회 때 다시 읽습니다.
+    """
+    name = 'fixture'
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.records = {}
+        self.loaded_mtime = None
+
+    def _records(self):
+        mtime = os.path.getmtime(self.path)
+        with self.lock:
+            if mtime != self.loaded_mtime:
+                with open(self.path, encoding='utf-8') as f:
+                    self.records = json.load(f)
+                self.loaded_mtime = mtime
+                logger.info(f"Loaded {len(self.records)} quote fixtures from {self.path}")
+            return self.records
+
+    def get_quotes(self, tickers):
+        self._count('quote_calls')
+        return _quotes_from_records(tickers, self._records())
+
+    def get_info(self, ticker):
+        self._count('info_calls')
+        records = self._records()
+        record = records.get(ticker) or records.get(ticker.upper())
+        if not record:
+            return {}
+        if 'error' in record:
+            raise ValueError(record['error'])
+        return _info_from_record(ticker, record)
+
+    def iter_infos(self, tickers):
+        self._count('info_calls')
+        records = self._records()
+        for ticker in tickers:
+            record = records.get(ticker) or records.get(ticker.upper())
+            if isinstance(record, dict) and 'error' not in record:
+                yield ticker, _info_from_record(ticker, record)
+
+
+class FailoverQuoteProvider(QuoteProvider):
+    """여러 제공자를 순서대로 시도합니다.
+
+    앞 제공자가 실패(예외)하거나 시세를 주지 못한 티커만 다음 제공자에게 넘깁니다.
+    모든 제공자가 예외를 던지면 마지막 예외를 그대로 던지므로, 단일 제공자일 때와
+    같은 재시도/서킷 처리가 적용됩니다.
+    """
+    name = 'failover'
+
+    def __init__(self, providers):
+        super().__init__()
+        self.providers = providers
+        self.counters['failovers'] = 0
+
+    def get_quotes(self, tickers):
+        self._count('quote_calls')
+        quotes = {}
+        errors = {}
+        remaining = list(tickers)
+        last_error = None
+        failed = False
+
+        for provider in self.providers:
+            if not remaining:
+                break
+            if provider is not self.providers[0]:
+                self._count('failovers')
+            try:
+                provider_quotes, provider_errors = provider.get_quotes(remaining)
+            except Exception as e:
+                logger.warning(f"Quote provider {provider.name} failed for {len(remaining)} tickers: {str(e)}")
+                last_error = e
+                failed = True
+                continue
+
+            quotes.update(provider_quotes)
+            errors.update(provider_errors)
+            remaining = [ticker for ticker in remaining if ticker not in provider_quotes]
+
+        if not quotes and not errors and last_error is not None:
+            raise last_error
+
+        for ticker in quotes:
+            errors.pop(ticker, None)
+        if failed:
+            # 어떤 제공자는 응답하지 못했으므로 "없는 티커"로 확정하지 않고 일시적 실패로 남김
+            for ticker in remaining:
+                errors[ticker] = str(last_error)
+        return quotes, errors
+
+    def get_info(self, ticker):
+        self._count('info_calls')
+        info = None
+        last_error = None
+        for provider in self.providers:
+            try:
+                info = provider.get_info(ticker)
+            except Exception as e:
+                last_error = e
+                continue
+            if validate_stock_data(info)[0]:
+                return info
+
+        if info is None and last_error is not None:
+            raise last_error
+        return info or {}
+
+    def iter_infos(self, tickers):
+        self._count('info_calls')
+        remaining = list(tickers)
+        for provider in self.providers:
+            if not remaining:
+                break
+            found = set()
+            try:
+                for ticker, info in provider.iter_infos(remaining):
+                    if validate_stock_data(info)[0]:
+                        found.add(ticker)
+                        yield ticker, info
+            except Exception as e:
+                logger.warning(f"Quote provider {provider.name} failed to look up info for {len(remaining)} tickers: {str(e)}")
+            remaining = [ticker for ticker in remaining if ticker not in found]
+
+    def get_history(self, ticker, start=None, period=None):
+        self._count('history_calls')
+        series = None
+        last_error = None
+        for provider in self.providers:
+            try:
+                series = provider.get_history(ticker, start=start, period=period)
+            except NotImplementedError:
+                continue
+            except Exception as e:
+                last_error = e
+                continue
+            if series.shape[1]:
+                return series
+
+        if series is None:
+            if last_error is not None:
+                raise last_error
+            raise NotImplementedError("No configured quote provider supports price history")
+        return series
+
+    def stats(self):
+        return {
+            **super().stats(),
+            "providers": [provider.stats() for provider in self.providers]
+        }
+
+
+def create_quote_provider(names, yahoo_guard, config):
+    """설정(QUOTE_PROVIDERS)에 따라 시세 제공자를 만듭니다. 여러 개면 순서대로 failover."""
+    providers = []
+    for name in [name.strip().lower() for name in names.split(',') if name.strip()]:
+        if name == 'yfinance':
+            providers.append(YFinanceProvider(
+                yahoo_guard,
+                period=config.BULK_DOWNLOAD_PERIOD,
+                timeout=config.REQUEST_TIMEOUT
+            ))
+        elif name == 'http':
+            if not config.STOCK_API_BASE_URL:
+                raise ValueError("QUOTE_PROVIDERS includes 'http' but STOCK_API_BASE_URL is not set")
+            # 외부 API는 Yahoo와 별도의 서킷/토큰 버킷으로 보호
+            guard = ProviderGuard(
+                CircuitBreaker(
+                    failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+                    recovery_timeout=config.CIRCUIT_RECOVERY_TIMEOUT,
+                    half_open_max_calls=config.CIRCUIT_HALF_OPEN_CALLS
+                ),
+                AdaptiveRateLimiter(
+                    rate=config.UPSTREAM_RATE_LIMIT,
+                    burst=config.UPSTREAM_BURST,
+                    min_rate=config.UPSTREAM_MIN_RATE
+                ),
+                max_wait=config.UPSTREAM_MAX_WAIT
+            )
+            providers.append(HttpQuoteProvider(
+                config.STOCK_API_BASE_URL,
+                api_key=config.STOCK_API_KEY,
+                guard=guard,
+                timeout=config.REQUEST_TIMEOUT,
+                pool_size=config.BACKEND_POOL_SIZE
+            ))
+        elif name == 'fixture':
+            if not config.QUOTE_FIXTURE_PATH:
+                raise ValueError("QUOTE_PROVIDERS includes 'fixture' but QUOTE_FIXTURE_PATH is not set")
+            providers.append(FixtureQuoteProvider(config.QUOTE_FIXTURE_PATH))
+        else:
+            raise ValueError(f"Unknown quote provider: {name}")
+
+    if not providers:
+        raise ValueError("QUOTE_PROVIDERS is empty")
+    if len(providers) == 1:
+        return providers[0]
+    return FailoverQuoteProvider(providers)
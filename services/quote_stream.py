@@ -0,0 +1,192 @@
+"""실시간 시세 구독 (SSE 푸시 채널)
+
+구독된 티커 전체를 폴링 스레드 하나가 QUOTE_STREAM_INTERVAL마다 stock_cache 기반
+get_stock_quotes로 한 번에 조회하고, 바뀐 필드만 해당 티커의 구독자들에게 나눠 줍니다.
+업스트림/캐시 조회 횟수는 접속자 수가 아니라 구독 중인 티커 수에 비례합니다.
+
+연결 하나가 응답이 끝날 때까지 열려 있으므로 운영에서는 gevent 워커로 띄운 전용 스트림
+프로세스(app:create_stream_app())에서 제공하며, 워커당 구독 수(QUOTE_STREAM_MAX_SUBSCRIBERS)는
+--worker-connections보다 작게 둡니다.
+"""
+import logging
+import threading
+from config import Config
+from services.stock_service import get_stock_quotes
+
+logger = logging.getLogger(__name__)
+
+# 값이 바뀌지 않았으면 이 필드만 달라졌다고 다시 보내지 않음
+_IGNORED_FIELDS = ('lastUpdated',)
+
+
+def _quote_state(company_name, stock_data):
+    return {"name": company_name, **stock_data}
+
+
+def _changed_fields(previous, current):
+    """previous 대비 바뀐 필드만 반환합니다 (사라진 필드는 None). 처음이면 전체."""
+    if previous is None:
+        return dict(current)
+    changed = {
+        key: current.get(key)
+        for key in previous.keys() | current.keys()
+        if previous.get(key) != current.get(key)
+    }
+    if all(key in _IGNORED_FIELDS for key in changed):
+        return {}
+    return changed
+
+
+class QuoteSubscription:
+    """구독자 하나의 대기 중인 변경분
+
+    큐 대신 티커별 변경 필드를 합쳐 두므로, 느린 클라이언트가 있어도 메모리는
+    구독한 티커 수만큼만 쓰고 다음 전송 때 최신 값만 받습니다.
+    """
+    def __init__(self, tickers):
+        self.tickers = tickers
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.updates = {}
+        self.closed = False
+
+    def push(self, ticker, fields):
+        with self.lock:
+            self.updates.setdefault(ticker, {}).update(fields)
+        self.ready.set()
+
+    def wait(self, timeout):
+        """변경분 {ticker: fields}를 꺼냅니다. timeout 안에 없으면 빈 dict."""
+        if not self.ready.wait(timeout):
+            return {}
+        with self.lock:
+            updates, self.updates = self.updates, {}
+            self.ready.clear()
+        return updates
+
+
+class QuoteHub:
+    """티커별 구독자 목록과 공유 폴링 스레드
+
+    폴링 스레드는 첫 구독 때 시작하고, 구독자가 모두 떠나면 스스로 종료합니다.
+    """
+    def __init__(self, interval=5, max_subscribers=2):
+        self.interval = interval
+        self.max_subscribers = max_subscribers
+        self.lock = threading.Lock()
+        # {ticker: set(QuoteSubscription)}
+        self.subscribers = {}
+        # {ticker: 마지막으로 보낸 상태}
+        self.latest = {}
+        self.subscription_count = 0
+        self.wake = threading.Event()
+        self.stopped = False
+        self.thread = None
+        self.counters = {'polls': 0, 'polled_tickers': 0, 'updates': 0, 'deliveries': 0}
+
+    def subscribe(self, tickers):
+        """구독을 등록합니다. 최대 구독자 수를 넘으면 None."""
+        subscription = QuoteSubscription(tickers)
+        with self.lock:
+            if self.stopped or self.subscription_count >= self.max_subscribers:
+                return None
+
+            self.subscription_count += 1
+            new_tickers = False
+            for ticker in tickers:
+                self.subscribers.setdefault(ticker, set()).add(subscription)
+                if ticker in self.latest:
+                    # 이미 폴링 중인 티커는 마지막 상태를 바로 보냄
+                    subscription.push(ticker, self.latest[ticker])
+                else:
+                    new_tickers = True
+
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._poll_loop, name='quote-stream-poller', daemon=True)
+                self.thread.start()
+            elif new_tickers:
+                # 새 티커는 다음 주기를 기다리지 않고 바로 조회
+                self.wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """구독을 해제합니다. 이미 해제한 구독이면 아무것도 하지 않습니다."""
+        with self.lock:
+            if subscription.closed:
+                return
+            subscription.closed = True
+            self.subscription_count -= 1
+            for ticker in subscription.tickers:
+                subscribers = self.subscribers.get(ticker)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.subscribers[ticker]
+                    self.latest.pop(ticker, None)
+
+    def _poll_loop(self):
+        while True:
+            with self.lock:
+                tickers = list(self.subscribers)
+                if not tickers or self.stopped:
+                    self.thread = None
+                    return
+
+            try:
+                self.poll(tickers)
+            except Exception as e:
+                logger.error(f"Quote stream poll failed: {str(e)}")
+
+            self.wake.wait(self.interval)
+            self.wake.clear()
+
+    def poll(self, tickers):
+        """tickers를 한 번에 조회해 바뀐 티커만 구독자에게 보냅니다."""
+        # 한 주기 안에 끝나지 않은 조회는 pending으로 두고 다음 주기에 보냄
+        quotes = get_stock_quotes(tickers, deadline=self.interval)
+
+        with self.lock:
+            self.counters['polls'] += 1
+            self.counters['polled_tickers'] += len(tickers)
+            for ticker, (company_name, stock_data) in quotes.items():
+                if stock_data.get('pending') or ticker not in self.subscribers:
+                    continue
+
+                state = _quote_state(company_name, stock_data)
+                changed = _changed_fields(self.latest.get(ticker), state)
+                if not changed:
+                    continue
+
+                self.latest[ticker] = state
+                self.counters['updates'] += 1
+                for subscription in self.subscribers[ticker]:
+                    subscription.push(ticker, changed)
+                    self.counters['deliveries'] += 1
+
+    def stop(self):
+        """폴링 스레드를 멈춥니다 (이후 구독은 거절)."""
+        with self.lock:
+            self.stopped = True
+            thread = self.thread
+        self.wake.set()
+        if thread is not None:
+            thread.join(timeout=Config.REQUEST_TIMEOUT)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "subscribers": self.subscription_count,
+                "max_subscribers": self.max_subscribers,
+                "tickers": len(self.subscribers),
+                "interval": self.interval,
+                "polling": self.thread is not None,
+                **self.counters
+            }
+
+
+# 앱 전체에서 공유하는 구독 허브 (워커 프로세스마다 하나)
+quote_hub = QuoteHub(
+    interval=Config.QUOTE_STREAM_INTERVAL,
+    max_subscribers=Config.QUOTE_STREAM_MAX_SUBSCRIBERS
+)
@@ -1,118 +1,766 @@
 """주식 데이터 관련 서비스"""
-import yfinance as yf
 import logging
+import os
+import threading
+import zlib
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, TimeoutError as FutureTimeoutError
 from config import Config
-from utils.validators import validate_ticker, validate_stock_data
+from utils.validators import validate_ticker, validate_stock_data, get_current_price
 from utils.decorators import retry_with_backoff
-from utils.cache import LimitedCache
+from utils.cache import LimitedCache, SingleFlight, save_snapshot, load_snapshot
+from utils.cache_backends import create_cache_backend
+from utils.metrics import increment_coalesced_requests, increment_background_refreshes, increment_negative_cache_hit
+from utils.tracing import stage_span, trace_stage, with_current_endpoint
+from utils.json_provider import json_fragments
+from utils.symbol_universe import symbol_universe
+from utils.history_cache import HistoryCache, slice_series, resample_weekly, OHLCV_FIELDS, DATE
+from utils.resilience import (
+    CircuitBreaker,
+    AdaptiveRateLimiter,
+    ProviderGuard,
+    CircuitOpenError,
+    RateLimitExceeded,
+    UpstreamThrottledError
+)
+from services.quote_providers import create_quote_provider
 
 logger = logging.getLogger(__name__)
 
-# 캐시 인스턴스 생성
+# 캐시 인스턴스 생성 (soft TTL 이후에는 stale 시세를 주고 백그라운드에서 갱신)
 stock_cache = LimitedCache(
     max_size=Config.STOCK_CACHE_SIZE, 
-    cache_duration=Config.CACHE_DURATION
+    cache_duration=Config.CACHE_DURATION,
+    hard_duration=Config.CACHE_HARD_DURATION,
+    backend=create_cache_backend(Config.CACHE_BACKEND, 'stock', Config.STOCK_CACHE_SIZE)
+)
+
+# 티커 메타데이터 캐시 (회사명/거래소/통화는 거의 바뀌지 않으므로 시세와 분리해 며칠간 유지)
+metadata_cache = LimitedCache(
+    max_size=Config.METADATA_CACHE_SIZE,
+    cache_duration=Config.METADATA_CACHE_DURATION,
+    record_metrics=False,
+    backend=create_cache_backend(
+        'sqlite' if Config.METADATA_DB_PATH else Config.CACHE_BACKEND,
+        'metadata',
+        Config.METADATA_CACHE_SIZE,
+        path=Config.METADATA_DB_PATH
+    )
+)
+
+# 실패한 조회 결과 캐시 - 정상 시세와 분리해 종류별로 다른 TTL 적용
+# 존재하지 않거나 상장 폐지된 티커는 몇 시간, 네트워크/요청 제한 등 일시적 실패는 몇 초
+invalid_ticker_cache = LimitedCache(
+    max_size=Config.NEGATIVE_CACHE_SIZE,
+    cache_duration=Config.INVALID_TICKER_CACHE_DURATION,
+    record_metrics=False,
+    backend=create_cache_backend(Config.CACHE_BACKEND, 'invalid_ticker', Config.NEGATIVE_CACHE_SIZE)
+)
+transient_error_cache = LimitedCache(
+    max_size=Config.NEGATIVE_CACHE_SIZE,
+    cache_duration=Config.TRANSIENT_ERROR_CACHE_DURATION,
+    record_metrics=False,
+    backend=create_cache_backend(Config.CACHE_BACKEND, 'transient_error', Config.NEGATIVE_CACHE_SIZE)
+)
+
+# 가격 이력 캐시 (티커별 일봉 OHLCV, 재요청 시 마지막 봉 이후 꼬리 구간만 업스트림에서 받음)
+history_cache = HistoryCache(
+    max_size=Config.HISTORY_CACHE_SIZE,
+    refresh_interval=Config.HISTORY_REFRESH_INTERVAL,
+    directory=Config.HISTORY_CACHE_DIR
+)
+_history_inflight = SingleFlight()
+
+# 지원하는 이력 봉 간격 (주봉은 캐시된 일봉에서 계산)
+HISTORY_INTERVALS = ('1d', '1wk')
+
+# 존재하지 않는 티커를 나타내는 에러 메시지 조각 (제공자가 명시적으로 보고한 에러 문구 기준)
+# 시세가 빠졌거나 불완전한 응답은 장애 때도 똑같이 보이므로 여기에 넣지 않고 일시적 실패로 처리
+INVALID_TICKER_MARKERS = (
+    'delisted',
+    'no data found',
+    'no price data',
+    'no timezone found',
+    'symbol may be',
+    'not found',
+    'no stock data available',
+    'unknown ticker symbol'
 )
 
 # 스레드 풀 생성
 executor = ThreadPoolExecutor(max_workers=Config.MAX_WORKERS)
 
+# Yahoo 호출 보호 (yfinance와 async 경로의 chart API가 함께 사용)
+yahoo_guard = ProviderGuard(
+    CircuitBreaker(
+        failure_threshold=Config.CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout=Config.CIRCUIT_RECOVERY_TIMEOUT,
+        half_open_max_calls=Config.CIRCUIT_HALF_OPEN_CALLS
+    ),
+    AdaptiveRateLimiter(
+        rate=Config.UPSTREAM_RATE_LIMIT,
+        burst=Config.UPSTREAM_BURST,
+        min_rate=Config.UPSTREAM_MIN_RATE
+    ),
+    max_wait=Config.UPSTREAM_MAX_WAIT
+)
 
-@retry_with_backoff()
-def get_stock_data(ticker):
-    """주어진 티커에 대한 주식 데이터를 가져옵니다."""
-    if not validate_ticker(ticker):
-        logger.warning(f"Invalid ticker format: {ticker}")
-        return ticker, {"error": "Invalid ticker format"}
+# 시세 제공자 (QUOTE_PROVIDERS 순서대로 failover)
+quote_provider = create_quote_provider(Config.QUOTE_PROVIDERS, yahoo_guard, Config)
+
+# 업스트림을 호출하지 않고 거절된 경우 (재시도하지 않고, 기존 캐시도 덮어쓰지 않음)
+UPSTREAM_UNAVAILABLE_ERRORS = (CircuitOpenError, RateLimitExceeded)
+
+# 인기 티커 선제 갱신 스레드
+_refresher_stop = threading.Event()
+_refresher_thread = None
+
+# 캐시 스냅샷 저장 스레드 및 상태
+_snapshot_stop = threading.Event()
+_snapshot_thread = None
+snapshot_stats = {
+    "last_load": None,
+    "last_save": None
+}
+
+
+def _pending_stock_data():
+    """deadline 안에 조회가 끝나지 않은 티커의 응답 (조회는 백그라운드에서 계속돼 캐시에 저장됨)"""
+    return {"error": "Stock data pending", "pending": True}
+
+
+def _unknown_stock_data():
+    """종목 유니버스에 없는 티커의 응답 (업스트림을 호출하지 않음)"""
+    return {"error": "Unknown ticker symbol"}
+
+
+def _resolve_tickers(tickers):
+    """{요청 티커: 정규 티커}를 반환합니다.
+    
+    형식이 잘못된 티커는 빠지고, 종목 유니버스에 없는 티커는 None입니다.
+    BRK.B와 BRK-B처럼 표기만 다른 티커는 같은 정규 티커(캐시 키)로 모입니다.
+    """
+    resolved = {}
+    for ticker in tickers:
+        if ticker not in resolved and validate_ticker(ticker):
+            resolved[ticker] = symbol_universe.resolve(ticker)
+    return resolved
+
+
+def _deadline_timeout(deadline):
+    """deadline(초)이 None이면 설정값을, 0 이하이면 REQUEST_TIMEOUT을 사용합니다."""
+    if deadline is None:
+        deadline = Config.STOCK_DATA_DEADLINE
+    return deadline if deadline > 0 else Config.REQUEST_TIMEOUT
+
+
+def _build_stock_data(ticker, price, prev_close):
+    """가격과 전일 종가로 응답용 주식 데이터를 만듭니다."""
+    change = price - prev_close
+    change_percent = (change / prev_close) * 100
+    
+    return {
+        "price": f"{price:.2f}",
+        "change": f"{change:+.2f}",
+        "changePercent": f"{change_percent:+.2f}",
+        "isPositive": change >= 0,
+        "ticker": ticker,
+        "lastUpdated": datetime.now().isoformat()
+    }
+
+
+def _metadata_from_info(ticker, info):
+    """.info 응답에서 티커 메타데이터를 추립니다."""
+    return {
+        "name": info.get('shortName') or info.get('longName') or ticker,
+        "exchange": info.get('exchange'),
+        "currency": info.get('currency')
+    }
+
+
+def is_invalid_ticker_error(message):
+    """에러 메시지가 일시적 실패가 아니라 티커 자체의 문제(없음/상장 폐지)인지 판단합니다."""
+    message = str(message).lower()
+    return any(marker in message for marker in INVALID_TICKER_MARKERS)
+
+
+def stock_data_status(stock_data):
+    """시세 결과를 ok / pending / invalid / not_found / error 중 하나로 분류합니다.
     
-    # 캐시 확인
-    cached_result = stock_cache.get(ticker)
-    if cached_result is not None:
-        logger.debug(f"Cache hit for ticker: {ticker}")
-        return cached_result
+    단건(/api/company-stockInfo)과 일괄(/api/stock-quotes) 응답이 같은 티커를 같은 상태로 보고하도록
+    라우트는 이 함수로 상태 코드를 정합니다.
+    """
+    if stock_data.get('pending'):
+        return 'pending'
+    if 'error' not in stock_data:
+        return 'ok'
+    if stock_data['error'] == "Invalid ticker format":
+        return 'invalid'
+    return 'not_found' if is_invalid_ticker_error(stock_data['error']) else 'error'
+
+
+def _store_stock_data(ticker, stock_data):
+    """조회 결과를 저장합니다. 에러는 시세 캐시 대신 종류에 맞는 negative cache에 둡니다.
+    
+    에러로 기존 시세를 덮어쓰지 않으므로 stale 시세가 있으면 hard TTL까지 계속 제공됩니다.
+    """
+    if 'error' not in stock_data:
+        stock_cache.set(ticker, stock_data)
+        transient_error_cache.delete(ticker)
+        invalid_ticker_cache.delete(ticker)
+    elif is_invalid_ticker_error(stock_data['error']):
+        invalid_ticker_cache.set(ticker, stock_data)
+    else:
+        transient_error_cache.set(ticker, stock_data)
+
+
+def _cached_error(ticker):
+    """negative cache에 남아 있는 에러 결과 (없으면 None)"""
+    for cache in (invalid_ticker_cache, transient_error_cache):
+        stock_data = cache.get(ticker)
+        if stock_data is not None:
+            increment_negative_cache_hit()
+            return stock_data
+    return None
+
+
+def _unavailable_stock_data(ticker, exc):
+    """업스트림을 쓸 수 없을 때의 응답 - stale 캐시가 있으면 그 값을, 없으면 바로 에러"""
+    stale = stock_cache.peek(ticker)
+    if stale is not None:
+        return stale
+    return {"error": f"Upstream temporarily unavailable: {exc}"}
+
+
+def _company_name(ticker, stock_data, metadata):
+    """응답에 쓸 회사명 (에러이거나 메타데이터가 없으면 티커)"""
+    if 'error' in stock_data or not metadata:
+        return ticker
+    return metadata.get('name') or ticker
+
+
+def _fetch_stock_data(ticker):
+    """단일 티커의 시세를 가져와 캐시에 저장합니다.
+    
+    메타데이터가 이미 있으면 일괄 다운로드로 가격만 갱신하고,
+    없으면 .info 한 번으로 가격과 메타데이터를 함께 가져옵니다.
+    """
+    if metadata_cache.get(ticker) is not None:
+        return _fetch_stock_data_bulk([ticker])[ticker]
     
     try:
         logger.debug(f"Fetching stock data for: {ticker}")
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        with stage_span('upstream_quote'):
+            info = quote_provider.get_info(ticker)
         
-        if not validate_stock_data(info):
-            result = (ticker, {"error": "Invalid or incomplete stock data"})
+        is_valid, message = validate_stock_data(info)
+        if not is_valid:
+            logger.info(f"Invalid stock data for {ticker}: {message}")
+            stock_data = {"error": "Invalid or incomplete stock data"}
         else:
-            company_name = info.get('shortName', info.get('longName', ticker))
+            metadata_cache.set(ticker, _metadata_from_info(ticker, info))
             
-            price = info.get('regularMarketPrice', info.get('currentPrice'))
+            price = get_current_price(info)
             prev_close = info.get('previousClose')
             
-            change = price - prev_close
-            change_percent = (change / prev_close) * 100
-            
-            result = (company_name, {
-                "price": f"{price:.2f}",
-                "change": f"{change:+.2f}",
-                "changePercent": f"{change_percent:+.2f}",
-                "isPositive": change >= 0,
-                "ticker": ticker,
-                "lastUpdated": datetime.now().isoformat()
-            })
+            stock_data = _build_stock_data(ticker, price, prev_close)
         
         # 캐시에 저장
-        stock_cache.set(ticker, result)
+        _store_stock_data(ticker, stock_data)
         logger.info(f"Successfully fetched and cached data for {ticker}")
-        return result
+        return stock_data
+    
+    except UPSTREAM_UNAVAILABLE_ERRORS as e:
+        logger.warning(f"Skipping upstream fetch for {ticker}: {str(e)}")
+        return _unavailable_stock_data(ticker, e)
         
     except Exception as e:
         error_msg = f"Failed to fetch stock data for {ticker}: {str(e)}"
         logger.error(error_msg)
-        result = (ticker, {"error": str(e)})
-        # 에러도 짧은 시간 캐시 (중복 요청 방지)
-        stock_cache.set(ticker, result)
-        return result
+        stock_data = {"error": str(e)}
+        # 에러도 종류별 TTL로 캐시 (중복 요청 방지)
+        _store_stock_data(ticker, stock_data)
+        return stock_data
+
+
+def _fetch_single_as_leader(ticker):
+    """in-flight leader로 등록된 티커 하나를 조회하고 대기자에게 결과를 전달합니다."""
+    try:
+        stock_data = _fetch_stock_data(ticker)
+    except Exception as e:
+        stock_cache.inflight.resolve(ticker, exception=e)
+        raise
+    stock_cache.inflight.resolve(ticker, stock_data)
+    return stock_data
+
+
+def get_stock_data(ticker, deadline=None):
+    """주어진 티커에 대한 주식 데이터를 가져옵니다.
+    
+    deadline(초) 안에 업스트림 조회가 끝나지 않으면 pending 상태를 반환하고,
+    조회는 executor에서 계속돼 다음 요청부터 캐시로 제공됩니다.
+    """
+    if not validate_ticker(ticker):
+        logger.warning(f"Invalid ticker format: {ticker}")
+        return ticker, {"error": "Invalid ticker format"}
+    
+    canonical = symbol_universe.resolve(ticker)
+    if canonical is None:
+        logger.info(f"Unknown ticker: {ticker}")
+        return ticker, _unknown_stock_data()
+    ticker = canonical
+    
+    deadline_at = time.monotonic() + _deadline_timeout(deadline)
+    
+    # 캐시 확인 (stale이면 그대로 반환하고 백그라운드 갱신)
+    stock_data, is_stale = stock_cache.lookup(ticker)
+    if stock_data is not None:
+        logger.debug(f"Cache hit for ticker: {ticker} (stale={is_stale})")
+        if is_stale and transient_error_cache.get(ticker) is None:
+            _schedule_refresh([ticker])
+    else:
+        # 최근에 실패한 티커는 업스트림을 다시 호출하지 않음
+        stock_data = _cached_error(ticker)
+    
+    if stock_data is None:
+        # 미스면 동시 요청을 하나의 업스트림 호출로 합침
+        # 대기는 요청 스레드에서 하고 executor에는 leader의 실제 조회만 넣음 (대기자가 풀 스레드를 차지하지 않음)
+        future, is_leader = stock_cache.inflight.acquire(ticker)
+        if is_leader:
+            try:
+                executor.submit(with_current_endpoint(_fetch_single_as_leader), ticker)
+            except RuntimeError as e:
+                # 종료 중이라 executor를 쓸 수 없는 경우
+                stock_cache.inflight.resolve(ticker, exception=e)
+        else:
+            increment_coalesced_requests()
+        try:
+            stock_data = future.result(timeout=max(deadline_at - time.monotonic(), 0))
+        except FutureTimeoutError:
+            logger.warning(f"Stock data for {ticker} not ready within deadline")
+            stock_data = _pending_stock_data()
+        except Exception as e:
+            logger.error(f"Failed to fetch stock data for {ticker}: {str(e)}")
+            stock_data = {"error": str(e)}
+    
+    metadata = get_ticker_metadata(
+        [ticker], timeout=max(deadline_at - time.monotonic(), 0)
+    ) if 'error' not in stock_data else {}
+    return _company_name(ticker, stock_data, metadata.get(ticker)), stock_data
+
+
+def _chunked(items, size):
+    """리스트를 size 크기의 조각으로 나눕니다."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+@retry_with_backoff(giveup=UPSTREAM_UNAVAILABLE_ERRORS + (UpstreamThrottledError,))
+def _download_quotes(tickers):
+    """여러 티커의 현재가와 전일 종가를 시세 제공자의 일괄 조회 한 번으로 가져옵니다.
+    
+    (quotes, errors)를 반환하며, errors는 제공자가 티커별로 보고한 에러 메시지입니다.
+    """
+    with stage_span('upstream_quote'):
+        return quote_provider.get_quotes(tickers)
+
+
+def _fetch_metadata(tickers):
+    """청크의 메타데이터를 제공자의 iter_infos로 조회해 캐시에 저장합니다 (메타데이터 캐시 미스일 때만 호출).
+    
+    조회되는 대로 캐시에 저장하므로 청크가 끝나기 전에도 끝난 티커는 다른 요청이 쓸 수 있습니다.
+    """
+    result = {}
+    try:
+        with stage_span('upstream_metadata'):
+            for ticker, info in quote_provider.iter_infos(tickers):
+                if not (info.get('shortName') or info.get('longName')):
+                    continue
+                metadata = _metadata_from_info(ticker, info)
+                metadata_cache.set(ticker, metadata)
+                result[ticker] = metadata
+    except Exception as e:
+        logger.warning(f"Failed to look up metadata for {len(tickers) - len(result)} tickers: {str(e)}")
+    return result
+
+
+def get_ticker_metadata(tickers, timeout=None):
+    """티커별 메타데이터(name, exchange, currency)를 반환합니다.
+    
+    캐시된 값을 우선 사용하고, 없는 것만 청크 단위로 조회합니다. 청크 안에서는
+    제공자의 iter_infos(일괄 조회 또는 토큰 버킷 속도에 맞춘 순차 조회)를 쓰므로 티커마다
+    토큰을 한꺼번에 쓰지 않습니다.
+    조회에 실패했거나 timeout(초) 안에 끝나지 않은 티커는 결과에서 빠집니다
+    (끝나지 않은 조회는 계속 실행돼 메타데이터 캐시에 저장됨).
+    """
+    result = {}
+    missing = []
+    for ticker in tickers:
+        metadata = metadata_cache.get(ticker)
+        if metadata is not None:
+            result[ticker] = metadata
+        else:
+            missing.append(ticker)
+    
+    if missing:
+        logger.debug(f"Looking up metadata for {len(missing)} tickers")
+        # executor.map은 timeout 시 남은 작업을 취소하므로 직접 submit
+        fetch_metadata = with_current_endpoint(_fetch_metadata)
+        futures = [executor.submit(fetch_metadata, chunk) for chunk in _chunked(missing, Config.BULK_CHUNK_SIZE)]
+        done, not_done = wait(futures, timeout=timeout)
+        for future in done:
+            result.update(future.result())
+        if not_done:
+            # 순차 조회 중인 청크에서 이미 끝난 티커는 캐시에서 가져옴
+            unfinished = []
+            for ticker in missing:
+                metadata = result.get(ticker) or metadata_cache.peek(ticker)
+                if metadata is not None:
+                    result[ticker] = metadata
+                else:
+                    unfinished.append(ticker)
+            logger.warning(f"Metadata lookup for {len(unfinished)} tickers not finished within {timeout}s")
+    
+    return result
+
+
+def _fetch_stock_data_bulk(tickers):
+    """캐시 미스 티커들의 시세를 청크 단위 일괄 다운로드로 가져와 캐시에 저장합니다."""
+    quotes = {}
+    errors = {}
+    unavailable = {}
+    
+    for chunk in _chunked(tickers, Config.BULK_CHUNK_SIZE):
+        try:
+            chunk_quotes, chunk_errors = _download_quotes(chunk)
+            quotes.update(chunk_quotes)
+            errors.update(chunk_errors)
+        except UPSTREAM_UNAVAILABLE_ERRORS as e:
+            # 서킷이 열렸거나 속도 제한 중이면 호출 없이 바로 실패
+            logger.warning(f"Skipping bulk download for {len(chunk)} tickers: {str(e)}")
+            for ticker in chunk:
+                unavailable[ticker] = e
+        except Exception as e:
+            logger.error(f"Bulk download failed for {len(chunk)} tickers: {str(e)}")
+            for ticker in chunk:
+                errors[ticker] = str(e)
+    
+    results = {}
+    for ticker in tickers:
+        if ticker in unavailable:
+            # 캐시에 저장하지 않아 stale 값이 그대로 남음
+            results[ticker] = _unavailable_stock_data(ticker, unavailable[ticker])
+            continue
+        
+        if ticker in quotes:
+            price, prev_close = quotes[ticker]
+            stock_data = _build_stock_data(ticker, price, prev_close)
+        elif ticker in errors:
+            stock_data = {"error": errors[ticker]}
+        else:
+            # 다운로드는 됐지만 가격이 없는 티커 - 없는 종목인지 장애인지 알 수 없으므로 일시적 실패로 둠
+            # (없는 종목은 종목 유니버스나 제공자가 명시한 에러로만 확정)
+            stock_data = {"error": f"No quote returned for {ticker}"}
+        
+        # 에러도 종류별 TTL로 캐시 (중복 요청 방지)
+        _store_stock_data(ticker, stock_data)
+        results[ticker] = stock_data
+    
+    logger.info(f"Bulk fetched {len(quotes)}/{len(tickers)} tickers")
+    return results
+
+
+def _fetch_as_leader(leader_tickers):
+    """in-flight leader로 등록된 티커들을 일괄 조회하고 대기자에게 결과를 전달합니다."""
+    results = {}
+    try:
+        results.update(_fetch_stock_data_bulk(leader_tickers))
+    finally:
+        # 예외가 나더라도 대기 중인 요청이 무한정 기다리지 않도록 정리
+        for ticker in leader_tickers:
+            if ticker in results:
+                stock_cache.inflight.resolve(ticker, results[ticker])
+            else:
+                stock_cache.inflight.resolve(ticker, exception=RuntimeError("Upstream fetch failed"))
+    return results
+
+
+def _acquire_leaders(tickers):
+    """티커별 in-flight 슬롯을 잡고 (leader 목록, 대기할 future 맵)을 반환합니다."""
+    leader_tickers = []
+    waiting = {}
+    for ticker in tickers:
+        future, is_leader = stock_cache.inflight.acquire(ticker)
+        if is_leader:
+            leader_tickers.append(ticker)
+        else:
+            waiting[ticker] = future
+    return leader_tickers, waiting
+
 
+def _refresh_in_background(leader_tickers):
+    """executor에서 실행되는 백그라운드 갱신 작업"""
+    try:
+        _fetch_as_leader(leader_tickers)
+        increment_background_refreshes(len(leader_tickers))
+    except Exception as e:
+        logger.error(f"Background refresh failed for {len(leader_tickers)} tickers: {str(e)}")
+
+
+def _schedule_refresh(tickers):
+    """stale 티커를 executor에서 한 번만 갱신하도록 예약합니다 (이미 갱신 중이면 건너뜀)."""
+    leader_tickers, _ = _acquire_leaders(tickers)
+    if not leader_tickers:
+        return
+    
+    try:
+        executor.submit(_refresh_in_background, leader_tickers)
+        logger.debug(f"Scheduled background refresh for {len(leader_tickers)} tickers")
+    except RuntimeError as e:
+        # 종료 중이라 executor를 쓸 수 없는 경우
+        for ticker in leader_tickers:
+            stock_cache.inflight.resolve(ticker, exception=e)
+
+
+def _split_cached(tickers):
+    """캐시에 있는 시세 맵과 캐시 미스 티커 목록을 반환합니다 (stale 티커는 백그라운드 갱신 예약).
+    
+    negative cache에 남아 있는 티커는 에러 결과를 그대로 쓰고 업스트림을 호출하지 않습니다.
+    """
+    results = {}
+    missing_tickers = []
+    stale_tickers = []
+    for ticker in tickers:
+        stock_data, is_stale = stock_cache.lookup(ticker)
+        if stock_data is not None:
+            results[ticker] = stock_data
+            # 방금 갱신에 실패한 티커는 transient TTL 동안 다시 시도하지 않음
+            if is_stale and transient_error_cache.get(ticker) is None:
+                stale_tickers.append(ticker)
+            continue
+        
+        stock_data = _cached_error(ticker)
+        if stock_data is not None:
+            results[ticker] = stock_data
+        else:
+            missing_tickers.append(ticker)
+    
+    if stale_tickers:
+        _schedule_refresh(stale_tickers)
+    return results, missing_tickers
+
+
+def _iter_fetched_quotes(tickers, timeout=None):
+    """캐시 미스 티커를 청크별로 조회하고, 끝나는 순서대로 {ticker: stock_data}를 yield합니다.
+    
+    다른 요청이 이미 가져오는 중인 티커는 그 결과를 기다립니다. timeout(초)이 지나면
+    남은 티커는 pending으로 내보냅니다. 호출자가 기다리지 않더라도 조회는
+    executor에서 끝까지 실행돼 캐시에 저장됩니다.
+    """
+    leader_tickers, waiting = _acquire_leaders(tickers)
+    if waiting:
+        increment_coalesced_requests(len(waiting))
+    
+    futures = {}
+    for chunk in _chunked(leader_tickers, Config.BULK_CHUNK_SIZE):
+        try:
+            futures[executor.submit(with_current_endpoint(_fetch_as_leader), chunk)] = (chunk, True)
+        except RuntimeError as e:
+            # 종료 중이라 executor를 쓸 수 없는 경우
+            for ticker in chunk:
+                stock_cache.inflight.resolve(ticker, exception=e)
+            yield {ticker: {"error": str(e)} for ticker in chunk}
+    for ticker, future in waiting.items():
+        futures[future] = ([ticker], False)
+    
+    done = set()
+    try:
+        for future in as_completed(futures, timeout=Config.REQUEST_TIMEOUT if timeout is None else max(timeout, 0)):
+            done.add(future)
+            chunk, is_leader = futures[future]
+            try:
+                value = future.result()
+            except Exception as exc:
+                logger.error(f'{len(chunk)} tickers generated an exception: {exc}')
+                yield {ticker: {"error": str(exc)} for ticker in chunk}
+                continue
+            yield value if is_leader else {chunk[0]: value}
+    except FutureTimeoutError:
+        for future, (chunk, _) in futures.items():
+            if future not in done:
+                yield {ticker: _pending_stock_data() for ticker in chunk}
 
-def get_stock_data_batch(tickers):
-    """여러 티커의 주식 데이터를 병렬로 가져옵니다."""
+
+@trace_stage('stock_batch')
+def get_stock_quotes(tickers, deadline=None):
+    """여러 티커의 (회사명, 주식 데이터)를 티커 기준 맵으로 반환합니다.
+    
+    중복을 제거한 뒤 캐시 확인과 일괄 다운로드를 한 번에 처리합니다.
+    deadline(초, 기본값 Config.STOCK_DATA_DEADLINE) 안에 조회된 결과만 반환합니다.
+    캐시에 stale 값이 있으면 그 값을, 아무것도 없으면 pending 상태를 반환하고,
+    늦게 끝난 조회도 백그라운드에서 캐시에 저장됩니다. 형식이 잘못된 티커는 결과에서 빠지고,
+    종목 유니버스에 없는 티커는 업스트림 호출 없이 에러 결과를 받습니다.
+    결과 맵의 키는 요청한 표기 그대로이며, 조회와 캐시는 정규 티커 기준입니다.
+    """
+    deadline_at = time.monotonic() + _deadline_timeout(deadline)
+    
     if not tickers:
-        return [], {}, {}
+        return {}
     
-    # 유효한 티커만 필터링
-    valid_tickers = [ticker for ticker in tickers if validate_ticker(ticker)]
-    if not valid_tickers:
+    # 유효한 티커만 필터링 (순서 유지, 중복 제거)
+    resolved = _resolve_tickers(tickers)
+    if not resolved:
         logger.warning("No valid tickers provided")
-        return [], {}, {}
+        return {}
+    
+    quotes = {}
+    valid_tickers = list(dict.fromkeys(canonical for canonical in resolved.values() if canonical is not None))
+    if valid_tickers:
+        quotes = _get_canonical_quotes(valid_tickers, deadline_at)
     
+    return {
+        ticker: quotes[canonical] if canonical is not None else (ticker, _unknown_stock_data())
+        for ticker, canonical in resolved.items()
+    }
+
+
+def _get_canonical_quotes(valid_tickers, deadline_at):
+    """정규 티커 목록의 {ticker: (회사명, 주식 데이터)}를 deadline_at(monotonic)까지 조회합니다."""
     logger.info(f"Fetching stock data for {len(valid_tickers)} tickers")
     
-    companies_info = {}
-    companies_name = []
-    ticker_to_name = {}
+    results, missing_tickers = _split_cached(valid_tickers)
+    for fetched in _iter_fetched_quotes(missing_tickers, timeout=deadline_at - time.monotonic()):
+        results.update(fetched)
     
-    # 병렬로 주식 데이터 가져오기
-    future_to_ticker = {
-        executor.submit(get_stock_data, ticker): ticker 
+    pending_count = sum(1 for stock_data in results.values() if stock_data.get('pending'))
+    if pending_count:
+        logger.warning(f"{pending_count}/{len(valid_tickers)} tickers still pending at deadline")
+    
+    # 회사명은 메타데이터 캐시에서 (캐시돼 있으면 네트워크 호출 없음)
+    metadata = get_ticker_metadata(
+        [ticker for ticker in valid_tickers if 'error' not in results[ticker]],
+        timeout=max(deadline_at - time.monotonic(), 0)
+    )
+    
+    return {
+        ticker: (_company_name(ticker, results[ticker], metadata.get(ticker)), results[ticker])
         for ticker in valid_tickers
     }
+
+
+def get_stock_data_batch(tickers, deadline=None):
+    """여러 티커의 주식 데이터를 일괄 다운로드로 가져옵니다.
     
-    for future in as_completed(future_to_ticker):
-        ticker = future_to_ticker[future]
-        try:
-            company_name, stock_data = future.result(timeout=Config.REQUEST_TIMEOUT)
-            companies_info[company_name] = stock_data
-            companies_name.append(company_name)
-            ticker_to_name[ticker] = company_name
-        except Exception as exc:
-            error_msg = f'{ticker} generated an exception: {exc}'
-            logger.error(error_msg)
-            companies_info[ticker] = {"error": str(exc)}
-            companies_name.append(ticker)
-            ticker_to_name[ticker] = ticker
+    (회사명 목록, {회사명: 주식 데이터}, {티커: 회사명})을 반환합니다 (get_stock_quotes 참조).
+    """
+    quotes = get_stock_quotes(tickers, deadline=deadline)
+    
+    companies_info = {}
+    companies_name = []
+    ticker_to_name = {}
+    
+    for ticker, (company_name, stock_data) in quotes.items():
+        companies_info[company_name] = stock_data
+        companies_name.append(company_name)
+        ticker_to_name[ticker] = company_name
     
     logger.info(f"Successfully processed {len(companies_info)} tickers")
     return companies_name, companies_info, ticker_to_name
 
 
+def _day_number(date_str):
+    """YYYY-MM-DD를 1970-01-01 기준 일수로 바꿉니다 (None은 그대로)."""
+    if date_str is None:
+        return None
+    return int(np.datetime64(date_str, 'D').astype(np.int64))
+
+
+def _refresh_history(ticker, series):
+    """캐시된 시리즈가 없으면 HISTORY_PERIOD 전체를, 있으면 마지막 봉부터 꼬리 구간만 받아 합칩니다."""
+    if series is None or series.shape[1] == 0:
+        new_rows = quote_provider.get_history(ticker, period=Config.HISTORY_PERIOD)
+        return history_cache.update(ticker, None, new_rows)
+    
+    # 마지막 봉은 장중에 바뀌었을 수 있으므로 그 날짜부터 다시 받아 덮어씀
+    start = str(np.datetime64(int(series[DATE, -1]), 'D'))
+    new_rows = quote_provider.get_history(ticker, start=start)
+    return history_cache.update(ticker, series, new_rows)
+
+
+def _load_history(ticker):
+    """티커의 일봉 시리즈를 반환합니다. 동시 갱신은 하나의 업스트림 호출로 합칩니다."""
+    series, needs_refresh = history_cache.get(ticker)
+    if not needs_refresh:
+        return series
+    
+    future, is_leader = _history_inflight.acquire(ticker)
+    if not is_leader:
+        increment_coalesced_requests()
+        return future.result(timeout=Config.REQUEST_TIMEOUT)
+    
+    try:
+        with stage_span('upstream_history'):
+            fresh = _refresh_history(ticker, series)
+    except Exception as e:
+        if series is None:
+            _history_inflight.resolve(ticker, exception=e)
+            raise
+        # 꼬리 구간 갱신에 실패하면 가지고 있는 시리즈로 응답
+        logger.warning(f"Serving cached history for {ticker} after refresh failure: {str(e)}")
+        fresh = series
+    _history_inflight.resolve(ticker, fresh)
+    return fresh
+
+
+@trace_stage('history')
+def get_price_history(ticker, start=None, end=None, interval='1d'):
+    """티커의 OHLCV 이력을 열(column) 단위 딕셔너리로 반환합니다.
+    
+    start/end는 YYYY-MM-DD(양 끝 포함), interval은 1d 또는 1wk입니다.
+    refresh_interval 안의 반복 요청은 업스트림을 호출하지 않고 캐시에서 잘라 응답합니다.
+    """
+    if not validate_ticker(ticker):
+        return {"error": "Invalid ticker format"}
+    if interval not in HISTORY_INTERVALS:
+        return {"error": f"Unsupported interval: {interval}"}
+    
+    ticker = symbol_universe.resolve(ticker)
+    if ticker is None or invalid_ticker_cache.get(ticker) is not None:
+        return {"error": "No price history available"}
+    
+    try:
+        series = _load_history(ticker)
+    except UPSTREAM_UNAVAILABLE_ERRORS as e:
+        logger.warning(f"Skipping history fetch for {ticker}: {str(e)}")
+        return {"error": f"Upstream temporarily unavailable: {e}", "retry": True}
+    except NotImplementedError as e:
+        # 설정된 시세 제공자가 이력을 주지 않는 경우 (라우트에서 501)
+        return {"error": str(e) or "Price history is not supported by the quote provider", "unsupported": True}
+    except Exception as e:
+        logger.error(f"Failed to fetch price history for {ticker}: {str(e)}")
+        return {"error": str(e)}
+    
+    series = slice_series(series, _day_number(start), _day_number(end))
+    if interval == '1wk':
+        series = resample_weekly(series)
+    if series.shape[1] == 0:
+        return {"error": "No price history available"}
+    
+    result = {
+        "ticker": ticker,
+        "interval": interval,
+        "dates": np.datetime_as_string(series[DATE].astype('datetime64[D]')).tolist()
+    }
+    for row, field in enumerate(OHLCV_FIELDS):
+        if field == 'date':
+            continue
+        values = np.round(series[row], 4) if field != 'volume' else series[row].astype(np.int64)
+        result[field] = values.tolist()
+    return result
+
+
 def getName_StockInfo(article):
     """단일 기사에 주식 정보를 추가합니다."""
     if not article or not isinstance(article, dict):
@@ -131,28 +779,17 @@ def getName_StockInfo(article):
     return article
 
 
-def enrich_articles_with_stock_info(articles, key_type='name'):
-    """기사 목록에 주식 정보를 추가합니다."""
-    if not articles or not isinstance(articles, list):
-        logger.warning("Invalid articles data provided")
-        return []
-    
-    # 모든 기사에서 unique ticker 수집
-    all_tickers = set()
+def _collect_tickers(articles):
+    """기사 목록에서 unique ticker를 수집합니다."""
+    tickers = set()
     for article in articles:
         if isinstance(article, dict):
-            all_tickers.update(article.get('companies', []))
-    
-    if not all_tickers:
-        logger.info("No tickers found in articles")
-        return articles
-    
-    logger.info(f"Processing {len(articles)} articles with {len(all_tickers)} unique tickers")
-    
-    # 모든 ticker에 대해 한 번에 데이터 가져오기
-    _, companies_info_map, ticker_to_name = get_stock_data_batch(list(all_tickers))
-    
-    # 각 기사에 정보 매핑
+            tickers.update(article.get('companies', []))
+    return tickers
+
+
+def _apply_stock_info(articles, companies_info_map, ticker_to_name, key_type, updated_at):
+    """조회한 주식 정보를 각 기사에 매핑합니다."""
     processed_articles = []
     for article in articles:
         if not isinstance(article, dict):
@@ -177,15 +814,293 @@ def enrich_articles_with_stock_info(articles, key_type='name'):
         
         article['companies'] = article_companies_list
         article['companiesInfo'] = article_companies_info
-        article['stockDataUpdated'] = datetime.now().isoformat()
+        article['stockDataUpdated'] = updated_at
         processed_articles.append(article)
     
+    return processed_articles
+
+
+def enrich_articles_with_stock_info(articles, key_type='name'):
+    """기사 목록에 주식 정보를 추가합니다."""
+    if not articles or not isinstance(articles, list):
+        logger.warning("Invalid articles data provided")
+        return []
+    
+    # 모든 기사에서 unique ticker 수집
+    all_tickers = _collect_tickers(articles)
+    
+    if not all_tickers:
+        logger.info("No tickers found in articles")
+        return articles
+    
+    logger.info(f"Processing {len(articles)} articles with {len(all_tickers)} unique tickers")
+    
+    # 모든 ticker에 대해 한 번에 데이터 가져오기
+    _, companies_info_map, ticker_to_name = get_stock_data_batch(list(all_tickers))
+    
+    # 각 기사에 정보 매핑 (여러 기사에 나오는 시세는 한 번만 직렬화)
+    processed_articles = _apply_stock_info(
+        articles, json_fragments(companies_info_map), ticker_to_name, key_type, datetime.now().isoformat()
+    )
+    
     logger.info(f"Successfully enriched {len(processed_articles)} articles")
     return processed_articles
 
 
+def quote_version(companies_info):
+    """시세 맵의 버전 문자열 - 시세 갱신 시각(에러면 메시지)이 바뀔 때만 달라집니다.
+    
+    아직 조회 중(pending)인 시세가 있으면 None을 반환합니다.
+    """
+    parts = []
+    for name, stock_data in sorted(companies_info.items()):
+        if stock_data.get('pending'):
+            return None
+        parts.append(f"{name}={stock_data.get('lastUpdated') or stock_data.get('error')}")
+    return f"{zlib.crc32(';'.join(parts).encode()):08x}"
+
+
+def enrich_news_payload_versioned(news_data, key_type='name', deadline=None):
+    """enrich_news_payload와 같지만 (payload, 시세 버전)을 반환합니다 (quote_version 참조).
+    
+    deadline(초)은 시세 조회 대기 시간이며 get_stock_quotes와 같은 규칙을 따릅니다.
+    """
+    valid_categories = {
+        category: articles for category, articles in news_data.items()
+        if articles and isinstance(articles, list)
+    }
+    
+    all_tickers = set()
+    article_count = 0
+    for articles in valid_categories.values():
+        all_tickers.update(_collect_tickers(articles))
+        article_count += len(articles)
+    
+    logger.info(
+        f"Processing {article_count} articles in {len(valid_categories)} categories "
+        f"with {len(all_tickers)} unique tickers"
+    )
+    
+    companies_info_map, ticker_to_name = {}, {}
+    if all_tickers:
+        _, companies_info_map, ticker_to_name = get_stock_data_batch(list(all_tickers), deadline=deadline)
+    version = quote_version(companies_info_map)
+    # 여러 기사/카테고리에 나오는 시세는 응답 인코딩 시 한 번만 직렬화
+    companies_info_map = json_fragments(companies_info_map)
+    
+    updated_at = datetime.now().isoformat()
+    processed_news_data = {}
+    for category, articles in news_data.items():
+        if category not in valid_categories:
+            logger.warning(f"Invalid articles data provided for category: {category}")
+            processed_news_data[category] = []
+        elif not all_tickers:
+            processed_news_data[category] = articles
+        else:
+            processed_news_data[category] = _apply_stock_info(
+                articles, companies_info_map, ticker_to_name, key_type, updated_at
+            )
+    
+    return processed_news_data, version
+
+
+def enrich_news_payload(news_data, key_type='name'):
+    """카테고리별 기사 묶음 전체에 주식 정보를 추가합니다.
+    
+    모든 카테고리의 ticker를 모아 한 번의 배치로 조회한 뒤 한 번에 매핑하므로,
+    여러 카테고리에 나오는 ticker도 한 번만 조회됩니다.
+    """
+    processed_news_data, _ = enrich_news_payload_versioned(news_data, key_type=key_type)
+    return processed_news_data
+
+
+def stream_news_payload(news_data, key_type='name'):
+    """enrich_news_payload의 스트리밍 버전 - 응답 이벤트 dict를 순서대로 yield합니다.
+    
+    - category: 캐시에 있는 시세만으로 채운 카테고리별 기사와 아직 조회 중인 티커(pending)
+    - quotes: 캐시 미스 티커의 조회가 끝나는 대로 {ticker: {name, data}}
+    - done: 모든 시세 조회 완료
+    
+    업스트림 호출을 기다리지 않고 첫 이벤트를 보내므로, 느린 티커가 있어도
+    클라이언트는 기사를 먼저 렌더링할 수 있습니다.
+    """
+    valid_categories = {
+        category: articles for category, articles in news_data.items()
+        if articles and isinstance(articles, list)
+    }
+    
+    category_tickers = {
+        category: _collect_tickers(articles) for category, articles in valid_categories.items()
+    }
+    all_tickers = set().union(*category_tickers.values())
+    resolved = _resolve_tickers(sorted(all_tickers))
+    
+    # 정규 티커 -> 기사에 쓰인 표기들 (BRK.B와 BRK-B는 한 번만 조회)
+    spellings = {}
+    for ticker, canonical in resolved.items():
+        if canonical is not None:
+            spellings.setdefault(canonical, []).append(ticker)
+    
+    results, missing_tickers = _split_cached(sorted(spellings))
+    logger.info(
+        f"Streaming {len(valid_categories)} categories: "
+        f"{len(results)} cached, {len(missing_tickers)} pending tickers"
+    )
+    
+    # 캐시에 있는 시세는 메타데이터 캐시의 회사명으로 바로 매핑 (네트워크 호출 없음)
+    companies_info_map, ticker_to_name = {}, {}
+    for ticker, stock_data in results.items():
+        company_name = _company_name(ticker, stock_data, metadata_cache.get(ticker))
+        companies_info_map[company_name] = stock_data
+        for spelling in spellings[ticker]:
+            ticker_to_name[spelling] = company_name
+    for ticker, canonical in resolved.items():
+        if canonical is None:
+            companies_info_map[ticker] = _unknown_stock_data()
+            ticker_to_name[ticker] = ticker
+    companies_info_map = json_fragments(companies_info_map)
+    
+    updated_at = datetime.now().isoformat()
+    pending = {spelling for ticker in missing_tickers for spelling in spellings[ticker]}
+    for category, articles in news_data.items():
+        if category not in valid_categories:
+            logger.warning(f"Invalid articles data provided for category: {category}")
+            yield {"type": "category", "category": category, "articles": [], "pending": []}
+            continue
+        
+        yield {
+            "type": "category",
+            "category": category,
+            "articles": _apply_stock_info(
+                articles, companies_info_map, ticker_to_name, key_type, updated_at
+            ),
+            "pending": sorted(category_tickers[category] & pending)
+        }
+    
+    for fetched in _iter_fetched_quotes(missing_tickers):
+        ok_tickers = [ticker for ticker, stock_data in fetched.items() if 'error' not in stock_data]
+        metadata = get_ticker_metadata(ok_tickers) if ok_tickers else {}
+        yield {
+            "type": "quotes",
+            "quotes": {
+                spelling: {
+                    "name": _company_name(ticker, stock_data, metadata.get(ticker)),
+                    "data": stock_data
+                }
+                for ticker, stock_data in fetched.items()
+                for spelling in spellings[ticker]
+            }
+        }
+    
+    yield {"type": "done", "updatedAt": datetime.now().isoformat()}
+
+
+def _hot_refresh_loop():
+    """인기 티커를 soft TTL 만료 직전에 미리 갱신합니다."""
+    min_age = max(Config.CACHE_DURATION - Config.HOT_REFRESH_MARGIN, 0)
+    
+    while not _refresher_stop.wait(Config.HOT_REFRESH_INTERVAL):
+        try:
+            hot_tickers = stock_cache.hot_keys(Config.HOT_REFRESH_TOP_N, min_age=min_age)
+            if hot_tickers:
+                _schedule_refresh(hot_tickers)
+            stock_cache.decay_access_counts()
+        except Exception as e:
+            logger.error(f"Hot ticker refresh failed: {str(e)}")
+
+
+def start_hot_ticker_refresher():
+    """인기 티커 선제 갱신 스레드를 시작합니다."""
+    global _refresher_thread
+    
+    if _refresher_thread is not None and _refresher_thread.is_alive():
+        return
+    
+    _refresher_stop.clear()
+    _refresher_thread = threading.Thread(target=_hot_refresh_loop, name='hot-ticker-refresher', daemon=True)
+    _refresher_thread.start()
+    logger.info(f"Hot ticker refresher started: top_n={Config.HOT_REFRESH_TOP_N}, interval={Config.HOT_REFRESH_INTERVAL}s")
+
+
+def stop_hot_ticker_refresher():
+    """인기 티커 선제 갱신 스레드를 멈춥니다."""
+    _refresher_stop.set()
+    if _refresher_thread is not None:
+        _refresher_thread.join(timeout=Config.HOT_REFRESH_INTERVAL)
+
+
+def _snapshot_caches():
+    """스냅샷 대상 캐시 목록"""
+    return {"stock": stock_cache, "metadata": metadata_cache, "invalid_ticker": invalid_ticker_cache}
+
+
+def load_cache_snapshot():
+    """스냅샷 파일에서 아직 유효한 캐시 항목을 불러옵니다."""
+    path = Config.CACHE_SNAPSHOT_PATH
+    if not path:
+        return None
+    if not os.path.exists(path):
+        logger.info(f"No cache snapshot found at {path}")
+        return None
+    
+    try:
+        result = load_snapshot(path, _snapshot_caches())
+    except Exception as e:
+        logger.error(f"Failed to load cache snapshot from {path}: {str(e)}")
+        return None
+    
+    snapshot_stats["last_load"] = {
+        **result,
+        "saved_at": datetime.fromtimestamp(result["saved_at"]).isoformat(),
+        "loaded_at": datetime.now().isoformat()
+    }
+    logger.info(f"Loaded cache snapshot: {result['entries']} in {result['duration_ms']:.1f}ms ({result['bytes']} bytes)")
+    return result
+
+
+def save_cache_snapshot():
+    """현재 캐시 내용을 스냅샷 파일로 저장합니다."""
+    path = Config.CACHE_SNAPSHOT_PATH
+    if not path:
+        return None
+    
+    try:
+        result = save_snapshot(path, _snapshot_caches())
+    except Exception as e:
+        logger.error(f"Failed to save cache snapshot to {path}: {str(e)}")
+        return None
+    
+    snapshot_stats["last_save"] = {**result, "saved_at": datetime.now().isoformat()}
+    logger.debug(f"Saved cache snapshot: {result['entries']} ({result['bytes']} bytes)")
+    return result
+
+
+def _snapshot_loop():
+    """주기적으로 캐시 스냅샷을 저장합니다."""
+    while not _snapshot_stop.wait(Config.CACHE_SNAPSHOT_INTERVAL):
+        save_cache_snapshot()
+
+
+def start_snapshot_timer():
+    """주기적 스냅샷 저장 스레드를 시작합니다."""
+    global _snapshot_thread
+    
+    if not Config.CACHE_SNAPSHOT_PATH or Config.CACHE_SNAPSHOT_INTERVAL <= 0:
+        return
+    if _snapshot_thread is not None and _snapshot_thread.is_alive():
+        return
+    
+    _snapshot_stop.clear()
+    _snapshot_thread = threading.Thread(target=_snapshot_loop, name='cache-snapshot', daemon=True)
+    _snapshot_thread.start()
+    logger.info(f"Cache snapshot timer started: path={Config.CACHE_SNAPSHOT_PATH}, interval={Config.CACHE_SNAPSHOT_INTERVAL}s")
+
+
 def cleanup_resources():
     """리소스 정리"""
+    stop_hot_ticker_refresher()
+    _snapshot_stop.set()
+    save_cache_snapshot()
     logger.info("Shutting down executor...")
     executor.shutdown(wait=True)
     logger.info("Resources cleaned up successfully")
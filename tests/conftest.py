@@ -0,0 +1,72 @@
+"""테스트 공통 설정
+
+config는 import 시점에 환경 변수를 읽으므로, 앱 모듈을 import하기 전에 여기서 설정합니다.
+시세는 네트워크 없이 fixture 제공자(FIXTURE_QUOTES)로 조회하고, 공유 파일은 임시 디렉토리에 둡니다.
+"""
+import json
+import os
+import sys
+import tempfile
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# fixture 제공자가 돌려줄 시세 (레코드가 없는 티커는 "No quote returned"로 일시적 실패)
+FIXTURE_QUOTES = {
+    "AAPL": {"name": "Apple Inc.", "price": 190.0, "previousClose": 188.0, "exchange": "NMS", "currency": "USD"},
+    "MSFT": {"name": "Microsoft Corporation", "price": 410.0, "previousClose": 400.0, "exchange": "NMS", "currency": "USD"},
+    "NVDA": {"name": "NVIDIA Corporation", "price": 120.0, "previousClose": 125.0, "exchange": "NMS", "currency": "USD"},
+    "GONE": {"error": "GONE: possibly delisted; no price data found"},
+    "HALF": {"name": "Half Record", "price": 10.0}
+}
+
+_TEST_DIR = tempfile.mkdtemp(prefix='aivestor-tests-')
+_FIXTURE_PATH = os.path.join(_TEST_DIR, 'quotes.json')
+with open(_FIXTURE_PATH, 'w', encoding='utf-8') as f:
+    json.dump(FIXTURE_QUOTES, f)
+
+os.environ.update({
+    'BACKEND_URL': 'http://127.0.0.1:9',
+    'QUOTE_PROVIDERS': 'fixture',
+    'QUOTE_FIXTURE_PATH': _FIXTURE_PATH,
+    'CACHE_BACKEND': 'memory',
+    'CACHE_SHM_DIR': _TEST_DIR,
+    'PRECOMPUTE_DB_PATH': os.path.join(_TEST_DIR, 'pages.db'),
+    'METRICS_MULTIPROC_DIR': '',
+    'UPSTREAM_RATE_LIMIT': '1000',
+    'UPSTREAM_BURST': '1000',
+    # 요청 스레드 대기 회귀 테스트가 풀 크기보다 많은 동시 요청을 만들 수 있도록 작게 둠
+    'MAX_WORKERS': '2',
+    'ENABLE_ASYNC_ROUTES': 'false',
+    'LOG_LEVEL': 'WARNING'
+})
+
+
+@pytest.fixture
+def forget_tickers():
+    """테스트가 쓰는 티커의 시세/메타데이터/에러 캐시를 테스트 전후로 비워 다른 테스트 결과가 섞이지 않게 합니다."""
+    from services.stock_service import invalid_ticker_cache, metadata_cache, stock_cache, transient_error_cache
+
+    used = set()
+
+    def forget(*tickers):
+        used.update(tickers)
+        for ticker in tickers:
+            for cache in (stock_cache, metadata_cache, invalid_ticker_cache, transient_error_cache):
+                cache.delete(ticker)
+    yield forget
+    # 테스트가 대역으로 만든 결과가 다음 테스트에 남지 않도록 끝날 때도 비움
+    forget(*used)
+
+
+@pytest.fixture
+def app():
+    from app import create_app
+    return create_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,14 @@
+import asyncio
+from services import async_service
+
+
+def test_async_batch_uses_configured_provider(forget_tickers):
+    forget_tickers('AAPL', 'GONE')
+    assert not async_service.uses_chart_api()
+    
+    names, info, ticker_to_name = asyncio.run(
+        async_service.get_stock_data_batch_async(None, ['AAPL', 'GONE'])
+    )
+    
+    assert info[ticker_to_name['AAPL']]['price'] == '190.00'
+    assert 'error' in info[ticker_to_name['GONE']]
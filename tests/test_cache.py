@@ -0,0 +1,108 @@
+import threading
+import time
+import pytest
+from utils.cache import LimitedCache, SingleFlight
+
+
+def test_single_flight_coalesces_concurrent_callers():
+    flight = SingleFlight()
+    leader_future, is_leader = flight.acquire('AAPL')
+    follower_future, follower_is_leader = flight.acquire('AAPL')
+
+    assert is_leader and not follower_is_leader
+    assert follower_future is leader_future
+    assert flight.in_flight() == 1
+
+    flight.resolve('AAPL', {"price": 1.0})
+    assert follower_future.result(timeout=1) == {"price": 1.0}
+    assert flight.in_flight() == 0
+
+    # 끝난 뒤에는 새 leader가 뽑힘
+    _, is_leader = flight.acquire('AAPL')
+    assert is_leader
+
+
+def test_single_flight_propagates_exception():
+    flight = SingleFlight()
+    future, _ = flight.acquire('AAPL')
+    flight.resolve('AAPL', exception=ValueError("boom"))
+    with pytest.raises(ValueError):
+        future.result(timeout=1)
+
+
+def test_load_once_runs_loader_once():
+    cache = LimitedCache(max_size=10, cache_duration=60, record_metrics=False)
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(1)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.load_once('k', loader, timeout=2))) for _ in range(5)]
+    threads[0].start()
+    started.wait(1)
+    for thread in threads[1:]:
+        thread.start()
+    # follower들이 in-flight future에 붙을 시간을 줌
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert results == ["value"] * 5
+
+
+def test_get_stock_data_coalesces_concurrent_misses(forget_tickers, monkeypatch):
+    """같은 티커의 동시 미스는 fixture 제공자를 한 번만 호출합니다."""
+    from services import stock_service
+
+    forget_tickers('NVDA')
+    fetch = stock_service._fetch_stock_data
+    calls = []
+
+    def slow_fetch(ticker):
+        calls.append(ticker)
+        time.sleep(0.1)
+        return fetch(ticker)
+
+    monkeypatch.setattr(stock_service, '_fetch_stock_data', slow_fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(stock_service.get_stock_data('NVDA', deadline=2))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(3)
+
+    assert calls == ['NVDA']
+    assert [name for name, _ in results] == ["NVIDIA Corporation"] * 5
+
+
+def test_soft_and_hard_ttl():
+    cache = LimitedCache(max_size=10, cache_duration=10, hard_duration=60, record_metrics=False)
+
+    cache.set('fresh', 1)
+    assert cache.get('fresh') == 1
+    assert cache.lookup('fresh') == (1, False)
+
+    # soft TTL이 지난 항목은 get에서는 미스, lookup에서는 stale로 반환
+    cache.backend.set('stale', 2, time.time() - 30)
+    assert cache.get('stale') is None
+    assert cache.lookup('stale') == (2, True)
+    assert cache.peek('stale') == 2
+
+    # hard TTL이 지나면 lookup에서도 제거
+    cache.backend.set('expired', 3, time.time() - 120)
+    assert cache.lookup('expired') == (None, False)
+    assert cache.backend.get('expired') is None
+
+
+def test_hard_duration_defaults_to_soft_ttl():
+    cache = LimitedCache(max_size=10, cache_duration=10, record_metrics=False)
+    cache.backend.set('old', 1, time.time() - 30)
+    assert cache.lookup('old') == (None, False)
@@ -0,0 +1,103 @@
+import pickle
+import time
+from utils.cache import LimitedCache
+from utils.cache_backends import RedisBackend, SharedMemoryBackend, SqliteBackend
+
+
+def test_memory_backend_evicts_least_recently_used():
+    cache = LimitedCache(max_size=2, cache_duration=60, record_metrics=False)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_shared_memory_backend_roundtrip(tmp_path):
+    backend = SharedMemoryBackend(str(tmp_path / 'quotes.cache'), slot_count=16, slot_size=256)
+    backend.set('AAPL', {"price": 190.0}, 100.0)
+
+    assert backend.get('AAPL') == ({"price": 190.0}, 100.0)
+    assert backend.size() == 1
+
+    backend.set('AAPL', {"price": 191.0}, 101.0)
+    assert backend.get('AAPL') == ({"price": 191.0}, 101.0)
+    assert backend.size() == 1
+
+    backend.delete('AAPL')
+    assert backend.get('AAPL') is None
+
+
+def test_shared_memory_backend_is_shared_between_handles(tmp_path):
+    path = str(tmp_path / 'quotes.cache')
+    writer = SharedMemoryBackend(path, slot_count=16, slot_size=256)
+    reader = SharedMemoryBackend(path, slot_count=16, slot_size=256)
+
+    writer.set('MSFT', {"price": 410.0}, 100.0)
+    assert reader.get('MSFT') == ({"price": 410.0}, 100.0)
+
+    writer.incr_stats({'hits': 3, 'misses': 1})
+    assert reader.stats() == {"hits": 3, "misses": 1}
+
+
+def test_shared_memory_backend_skips_oversized_values(tmp_path):
+    backend = SharedMemoryBackend(str(tmp_path / 'quotes.cache'), slot_count=4, slot_size=64)
+    backend.set('BIG', "x" * 1000, 100.0)
+    assert backend.get('BIG') is None
+
+
+def test_shared_memory_backend_replaces_oldest_when_full(tmp_path):
+    backend = SharedMemoryBackend(str(tmp_path / 'quotes.cache'), slot_count=4, slot_size=128)
+    for i in range(4):
+        backend.set(f'K{i}', i, 100.0 + i)
+    backend.set('NEW', 'new', 200.0)
+
+    assert backend.get('NEW') == ('new', 200.0)
+    assert backend.get('K0') is None
+    assert backend.size() == 4
+
+
+def test_limited_cache_over_shared_memory_backend(tmp_path):
+    backend = SharedMemoryBackend(str(tmp_path / 'quotes.cache'), slot_count=16, slot_size=256)
+    cache = LimitedCache(max_size=8, cache_duration=10, hard_duration=60, record_metrics=False, backend=backend)
+
+    cache.set('AAPL', {"price": 190.0})
+    assert cache.get('AAPL') == {"price": 190.0}
+
+    backend.set('OLD', {"price": 1.0}, time.time() - 30)
+    assert cache.lookup('OLD') == ({"price": 1.0}, True)
+
+
+def test_sqlite_backend_tracks_row_count(tmp_path):
+    backend = SqliteBackend(str(tmp_path / 'cache.db'), 'metadata', max_size=10)
+    for i in range(5):
+        backend.set(f'K{i}', i, 100.0 + i)
+    # 같은 키를 다시 쓰면 행 수는 그대로
+    backend.set('K0', 'updated', 200.0)
+    assert backend.size() == 5
+    assert backend.get('K0') == ('updated', 200.0)
+
+    backend.delete('K1')
+    assert backend.size() == 4
+
+    # 다시 열면 파일 기준으로 다시 셈
+    assert SqliteBackend(str(tmp_path / 'cache.db'), 'metadata', max_size=10).size() == 4
+
+
+def test_sqlite_backend_evicts_oldest_over_max_size(tmp_path):
+    backend = SqliteBackend(str(tmp_path / 'cache.db'), 'metadata', max_size=10)
+    for i in range(11):
+        backend.set(f'K{i}', i, 100.0 + i)
+
+    assert backend.size() == 10
+    assert backend.get('K0') is None
+    assert backend.get('K10') == (10, 110.0)
+
+
+def test_redis_backend_payload_is_json():
+    assert RedisBackend._loads('[{"price": 1.5}, 100.0]') == ({"price": 1.5}, 100.0)
+    # 이전 버전이 pickle로 저장한 값은 미스로 처리
+    assert RedisBackend._loads(pickle.dumps(({"price": 1.5}, 100.0))) is None
@@ -0,0 +1,68 @@
+import numpy as np
+from utils.history_cache import (
+    CLOSE, DATE, HIGH, LOW, OPEN, VOLUME,
+    empty_series, merge_series, resample_weekly, slice_series
+)
+
+
+def _daily(days, base=100.0):
+    """days(1970-01-01 기준 일수)마다 봉 하나씩 있는 일봉 시리즈"""
+    days = np.asarray(days, dtype=np.float64)
+    offsets = np.arange(len(days), dtype=np.float64)
+    series = np.empty((6, len(days)), dtype=np.float64)
+    series[DATE] = days
+    series[OPEN] = base + offsets
+    series[HIGH] = base + offsets + 5
+    series[LOW] = base + offsets - 5
+    series[CLOSE] = base + offsets + 1
+    series[VOLUME] = 10
+    return series
+
+
+def test_resample_weekly_groups_by_monday():
+    # 1970-01-05(4일)은 월요일: 5~9일(월~금)과 12~14일(월~수) 두 주
+    daily = _daily([4, 5, 6, 7, 8, 11, 12, 13])
+    weekly = resample_weekly(daily)
+
+    assert weekly.shape == (6, 2)
+    assert list(weekly[DATE]) == [4, 11]
+    assert list(weekly[OPEN]) == [100, 105]
+    assert list(weekly[HIGH]) == [109, 112]
+    assert list(weekly[LOW]) == [95, 100]
+    assert list(weekly[CLOSE]) == [105, 108]
+    assert list(weekly[VOLUME]) == [50, 30]
+
+
+def test_resample_weekly_labels_partial_week_with_monday():
+    # 수요일부터 시작하는 주도 월요일 날짜로 표시
+    weekly = resample_weekly(_daily([6, 7]))
+    assert list(weekly[DATE]) == [4]
+
+
+def test_resample_weekly_empty():
+    assert resample_weekly(empty_series()).shape == (6, 0)
+
+
+def test_slice_series_is_inclusive():
+    daily = _daily([4, 5, 6, 7, 8, 11])
+
+    assert list(slice_series(daily, 5, 7)[DATE]) == [5, 6, 7]
+    assert list(slice_series(daily, start_day=9)[DATE]) == [11]
+    assert list(slice_series(daily, end_day=4)[DATE]) == [4]
+    assert slice_series(daily, 9, 10).shape == (6, 0)
+
+
+def test_merge_series_replaces_overlapping_bars():
+    existing = _daily([4, 5, 6])
+    new = _daily([6, 7], base=200.0)
+    merged = merge_series(existing, new)
+
+    assert list(merged[DATE]) == [4, 5, 6, 7]
+    # 겹치는 날짜(6일)는 새 값으로 바뀜
+    assert merged[CLOSE, 2] == 201.0
+
+
+def test_merge_series_with_empty_sides():
+    daily = _daily([4, 5])
+    assert merge_series(None, daily).tolist() == daily.tolist()
+    assert merge_series(daily, empty_series()) is daily
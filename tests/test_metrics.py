@@ -0,0 +1,53 @@
+import pytest
+from utils.metrics import LatencyHistogram, SlidingWindowHistogram
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.record(0.01)
+    for _ in range(10):
+        histogram.record(1.0)
+
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["min"] == 0.01
+    assert summary["max"] == 1.0
+    assert summary["avg"] == pytest.approx(0.109)
+    # 버킷 상한으로 근사하므로 상대 오차 ~20% 이내
+    assert summary["p50"] == pytest.approx(0.01, rel=0.2)
+    assert summary["p99"] == pytest.approx(1.0, rel=0.2)
+
+
+def test_latency_histogram_merge():
+    first = LatencyHistogram()
+    second = LatencyHistogram()
+    first.record(0.1)
+    second.record(0.3)
+    first.merge(second)
+
+    assert first.count == 2
+    assert (first.min, first.max) == (0.1, 0.3)
+
+
+def test_sliding_window_drops_expired_slots():
+    window = SlidingWindowHistogram(window_seconds=60, slot_count=6)
+    window.record(0.1, now=1000)
+    window.record(0.2, now=1025)
+
+    assert window.snapshot(now=1030).count == 2
+    # 10초 구간 6칸 - 첫 기록의 구간(1000~1010초)은 1060초부터 빠짐
+    assert window.snapshot(now=1059).count == 2
+    assert window.snapshot(now=1060).count == 1
+    assert window.snapshot(now=1100).count == 0
+
+
+def test_sliding_window_reuses_slot_for_new_period():
+    window = SlidingWindowHistogram(window_seconds=60, slot_count=6)
+    window.record(0.1, now=1000)
+    # 같은 링 버퍼 칸을 쓰는 60초 뒤 기록은 이전 구간을 덮어씀
+    window.record(0.5, now=1060)
+
+    snapshot = window.snapshot(now=1060)
+    assert snapshot.count == 1
+    assert snapshot.max == 0.5
@@ -0,0 +1,28 @@
+import os
+import time
+from config import Config
+from services import news_pages
+
+
+def test_store_is_not_created_when_precompute_disabled(app, monkeypatch):
+    monkeypatch.setattr(Config, 'PRECOMPUTE_ENABLED', False)
+
+    assert news_pages.get_page('news-with-stock', '2024-01-02') is None
+    assert news_pages.page_stats()["pages"]["news-with-stock:" + news_pages._page_dates()[0]]["age"] is None
+    assert news_pages._page_cache is None
+    assert not os.path.exists(Config.PRECOMPUTE_DB_PATH)
+
+
+def test_get_page_reports_age(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'PRECOMPUTE_ENABLED', True)
+    monkeypatch.setattr(Config, 'PRECOMPUTE_DB_PATH', str(tmp_path / 'pages.db'))
+    monkeypatch.setattr(news_pages, '_page_cache', None)
+
+    news_pages._page_store().set('news-with-stock:2024-01-02', {
+        "body": "{}\n", "etag": "abc", "built_at": time.time() - 5, "build_ms": 1.0
+    })
+    page = news_pages.get_page('news-with-stock', '2024-01-02')
+
+    assert page["etag"] == "abc"
+    assert 4 <= page["age"] < Config.CACHE_DURATION
+    assert os.path.exists(tmp_path / 'pages.db')
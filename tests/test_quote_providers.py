@@ -0,0 +1,109 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from services import quote_providers, stock_service
+from services.quote_providers import YFinanceProvider
+from services.stock_service import get_stock_quotes, invalid_ticker_cache, stock_data_status, transient_error_cache
+from utils.resilience import AdaptiveRateLimiter, CircuitBreaker, ProviderGuard, UpstreamError, UpstreamThrottledError
+
+
+def _fake_download(closes_by_ticker, log_lines):
+    """yfinance 1.7의 yf.download처럼 실패를 'yfinance' 로거에만 남기고 NaN/빈 프레임을 돌려주는 대역"""
+    def download(tickers, **kwargs):
+        logger = logging.getLogger('yfinance')
+        if log_lines:
+            logger.error('\n%d Failed download%s:' % (len(log_lines), 's' if len(log_lines) > 1 else ''))
+        for line in log_lines:
+            logger.error(line)
+
+        tickers = [ticker.upper() for ticker in tickers]
+        columns = pd.MultiIndex.from_product([tickers, ['Open', 'High', 'Low', 'Close', 'Volume']])
+        if not any(ticker in closes_by_ticker for ticker in tickers):
+            return pd.DataFrame(columns=columns)
+        index = pd.date_range(end=pd.Timestamp.today().normalize(), periods=2)
+        frame = pd.DataFrame(np.nan, index=index, columns=columns)
+        for ticker, closes in closes_by_ticker.items():
+            frame[(ticker, 'Close')] = closes
+        return frame
+    return download
+
+
+@pytest.fixture
+def yfinance_provider(monkeypatch):
+    guard = ProviderGuard(CircuitBreaker(failure_threshold=5, recovery_timeout=60), AdaptiveRateLimiter(rate=1000, burst=1000))
+    provider = YFinanceProvider(guard)
+    monkeypatch.setattr(stock_service, 'quote_provider', provider)
+    return provider
+
+
+def test_yfinance_reports_delisted_tickers_as_errors(yfinance_provider, monkeypatch):
+    monkeypatch.setattr(quote_providers.yf, 'download', _fake_download(
+        {'AAPL': [188.0, 190.0]},
+        ["['DEADCO']: possibly delisted; no timezone found"]
+    ))
+
+    quotes, errors = yfinance_provider.get_quotes(['AAPL', 'DEADCO'])
+    assert quotes == {'AAPL': (190.0, 188.0)}
+    assert errors == {'DEADCO': "DEADCO: possibly delisted; no timezone found"}
+
+
+def test_yfinance_delisted_ticker_lands_in_invalid_cache(yfinance_provider, monkeypatch, forget_tickers):
+    """기본(yfinance) 제공자로도 상장 폐지 티커는 일시적 실패(15초)가 아니라 invalid 캐시에 저장됩니다."""
+    forget_tickers('DEADCO')
+    monkeypatch.setattr(quote_providers.yf, 'download', _fake_download(
+        {},
+        ["['DEADCO']: YFPricesMissingError('possibly delisted; no price data found (period=5d)')"]
+    ))
+
+    _, stock_data = get_stock_quotes(['DEADCO'])['DEADCO']
+    assert stock_data_status(stock_data) == 'not_found'
+    assert invalid_ticker_cache.peek('DEADCO') is not None
+    assert transient_error_cache.peek('DEADCO') is None
+
+
+def test_yfinance_transport_error_is_transient(yfinance_provider, monkeypatch, forget_tickers):
+    forget_tickers('AAPL')
+    monkeypatch.setattr(quote_providers.yf, 'download', _fake_download(
+        {},
+        ["['AAPL']: ReadTimeout('read timed out')"]
+    ))
+
+    _, stock_data = get_stock_quotes(['AAPL'])['AAPL']
+    assert stock_data_status(stock_data) == 'error'
+    assert invalid_ticker_cache.peek('AAPL') is None
+
+
+def test_delisted_only_chunks_do_not_open_circuit(yfinance_provider, monkeypatch):
+    """상장 폐지 티커 하나를 반복 조회해도 다른 티커의 Yahoo 호출이 막히지 않아야 합니다."""
+    monkeypatch.setattr(quote_providers.yf, 'download', _fake_download(
+        {},
+        ["['DEADCO']: possibly delisted; no timezone found"]
+    ))
+    for _ in range(yfinance_provider.guard.breaker.failure_threshold + 1):
+        yfinance_provider.get_quotes(['DEADCO'])
+
+    assert yfinance_provider.guard.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_transport_failures_open_circuit(yfinance_provider, monkeypatch):
+    monkeypatch.setattr(quote_providers.yf, 'download', _fake_download(
+        {},
+        ["['AAPL', 'MSFT']: ReadTimeout('read timed out')"]
+    ))
+    for _ in range(yfinance_provider.guard.breaker.failure_threshold):
+        with pytest.raises(UpstreamError):
+            yfinance_provider.get_quotes(['AAPL', 'MSFT'])
+
+    assert yfinance_provider.guard.breaker.state == CircuitBreaker.OPEN
+
+
+def test_throttle_log_is_recorded_as_throttled(yfinance_provider, monkeypatch):
+    monkeypatch.setattr(quote_providers.yf, 'download', _fake_download(
+        {},
+        ["['AAPL']: YFRateLimitError('Too Many Requests. Rate limited. Try after a while.')"]
+    ))
+    with pytest.raises(UpstreamThrottledError):
+        yfinance_provider.get_quotes(['AAPL'])
+
+    assert yfinance_provider.guard.limiter.stats()["throttled"] == 1
@@ -0,0 +1,34 @@
+from services.quote_stream import QuoteHub, QuoteSubscription, _changed_fields
+
+
+def test_changed_fields_ignores_timestamp_only_changes():
+    previous = {"price": "1.00", "lastUpdated": "a"}
+    assert _changed_fields(None, previous) == previous
+    assert _changed_fields(previous, {"price": "1.00", "lastUpdated": "b"}) == {}
+    assert _changed_fields(previous, {"price": "1.10", "lastUpdated": "b"}) == {"price": "1.10", "lastUpdated": "b"}
+
+
+def test_subscription_merges_pending_updates():
+    subscription = QuoteSubscription(['AAPL'])
+    subscription.push('AAPL', {"price": "1.00"})
+    subscription.push('AAPL', {"price": "1.10", "change": "+0.10"})
+
+    assert subscription.wait(0) == {'AAPL': {"price": "1.10", "change": "+0.10"}}
+    assert subscription.wait(0) == {}
+
+
+def test_unsubscribe_is_idempotent():
+    hub = QuoteHub(interval=60, max_subscribers=2)
+    first = hub.subscribe(['AAPL'])
+    second = hub.subscribe(['AAPL', 'MSFT'])
+    assert hub.subscribe(['NVDA']) is None
+
+    hub.unsubscribe(first)
+    hub.unsubscribe(first)
+    assert hub.stats()["subscribers"] == 1
+    assert set(hub.subscribers) == {'AAPL', 'MSFT'}
+
+    hub.unsubscribe(second)
+    assert hub.stats()["subscribers"] == 0
+    assert hub.subscribers == {}
+    hub.stop()
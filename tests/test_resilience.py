@@ -0,0 +1,108 @@
+import time
+import pytest
+from utils.resilience import (
+    AdaptiveRateLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    ProviderGuard,
+    RateLimitExceeded
+)
+
+
+def test_circuit_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    # 성공하면 연속 실패 횟수가 초기화됨
+    breaker.record_success()
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_circuit_breaker_half_open_trial():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05, half_open_max_calls=1)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # 시험 호출은 한 번만
+    assert not breaker.allow()
+
+    # 시험 호출이 실패하면 다시 open
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_rate_limiter_acquire_respects_burst():
+    limiter = AdaptiveRateLimiter(rate=1, burst=2)
+    assert limiter.acquire()
+    assert limiter.acquire()
+    assert not limiter.acquire(max_wait=0)
+    assert limiter.stats()["rate_limited"] == 1
+
+
+def test_rate_limiter_reserve_returns_wait_time():
+    limiter = AdaptiveRateLimiter(rate=10, burst=1)
+    assert limiter.reserve() == 0.0
+
+    # 토큰이 없으면 기다릴 시간만 반환하고 스레드를 재우지 않음
+    start = time.monotonic()
+    wait_time = limiter.reserve(max_wait=1)
+    assert time.monotonic() - start < 0.05
+    assert wait_time == pytest.approx(0.1, abs=0.02)
+
+    # 예약분만큼 토큰이 음수가 되어 다음 예약은 더 기다림
+    assert limiter.reserve(max_wait=1) == pytest.approx(0.2, abs=0.02)
+    assert limiter.reserve(max_wait=0.05) is None
+
+
+def test_rate_limiter_adapts_to_errors():
+    limiter = AdaptiveRateLimiter(rate=8, burst=8, min_rate=1)
+    limiter.on_error(throttled=True)
+    assert limiter.rate == 4
+    limiter.on_error()
+    assert limiter.rate == pytest.approx(3.6)
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == 8
+
+
+def test_provider_guard_opens_circuit_on_failures():
+    guard = ProviderGuard(CircuitBreaker(failure_threshold=2, recovery_timeout=60), AdaptiveRateLimiter(rate=100, burst=100))
+
+    def failing():
+        raise ValueError("upstream down")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            guard.call(failing)
+
+    with pytest.raises(CircuitOpenError):
+        guard.call(lambda: "ok")
+
+
+def test_provider_guard_releases_half_open_slot_when_rate_limited():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    limiter = AdaptiveRateLimiter(rate=1, burst=1)
+    guard = ProviderGuard(breaker, limiter)
+    limiter.acquire()
+    breaker.record_failure()
+
+    with pytest.raises(RateLimitExceeded):
+        guard.enter(wait=False)
+    # 토큰이 없어 호출하지 못한 시험 호출 슬롯은 반납됨
+    assert breaker.half_open_calls == 0
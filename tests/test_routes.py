@@ -0,0 +1,59 @@
+def test_company_stock_info_status_codes(client, forget_tickers):
+    forget_tickers('AAPL', 'GONE', 'ZZZS')
+
+    assert client.get('/api/company-stockInfo?company=AAPL').status_code == 200
+    assert client.get('/api/company-stockInfo?company=GONE').status_code == 404
+    assert client.get('/api/company-stockInfo?company=ZZZS').status_code == 500
+    assert client.get('/api/company-stockInfo?company=bad$ticker').status_code == 400
+
+
+def test_stock_quotes_status_matches_company_stock_info(client, forget_tickers):
+    forget_tickers('AAPL', 'GONE', 'ZZZT')
+    response = client.post('/api/stock-quotes', json=['AAPL', 'GONE', 'ZZZT', 'bad$ticker'])
+
+    quotes = response.get_json()["quotes"]
+    assert {ticker: quote["status"] for ticker, quote in quotes.items()} == {
+        'AAPL': 'ok',
+        'GONE': 'not_found',
+        'ZZZT': 'error',
+        'bad$ticker': 'invalid'
+    }
+
+
+def test_stock_history_unsupported_provider_returns_501(client):
+    """fixture 제공자는 가격 이력을 주지 않으므로 빈 에러 메시지의 500이 아니라 501"""
+    response = client.get('/api/stock-history?company=AAPL')
+
+    assert response.status_code == 501
+    error = response.get_json()["error"]
+    assert error
+    assert 'fixture' in error
+
+
+def test_stock_history_rejects_bad_interval(client):
+    response = client.get('/api/stock-history?company=AAPL&interval=1h')
+    assert response.status_code == 400
+
+
+def test_stock_stream_unsubscribes_when_closed_before_streaming(client):
+    from services.quote_stream import quote_hub
+
+    response = client.get('/api/stock-stream?tickers=AAPL')
+    assert response.status_code == 200
+    assert quote_hub.stats()["subscribers"] == 1
+
+    # 제너레이터를 시작하기 전에 연결이 끊긴 경우
+    response.close()
+    assert quote_hub.stats()["subscribers"] == 0
+
+
+def test_stock_stream_is_served_by_stream_app_only_when_split(monkeypatch):
+    from app import create_app, create_stream_app
+    from config import Config
+
+    monkeypatch.setattr(Config, 'QUOTE_STREAM_IN_APP', False)
+    assert create_app().test_client().get('/api/stock-stream?tickers=AAPL').status_code == 404
+
+    response = create_stream_app().test_client().get('/api/stock-stream?tickers=AAPL')
+    assert response.status_code == 200
+    response.close()
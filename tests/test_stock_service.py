@@ -0,0 +1,125 @@
+import threading
+import time
+import pytest
+from services import stock_service
+from services.stock_service import (
+    get_stock_data,
+    get_stock_quotes,
+    invalid_ticker_cache,
+    is_invalid_ticker_error,
+    stock_data_status,
+    transient_error_cache
+)
+
+
+@pytest.mark.parametrize('stock_data, status', [
+    ({"price": 1.0}, 'ok'),
+    ({"error": "Data fetch in progress", "pending": True}, 'pending'),
+    ({"error": "Invalid ticker format"}, 'invalid'),
+    ({"error": "GONE: possibly delisted; no price data found"}, 'not_found'),
+    ({"error": "No stock data available"}, 'not_found'),
+    # 시세가 빠졌거나 불완전한 응답은 장애 때도 똑같이 보이므로 일시적 실패
+    ({"error": "No quote returned for AAPL"}, 'error'),
+    ({"error": "Incomplete quote returned for AAPL"}, 'error'),
+    ({"error": "Invalid or incomplete stock data"}, 'error'),
+    ({"error": "Upstream temporarily unavailable: Upstream circuit is open"}, 'error')
+])
+def test_stock_data_status(stock_data, status):
+    assert stock_data_status(stock_data) == status
+
+
+def test_is_invalid_ticker_error():
+    assert is_invalid_ticker_error("$XYZ: possibly delisted; no timezone found")
+    assert not is_invalid_ticker_error("No quote returned for XYZ")
+    assert not is_invalid_ticker_error("Invalid or incomplete stock data")
+
+
+def test_bulk_quotes_classify_like_single_lookups(forget_tickers):
+    tickers = ['AAPL', 'GONE', 'HALF', 'ZZZQ']
+    forget_tickers(*tickers)
+    bulk = {ticker: stock_data_status(data) for ticker, (_, data) in get_stock_quotes(tickers).items()}
+
+    forget_tickers(*tickers)
+    single = {ticker: stock_data_status(get_stock_data(ticker)[1]) for ticker in tickers}
+
+    assert bulk == single == {'AAPL': 'ok', 'GONE': 'not_found', 'HALF': 'error', 'ZZZQ': 'error'}
+
+
+def test_missing_bulk_quote_is_cached_as_transient(forget_tickers):
+    forget_tickers('ZZZR')
+    _, stock_data = get_stock_quotes(['ZZZR'])['ZZZR']
+
+    assert stock_data == {"error": "No quote returned for ZZZR"}
+    assert transient_error_cache.peek('ZZZR') is not None
+    assert invalid_ticker_cache.peek('ZZZR') is None
+
+
+def test_delisted_quote_is_cached_as_invalid(forget_tickers):
+    forget_tickers('GONE')
+    get_stock_quotes(['GONE'])
+
+    assert invalid_ticker_cache.peek('GONE') is not None
+    assert transient_error_cache.peek('GONE') is None
+
+
+def test_single_lookup_returns_quote_and_name(forget_tickers):
+    forget_tickers('MSFT')
+    name, stock_data = get_stock_data('MSFT')
+
+    assert name == "Microsoft Corporation"
+    assert stock_data["price"] == "410.00"
+    assert stock_data["change"] == "+10.00"
+    assert stock_data["changePercent"] == "+2.50"
+    assert stock_data["isPositive"] is True
+
+
+def test_concurrent_lookups_do_not_starve_executor(forget_tickers, monkeypatch):
+    """같은 티커를 기다리는 요청이 executor 스레드를 차지해 leader 조회가 밀리지 않아야 합니다.
+
+    MAX_WORKERS=2(conftest)에서 티커 3개 x 요청 4개를 동시에 보내도 티커당 한 번만 조회하고
+    deadline 안에 모두 응답해야 합니다.
+    """
+    tickers = ['AAPL', 'MSFT', 'NVDA']
+    forget_tickers(*tickers)
+    fetch = stock_service._fetch_stock_data
+    calls = []
+
+    def slow_fetch(ticker):
+        calls.append(ticker)
+        time.sleep(0.2)
+        return fetch(ticker)
+
+    monkeypatch.setattr(stock_service, '_fetch_stock_data', slow_fetch)
+
+    results = []
+    lock = threading.Lock()
+
+    def request(ticker):
+        result = get_stock_data(ticker, deadline=2)
+        with lock:
+            results.append(result)
+
+    threads = [threading.Thread(target=request, args=(ticker,)) for ticker in tickers for _ in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    elapsed = time.monotonic() - start
+
+    assert sorted(calls) == sorted(tickers)
+    assert len(results) == len(threads)
+    assert all(stock_data_status(stock_data) == 'ok' for _, stock_data in results)
+    assert elapsed < 1.5
+
+
+def test_single_lookup_uses_current_price_when_market_price_is_null(forget_tickers, monkeypatch):
+    """regularMarketPrice 키가 있지만 null이면 currentPrice로 계산합니다 (TypeError 없이)."""
+    forget_tickers('NULLP')
+    info = {"shortName": "Null Price", "regularMarketPrice": None, "currentPrice": 11.0, "previousClose": 10.0}
+    monkeypatch.setattr(stock_service.quote_provider, 'get_info', lambda ticker: info)
+
+    _, stock_data = get_stock_data('NULLP')
+    assert stock_data_status(stock_data) == 'ok'
+    assert stock_data["price"] == "11.00"
+    assert stock_data["changePercent"] == "+10.00"
@@ -0,0 +1,82 @@
+import json
+import os
+import pytest
+from config import Config
+from utils import tracing
+
+
+@pytest.fixture
+def multiproc_dir(tmp_path, monkeypatch):
+    """워커별 파일을 임시 디렉토리에 쓰도록 바꿉니다 (이 프로세스의 파일 경로도 새로 잡음)."""
+    monkeypatch.setattr(Config, 'METRICS_MULTIPROC_DIR', str(tmp_path))
+    monkeypatch.setattr(tracing, '_worker_pid', None)
+    return tmp_path
+
+
+def _write_worker_file(directory, name, entries):
+    with open(os.path.join(directory, name), 'w') as f:
+        json.dump(entries, f)
+
+
+def _values(*bucket_counts, total):
+    values = [0] * (len(tracing.STAGE_BUCKETS) + 1) + [total]
+    for index, count in bucket_counts:
+        values[index] = count
+    return values
+
+
+def test_record_stage_buckets():
+    tracing.record_stage('unit', 0.003, endpoint='test-buckets')
+    tracing.record_stage('unit', 0.3, endpoint='test-buckets')
+    tracing.record_stage('unit', 60, endpoint='test-buckets')
+
+    values = tracing.collect_stage_stats()[('test-buckets', 'unit')]
+    assert values[0] == 1
+    assert values[tracing.STAGE_BUCKETS.index(0.5)] == 1
+    # 가장 큰 버킷보다 크면 +Inf 칸
+    assert values[len(tracing.STAGE_BUCKETS)] == 1
+    assert values[-1] == pytest.approx(60.303)
+
+
+def test_render_prometheus_is_cumulative():
+    tracing.record_stage('unit', 0.003, endpoint='test-render')
+    tracing.record_stage('unit', 0.3, endpoint='test-render')
+
+    lines = tracing.render_prometheus().splitlines()
+    labels = 'endpoint="test-render",stage="unit"'
+    assert f'aivestor_stage_duration_seconds_bucket{{{labels},le="0.005"}} 1' in lines
+    assert f'aivestor_stage_duration_seconds_bucket{{{labels},le="0.5"}} 2' in lines
+    assert f'aivestor_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f'aivestor_stage_duration_seconds_count{{{labels}}} 2' in lines
+
+
+def test_collect_merges_worker_files(multiproc_dir):
+    _write_worker_file(multiproc_dir, 'stages_101_1.json', [['test-merge', 'unit', _values((0, 1), total=0.001)]])
+    _write_worker_file(multiproc_dir, 'stages_102_1.json', [['test-merge', 'unit', _values((0, 2), (3, 1), total=0.05)]])
+
+    values = tracing.collect_stage_stats()[('test-merge', 'unit')]
+    assert values[0] == 3
+    assert values[3] == 1
+    assert values[-1] == pytest.approx(0.051)
+
+
+def test_retire_worker_keeps_totals_and_removes_file(multiproc_dir):
+    _write_worker_file(multiproc_dir, 'stages_201_1.json', [['test-retire', 'unit', _values((0, 1), total=0.001)]])
+    _write_worker_file(multiproc_dir, 'stages_202_1.json', [['test-retire', 'unit', _values((1, 1), total=0.01)]])
+    before = tracing.collect_stage_stats()
+
+    tracing.retire_worker_stats(201)
+    tracing.retire_worker_stats(202)
+
+    assert tracing.collect_stage_stats() == before
+    assert not (multiproc_dir / 'stages_201_1.json').exists()
+    assert not (multiproc_dir / 'stages_202_1.json').exists()
+    assert (multiproc_dir / tracing.ARCHIVE_FILE).exists()
+
+
+def test_reset_stage_files(multiproc_dir):
+    _write_worker_file(multiproc_dir, 'stages_301_1.json', [['test-reset', 'unit', _values((0, 1), total=0.001)]])
+    _write_worker_file(multiproc_dir, tracing.ARCHIVE_FILE, [['test-reset', 'unit', _values((0, 1), total=0.001)]])
+
+    tracing.reset_stage_files()
+    assert not list(multiproc_dir.glob('stages_*.json'))
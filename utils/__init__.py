@@ -1,18 +1,39 @@
 """유틸리티 패키지"""
-from .cache import LimitedCache
+from .cache import LimitedCache, SingleFlight
+from .cache_backends import MemoryBackend, SharedMemoryBackend, RedisBackend, SqliteBackend, create_cache_backend
 from .decorators import retry_with_backoff, track_performance
-from .metrics import metrics, get_metrics, get_cache_hit_ratio, get_avg_response_times
-from .validators import validate_ticker, validate_date_format, validate_stock_data
+from .metrics import metrics, LatencyHistogram, SlidingWindowHistogram, get_metrics, get_cache_hit_ratio, get_avg_response_times
+from .tracing import stage_span, trace_stage, render_prometheus
+from .resilience import CircuitBreaker, AdaptiveRateLimiter, ProviderGuard, CircuitOpenError, RateLimitExceeded
+from .validators import validate_ticker, normalize_ticker, validate_date_format, validate_stock_data, get_current_price
 
 __all__ = [
     'LimitedCache',
+    'SingleFlight',
+    'MemoryBackend',
+    'SharedMemoryBackend',
+    'RedisBackend',
+    'SqliteBackend',
+    'create_cache_backend',
     'retry_with_backoff',
     'track_performance',
     'metrics',
+    'LatencyHistogram',
+    'SlidingWindowHistogram',
     'get_metrics',
     'get_cache_hit_ratio',
     'get_avg_response_times',
+    'stage_span',
+    'trace_stage',
+    'render_prometheus',
+    'CircuitBreaker',
+    'AdaptiveRateLimiter',
+    'ProviderGuard',
+    'CircuitOpenError',
+    'RateLimitExceeded',
     'validate_ticker',
+    'normalize_ticker',
     'validate_date_format',
-    'validate_stock_data'
+    'validate_stock_data',
+    'get_current_price'
 ]
@@ -1,60 +1,307 @@
 """캐시 관련 유틸리티"""
+import os
+import pickle
+import tempfile
 import threading
 import time
-from collections import OrderedDict
+import zlib
+from concurrent.futures import Future
 import logging
+from utils.cache_backends import MemoryBackend
 
 logger = logging.getLogger(__name__)
 
 
+class SingleFlight:
+    """같은 키에 대한 동시 로드를 하나의 in-flight future로 합칩니다."""
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+    
+    def acquire(self, key):
+        """(future, is_leader)를 반환합니다. leader만 실제로 로드해야 합니다."""
+        with self.lock:
+            future = self.calls.get(key)
+            if future is not None:
+                return future, False
+            
+            future = Future()
+            self.calls[key] = future
+            return future, True
+    
+    def resolve(self, key, value=None, exception=None):
+        """leader가 로드 결과를 대기 중인 호출자들에게 전달합니다."""
+        with self.lock:
+            future = self.calls.pop(key, None)
+        
+        if future is None or future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(value)
+    
+    def in_flight(self):
+        with self.lock:
+            return len(self.calls)
+
+
 class LimitedCache:
-    """LRU 캐시 구현 - 메모리 누수 방지"""
-    def __init__(self, max_size=1000, cache_duration=60):
-        self.cache = OrderedDict()
+    """LRU 캐시 구현 - 메모리 누수 방지
+    
+    cache_duration(soft TTL)이 지난 항목은 stale 상태로 hard_duration(hard TTL)까지
+    보관되며, lookup()으로 조회하면 stale 여부와 함께 그대로 반환됩니다.
+    hard_duration을 지정하지 않으면 기존처럼 soft TTL에서 바로 만료됩니다.
+    
+    실제 저장은 backend(utils.cache_backends)에 위임하므로, 공유 백엔드를 쓰면
+    여러 gunicorn 워커가 같은 캐시를 봅니다.
+    """
+    # 공유 백엔드의 히트/미스 카운터를 반영하는 주기 (초)
+    STATS_FLUSH_INTERVAL = 1.0
+    
+    def __init__(self, max_size=1000, cache_duration=60, hard_duration=None, record_metrics=True, backend=None):
+        self.backend = backend if backend is not None else MemoryBackend(max_size)
         self.max_size = max_size
         self.cache_duration = cache_duration
+        self.hard_duration = max(hard_duration or cache_duration, cache_duration)
+        # 보조 캐시(회사명 등)는 시세 캐시 히트율에 섞이지 않도록 집계에서 제외
+        self.record_metrics = record_metrics
         self.lock = threading.Lock()
+        self.inflight = SingleFlight()
+        # 키별 조회 횟수 (인기 티커 선제 갱신용)
+        self.access_counts = {}
+        self.pending_stats = {'hits': 0, 'misses': 0}
+        self.last_stats_flush = time.time()
     
-    def get(self, key):
-        from utils.metrics import metrics
+    def _record(self, hit, stale=False):
+        """히트/미스를 로컬 메트릭스와 (공유 백엔드라면) 공유 카운터에 기록합니다."""
+        from utils.metrics import increment_cache_hit, increment_cache_miss
         
-        with self.lock:
-            if key in self.cache:
-                data, timestamp = self.cache[key]
-                if time.time() - timestamp < self.cache_duration:
-                    # LRU: 최근 사용한 항목을 맨 뒤로
-                    self.cache.move_to_end(key)
-                    metrics['cache_hits'] += 1
-                    return data
-                else:
-                    # 만료된 캐시 제거
-                    del self.cache[key]
+        if not self.record_metrics:
+            return
+        
+        if hit:
+            increment_cache_hit(stale=stale)
+        else:
+            increment_cache_miss()
+        
+        if self.backend.shared:
+            self.pending_stats['hits' if hit else 'misses'] += 1
+            now = time.time()
+            if now - self.last_stats_flush >= self.STATS_FLUSH_INTERVAL:
+                self.backend.incr_stats(self.pending_stats)
+                self.pending_stats = {'hits': 0, 'misses': 0}
+                self.last_stats_flush = now
+    
+    def _lookup_locked(self, key, now):
+        """(data, age)를 반환합니다. hard TTL이 지난 항목은 제거합니다."""
+        entry = self.backend.get(key)
+        if entry is None:
+            self.access_counts.pop(key, None)
+            return None, None
         
-        metrics['cache_misses'] += 1
+        data, timestamp = entry
+        age = now - timestamp
+        if age >= self.hard_duration:
+            # 만료된 캐시 제거
+            self.backend.delete(key)
+            self.access_counts.pop(key, None)
+            return None, None
+        
+        self.access_counts[key] = self.access_counts.get(key, 0) + 1
+        return data, age
+    
+    def get(self, key):
+        """soft TTL 이내의 항목만 반환합니다."""
+        with self.lock:
+            data, age = self._lookup_locked(key, time.time())
+            if data is not None and age < self.cache_duration:
+                self._record(hit=True)
+                return data
+            self._record(hit=False)
         return None
     
+    def lookup(self, key):
+        """(data, is_stale)를 반환합니다. hard TTL이 지났거나 없으면 (None, False)."""
+        with self.lock:
+            data, age = self._lookup_locked(key, time.time())
+            if data is not None:
+                is_stale = age >= self.cache_duration
+                self._record(hit=True, stale=is_stale)
+                return data, is_stale
+            self._record(hit=False)
+        return None, False
+    
+    def peek(self, key):
+        """hard TTL 이내의 값을 메트릭스/조회 횟수에 반영하지 않고 반환합니다."""
+        with self.lock:
+            entry = self.backend.get(key, touch=False)
+        if entry is None or time.time() - entry[1] >= self.hard_duration:
+            return None
+        return entry[0]
+    
     def set(self, key, value):
         with self.lock:
-            if key in self.cache:
-                self.cache.move_to_end(key)
-            elif len(self.cache) >= self.max_size:
-                # 가장 오래된 항목 제거
-                self.cache.popitem(last=False)
-            
-            self.cache[key] = (value, time.time())
+            evicted_key = self.backend.set(key, value, time.time())
+            if evicted_key is not None:
+                self.access_counts.pop(evicted_key, None)
+    
+    def delete(self, key):
+        with self.lock:
+            self.backend.delete(key)
+            self.access_counts.pop(key, None)
+    
+    def load_once(self, key, loader, timeout=None):
+        """loader를 한 번만 실행하고, 동시 호출자는 그 결과를 기다립니다."""
+        from utils.metrics import increment_coalesced_requests
+        
+        future, is_leader = self.inflight.acquire(key)
+        if not is_leader:
+            increment_coalesced_requests()
+            return future.result(timeout=timeout)
+        
+        try:
+            value = loader()
+        except Exception as e:
+            self.inflight.resolve(key, exception=e)
+            raise
+        self.inflight.resolve(key, value)
+        return value
+    
+    def get_or_load(self, key, loader, timeout=None):
+        """캐시 미스 시 load_once로 값을 가져옵니다."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        return self.load_once(key, loader, timeout=timeout)
+    
+    def hot_keys(self, limit, min_age=0):
+        """조회 횟수 상위 limit개 중 min_age 이상 지난 캐시 키를 반환합니다."""
+        with self.lock:
+            now = time.time()
+            ranked = sorted(self.access_counts, key=self.access_counts.get, reverse=True)[:limit]
+            hot = []
+            for key in ranked:
+                entry = self.backend.get(key, touch=False)
+                if entry is not None and now - entry[1] >= min_age:
+                    hot.append(key)
+            return hot
+    
+    def decay_access_counts(self):
+        """조회 횟수를 절반으로 줄여 오래전 인기 키가 계속 남지 않게 합니다."""
+        with self.lock:
+            self.access_counts = {
+                key: count // 2
+                for key, count in self.access_counts.items()
+                if count > 1
+            }
     
     def size(self):
         with self.lock:
-            return len(self.cache)
+            return self.backend.size()
+    
+    def shared_stats(self):
+        """공유 백엔드의 전체 워커 합산 히트/미스 (로컬 백엔드면 None)"""
+        with self.lock:
+            stats = self.backend.stats()
+        if not stats:
+            return None
+        
+        total = stats['hits'] + stats['misses']
+        return {**stats, "hit_ratio": stats['hits'] / total if total > 0 else 0}
+    
+    def export_entries(self):
+        """hard TTL 이내의 (key, value, timestamp) 목록을 반환합니다."""
+        with self.lock:
+            current_time = time.time()
+            return [
+                (key, value, timestamp) for key, value, timestamp in self.backend.items()
+                if current_time - timestamp < self.hard_duration
+            ]
+    
+    def import_entries(self, entries):
+        """원래 타임스탬프를 유지한 채 항목을 넣습니다. 만료됐거나 더 최신 값이 있으면 건너뜁니다."""
+        loaded = 0
+        with self.lock:
+            current_time = time.time()
+            for key, value, timestamp in entries:
+                if current_time - timestamp >= self.hard_duration:
+                    continue
+                existing = self.backend.get(key, touch=False)
+                if existing is not None and existing[1] >= timestamp:
+                    continue
+                self.backend.set(key, value, timestamp)
+                loaded += 1
+        return loaded
     
     def clear_expired(self):
-        """만료된 캐시 항목들을 정리합니다."""
+        """hard TTL이 지난 캐시 항목들을 정리합니다."""
         with self.lock:
             current_time = time.time()
             expired_keys = [
-                key for key, (_, timestamp) in self.cache.items() 
-                if current_time - timestamp > self.cache_duration
+                key for key, _, timestamp in self.backend.items()
+                if current_time - timestamp > self.hard_duration
             ]
             for key in expired_keys:
-                del self.cache[key]
+                self.backend.delete(key)
+                self.access_counts.pop(key, None)
             return len(expired_keys)
+
+
+# 캐시 값 형식이 바뀌면 올려서 이전 스냅샷을 무시하게 함
+SNAPSHOT_VERSION = 2
+
+
+def save_snapshot(path, caches):
+    """여러 캐시의 내용을 타임스탬프와 함께 압축된 파일 하나로 저장합니다.
+    
+    caches는 {이름: LimitedCache} 형태이며, 임시 파일에 쓴 뒤 교체하므로
+    여러 워커가 동시에 저장해도 파일이 깨지지 않습니다.
+    """
+    start_time = time.time()
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": start_time,
+        "caches": {name: cache.export_entries() for name, cache in caches.items()}
+    }
+    data = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    return {
+        "entries": {name: len(entries) for name, entries in payload["caches"].items()},
+        "bytes": len(data),
+        "duration_ms": (time.time() - start_time) * 1000
+    }
+
+
+def load_snapshot(path, caches):
+    """save_snapshot으로 저장한 파일에서 아직 유효한 항목만 캐시에 다시 넣습니다."""
+    start_time = time.time()
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    payload = pickle.loads(zlib.decompress(data))
+    if payload.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {payload.get('version')}")
+    
+    loaded = {}
+    for name, cache in caches.items():
+        loaded[name] = cache.import_entries(payload["caches"].get(name, []))
+    
+    return {
+        "entries": loaded,
+        "bytes": len(data),
+        "saved_at": payload["saved_at"],
+        "duration_ms": (time.time() - start_time) * 1000
+    }
@@ -0,0 +1,575 @@
+"""캐시 저장소 백엔드
+
+LimitedCache는 만료/stale 판단, single-flight, 인기 키 집계를 담당하고
+실제 (value, timestamp) 저장은 여기 백엔드에 위임합니다.
+
+- memory: 프로세스 로컬 OrderedDict LRU (기본값)
+- shm: mmap 파일 기반 공유 해시 테이블 (단일 호스트의 gunicorn 워커 간 공유, 외부 서비스 불필요)
+- redis: RESP 프로토콜 클라이언트 (Redis 또는 호환 서버, 값은 JSON으로 직렬화 가능해야 함)
+- sqlite: 로컬 SQLite 파일 (재시작 후에도 유지되는 장기 캐시용)
+
+백엔드 메서드는 LimitedCache의 lock 안에서 호출됩니다.
+"""
+import json
+import os
+import pickle
+import socket
+import sqlite3
+import struct
+import tempfile
+import threading
+import zlib
+import mmap
+import logging
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows 등
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """프로세스 로컬 LRU 저장소"""
+    shared = False
+
+    def __init__(self, max_size=1000):
+        self.cache = OrderedDict()
+        self.max_size = max_size
+
+    def get(self, key, touch=True):
+        entry = self.cache.get(key)
+        if entry is not None and touch:
+            # LRU: 최근 사용한 항목을 맨 뒤로
+            self.cache.move_to_end(key)
+        return entry
+
+    def set(self, key, value, timestamp):
+        """저장하고, 용량 초과로 밀려난 키가 있으면 반환합니다."""
+        evicted_key = None
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        elif len(self.cache) >= self.max_size:
+            # 가장 오래된 항목 제거
+            evicted_key, _ = self.cache.popitem(last=False)
+
+        self.cache[key] = (value, timestamp)
+        return evicted_key
+
+    def delete(self, key):
+        self.cache.pop(key, None)
+
+    def items(self):
+        """(key, value, timestamp) 목록"""
+        return [(key, value, timestamp) for key, (value, timestamp) in self.cache.items()]
+
+    def size(self):
+        return len(self.cache)
+
+    def incr_stats(self, stats):
+        pass
+
+    def stats(self):
+        return None
+
+
+class SharedMemoryBackend:
+    """mmap 파일 기반 공유 해시 테이블
+
+    고정 크기 슬롯을 선형 탐사(PROBE_LIMIT 칸)로 찾으며, 빈 칸이 없으면
+    탐사 범위에서 가장 오래된 항목을 덮어씁니다. 프로세스 간 동기화는 flock으로 합니다.
+    """
+    shared = True
+
+    MAGIC = b'AIVCACHE'
+    VERSION = 1
+    # magic, version, slot_count, slot_size, hits, misses
+    HEADER = struct.Struct('<8sIIIQQ')
+    HEADER_SIZE = 64
+    # used, key_len, value_len, timestamp
+    SLOT_HEADER = struct.Struct('<BHId')
+    PROBE_LIMIT = 8
+
+    def __init__(self, path, slot_count, slot_size=1024):
+        if fcntl is None:
+            raise RuntimeError("SharedMemoryBackend requires fcntl (POSIX only)")
+
+        self.path = path
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.file_size = self.HEADER_SIZE + slot_count * slot_size
+        self.fd = None
+        self.mm = None
+        self.pid = None
+        self._open()
+
+    def _open(self):
+        """파일을 열고 mmap합니다. fork 이후에는 프로세스별로 다시 엽니다 (flock 공유 방지)."""
+        if self.mm is not None:
+            self.mm.close()
+            os.close(self.fd)
+
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self.fd).st_size != self.file_size or not self._header_matches():
+                # 새 파일이거나 설정이 바뀐 경우 초기화
+                os.ftruncate(self.fd, 0)
+                os.ftruncate(self.fd, self.file_size)
+                os.pwrite(self.fd, self.HEADER.pack(self.MAGIC, self.VERSION, self.slot_count, self.slot_size, 0, 0), 0)
+                logger.info(f"Initialized shared cache file {self.path} ({self.file_size} bytes)")
+            self.mm = mmap.mmap(self.fd, self.file_size)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.pid = os.getpid()
+
+    def _header_matches(self):
+        raw = os.pread(self.fd, self.HEADER.size, 0)
+        if len(raw) < self.HEADER.size:
+            return False
+        magic, version, slot_count, slot_size, _, _ = self.HEADER.unpack(raw)
+        return (magic, version, slot_count, slot_size) == (self.MAGIC, self.VERSION, self.slot_count, self.slot_size)
+
+    def _locked(self, exclusive):
+        if self.pid != os.getpid():
+            self._open()
+        return _FileLock(self.fd, exclusive)
+
+    def _probe(self, key_bytes):
+        home = zlib.crc32(key_bytes) % self.slot_count
+        return [(home + i) % self.slot_count for i in range(min(self.PROBE_LIMIT, self.slot_count))]
+
+    def _read_slot(self, index):
+        offset = self.HEADER_SIZE + index * self.slot_size
+        used, key_len, value_len, timestamp = self.SLOT_HEADER.unpack_from(self.mm, offset)
+        return offset, used, key_len, value_len, timestamp
+
+    def _find(self, key_bytes):
+        for index in self._probe(key_bytes):
+            offset, used, key_len, value_len, timestamp = self._read_slot(index)
+            if not used or key_len != len(key_bytes):
+                continue
+            start = offset + self.SLOT_HEADER.size
+            if self.mm[start:start + key_len] == key_bytes:
+                return offset, value_len, timestamp
+        return None
+
+    def get(self, key, touch=True):
+        key_bytes = key.encode('utf-8')
+        with self._locked(exclusive=False):
+            found = self._find(key_bytes)
+            if found is None:
+                return None
+            offset, value_len, timestamp = found
+            start = offset + self.SLOT_HEADER.size + len(key_bytes)
+            payload = self.mm[start:start + value_len]
+        return pickle.loads(payload), timestamp
+
+    def set(self, key, value, timestamp):
+        key_bytes = key.encode('utf-8')
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.SLOT_HEADER.size + len(key_bytes) + len(payload) > self.slot_size:
+            logger.debug(f"Value for {key} exceeds shared cache slot size, not cached")
+            return None
+
+        with self._locked(exclusive=True):
+            target = None
+            oldest = None
+            for index in self._probe(key_bytes):
+                offset, used, key_len, _, slot_timestamp = self._read_slot(index)
+                start = offset + self.SLOT_HEADER.size
+                if used and key_len == len(key_bytes) and self.mm[start:start + key_len] == key_bytes:
+                    target = offset
+                    break
+                if not used and target is None:
+                    target = offset
+                if used and (oldest is None or slot_timestamp < oldest[1]):
+                    oldest = (offset, slot_timestamp)
+            if target is None:
+                # 탐사 범위가 가득 찬 경우 가장 오래된 항목 교체
+                target = oldest[0]
+
+            self.SLOT_HEADER.pack_into(self.mm, target, 1, len(key_bytes), len(payload), timestamp)
+            start = target + self.SLOT_HEADER.size
+            self.mm[start:start + len(key_bytes)] = key_bytes
+            self.mm[start + len(key_bytes):start + len(key_bytes) + len(payload)] = payload
+        # 다른 워커의 키가 밀려났을 수 있지만 로컬에서 추적할 필요는 없음
+        return None
+
+    def delete(self, key):
+        key_bytes = key.encode('utf-8')
+        with self._locked(exclusive=True):
+            found = self._find(key_bytes)
+            if found is not None:
+                self.mm[found[0]] = 0
+
+    def items(self):
+        entries = []
+        with self._locked(exclusive=False):
+            for index in range(self.slot_count):
+                offset, used, key_len, value_len, timestamp = self._read_slot(index)
+                if not used:
+                    continue
+                start = offset + self.SLOT_HEADER.size
+                key = self.mm[start:start + key_len].decode('utf-8')
+                payload = self.mm[start + key_len:start + key_len + value_len]
+                entries.append((key, pickle.loads(payload), timestamp))
+        return entries
+
+    def size(self):
+        with self._locked(exclusive=False):
+            return sum(1 for index in range(self.slot_count) if self._read_slot(index)[1])
+
+    def incr_stats(self, stats):
+        with self._locked(exclusive=True):
+            _, _, _, _, hits, misses = self.HEADER.unpack_from(self.mm, 0)
+            hits += stats.get('hits', 0)
+            misses += stats.get('misses', 0)
+            struct.pack_into('<QQ', self.mm, self.HEADER.size - 16, hits, misses)
+
+    def stats(self):
+        with self._locked(exclusive=False):
+            _, _, _, _, hits, misses = self.HEADER.unpack_from(self.mm, 0)
+        return {"hits": hits, "misses": misses}
+
+
+class _FileLock:
+    """flock 컨텍스트 매니저"""
+    def __init__(self, fd, exclusive):
+        self.fd = fd
+        self.mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+
+    def __enter__(self):
+        fcntl.flock(self.fd, self.mode)
+        return self
+
+    def __exit__(self, *exc_info):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return False
+
+
+class RespError(Exception):
+    """Redis 서버가 돌려준 에러 응답"""
+
+
+class RespClient:
+    """최소한의 RESP(Redis 직렬화 프로토콜) 클라이언트
+
+    redis 패키지 없이 Redis 및 호환 서버(로컬 stand-in 포함)와 통신합니다.
+    """
+    def __init__(self, url, timeout=0.5):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self.sock = None
+        self.reader = None
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.reader = self.sock.makefile('rb')
+        if self.password:
+            self._call('AUTH', self.password)
+        if self.db:
+            self._call('SELECT', self.db)
+
+    def _close(self):
+        if self.sock is not None:
+            try:
+                self.reader.close()
+                self.sock.close()
+            except OSError:
+                pass
+        self.sock = None
+        self.reader = None
+
+    @staticmethod
+    def _encode(args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            if isinstance(arg, bytes):
+                data = arg
+            else:
+                data = str(arg).encode('utf-8')
+            parts.append(f"${len(data)}\r\n".encode())
+            parts.append(data)
+            parts.append(b"\r\n")
+        return b"".join(parts)
+
+    def _read_reply(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b'+':
+            return body.decode('utf-8')
+        if prefix == b'-':
+            raise RespError(body.decode('utf-8'))
+        if prefix == b':':
+            return int(body)
+        if prefix == b'$':
+            length = int(body)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if prefix == b'*':
+            length = int(body)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RespError(f"Unknown reply prefix: {prefix!r}")
+
+    def _call(self, *args):
+        self.sock.sendall(self._encode(args))
+        return self._read_reply()
+
+    def execute(self, *args):
+        """명령을 실행합니다. 연결이 끊겼으면 한 번 재연결합니다."""
+        return self.pipeline(args)[0]
+
+    def pipeline(self, *commands):
+        """여러 명령을 한 번의 왕복으로 보내고 응답 목록을 반환합니다. 연결이 끊겼으면 한 번 재연결합니다.
+
+        에러 응답이 있으면 나머지 응답을 모두 읽은 뒤 첫 RespError를 던집니다.
+        """
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    if self.sock is None:
+                        self._connect()
+                    self.sock.sendall(b"".join(self._encode(args) for args in commands))
+                    replies = []
+                    error = None
+                    for _ in commands:
+                        try:
+                            replies.append(self._read_reply())
+                        except RespError as e:
+                            error = error or e
+                            replies.append(None)
+                    if error is not None:
+                        raise error
+                    return replies
+                except (OSError, ConnectionError):
+                    self._close()
+                    if attempt == 1:
+                        raise
+
+
+class RedisBackend:
+    """Redis 해시 기반 공유 저장소
+
+    네임스페이스마다 하나의 해시(prefix:namespace)에 필드=키, 값=JSON [value, timestamp]로
+    저장하고, 정렬 집합(prefix:namespace:ts)에 키별 timestamp를 둬 오래된 키부터 제거합니다.
+    pickle을 쓰지 않으므로 Redis에 쓸 수 있는 쪽이 워커에서 코드를 실행할 수 없습니다.
+    Redis 장애 시에는 캐시 미스로 동작합니다.
+    """
+    shared = True
+    # 용량 초과 시 max_size의 이 비율까지 한 번에 줄임
+    EVICT_TO = 0.9
+
+    def __init__(self, url, namespace, max_size=1000, timeout=0.5, prefix='aivestor'):
+        self.client = RespClient(url, timeout=timeout)
+        self.hash_key = f"{prefix}:{namespace}"
+        self.ts_key = f"{prefix}:{namespace}:ts"
+        self.stats_key = f"{prefix}:{namespace}:stats"
+        self.max_size = max_size
+        # 이 워커가 새 키를 이만큼 추가할 때마다 한 번만 크기를 확인
+        self.check_every = max(int(max_size * (1 - self.EVICT_TO)), 1)
+        self.added_since_check = 0
+
+    def _pipeline(self, *commands, default=None):
+        try:
+            return self.client.pipeline(*commands)
+        except (OSError, ConnectionError, RespError) as e:
+            logger.warning(f"Redis cache command {commands[0][0]} failed: {str(e)}")
+            return default
+
+    def _execute(self, *args, default=None):
+        replies = self._pipeline(args)
+        return default if replies is None else replies[0]
+
+    @staticmethod
+    def _loads(payload):
+        """저장된 JSON을 (value, timestamp)로 읽습니다. 형식이 다르면(예: 이전 pickle 값) None."""
+        try:
+            value, timestamp = json.loads(payload)
+        except (ValueError, TypeError):
+            return None
+        return value, timestamp
+
+    def get(self, key, touch=True):
+        payload = self._execute('HGET', self.hash_key, key)
+        if payload is None:
+            return None
+        return self._loads(payload)
+
+    def set(self, key, value, timestamp):
+        payload = json.dumps([value, timestamp], separators=(',', ':'))
+        replies = self._pipeline(
+            ('HSET', self.hash_key, key, payload),
+            ('ZADD', self.ts_key, repr(timestamp), key)
+        )
+        if replies and replies[0]:
+            self.added_since_check += 1
+            if self.added_since_check >= self.check_every:
+                self.added_since_check = 0
+                self._evict_oldest()
+        return None
+
+    def _evict_oldest(self):
+        """용량을 넘었으면 timestamp가 오래된 키부터 max_size * EVICT_TO개까지 한 번에 제거합니다."""
+        size = self.size()
+        if size <= self.max_size:
+            return
+        count = size - int(self.max_size * self.EVICT_TO)
+        victims = self._execute('ZRANGE', self.ts_key, 0, count - 1, default=[]) or []
+        if victims:
+            self._pipeline(('HDEL', self.hash_key, *victims), ('ZREM', self.ts_key, *victims))
+
+    def delete(self, key):
+        self._pipeline(('HDEL', self.hash_key, key), ('ZREM', self.ts_key, key))
+
+    def items(self):
+        flat = self._execute('HGETALL', self.hash_key, default=[]) or []
+        entries = []
+        for i in range(0, len(flat), 2):
+            entry = self._loads(flat[i + 1])
+            if entry is not None:
+                entries.append((flat[i].decode('utf-8'), *entry))
+        return entries
+
+    def size(self):
+        return self._execute('HLEN', self.hash_key, default=0)
+
+    def incr_stats(self, stats):
+        commands = [('HINCRBY', self.stats_key, name, count) for name, count in stats.items() if count]
+        if commands:
+            self._pipeline(*commands)
+
+    def stats(self):
+        flat = self._execute('HGETALL', self.stats_key, default=[]) or []
+        stats = {"hits": 0, "misses": 0}
+        for i in range(0, len(flat), 2):
+            stats[flat[i].decode('utf-8')] = int(flat[i + 1])
+        return stats
+
+
+class SqliteBackend:
+    """SQLite 파일 기반 영속 저장소
+
+    테이블 하나(namespace)에 key, pickle 값, timestamp를 저장합니다.
+    같은 파일을 여러 워커가 열 수 있지만 히트/미스 합산은 지원하지 않습니다.
+    행 수는 열 때 한 번 세고 이후에는 쓰기마다 증감해 추적하므로, 쓰기마다 COUNT(*)로
+    테이블을 훑지 않습니다 (다른 워커의 쓰기는 정리할 때 다시 세어 반영).
+    """
+    shared = False
+
+    def __init__(self, path, namespace, max_size=10000):
+        self.path = path
+        self.table = ''.join(c for c in namespace if c.isalnum() or c == '_')
+        self.max_size = max_size
+        self.conn = None
+        self.pid = None
+        self.row_count = 0
+        self._open()
+
+    def _open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} '
+            '(key TEXT PRIMARY KEY, value BLOB NOT NULL, timestamp REAL NOT NULL)'
+        )
+        self.pid = os.getpid()
+        self.row_count = self._count_rows()
+
+    def _count_rows(self):
+        return self.conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def _db(self):
+        # fork 이후에는 부모의 연결을 쓰지 않고 새로 연다
+        if self.pid != os.getpid():
+            self._open()
+        return self.conn
+
+    def get(self, key, touch=True):
+        row = self._db().execute(f'SELECT value, timestamp FROM {self.table} WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, key, value, timestamp):
+        db = self._db()
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        # 새 키일 때만 행 수가 늘어남 (UPSERT는 기존 행을 갱신하면 changes가 1이라 구분이 안 됨)
+        inserted = db.execute(
+            f'INSERT OR IGNORE INTO {self.table} (key, value, timestamp) VALUES (?, ?, ?)',
+            (key, payload, timestamp)
+        ).rowcount
+        if inserted:
+            self.row_count += 1
+        else:
+            db.execute(f'UPDATE {self.table} SET value = ?, timestamp = ? WHERE key = ?', (payload, timestamp, key))
+
+        if self.row_count > self.max_size:
+            # 다른 워커가 쓴 행까지 반영해 다시 세고, 넘었으면 가장 오래된 10% 제거
+            self.row_count = self._count_rows()
+            if self.row_count > self.max_size:
+                db.execute(
+                    f'DELETE FROM {self.table} WHERE key IN '
+                    f'(SELECT key FROM {self.table} ORDER BY timestamp LIMIT ?)',
+                    (max(self.max_size // 10, 1),)
+                )
+                self.row_count = self._count_rows()
+        return None
+
+    def delete(self, key):
+        if self._db().execute(f'DELETE FROM {self.table} WHERE key = ?', (key,)).rowcount:
+            self.row_count = max(self.row_count - 1, 0)
+
+    def items(self):
+        rows = self._db().execute(f'SELECT key, value, timestamp FROM {self.table}').fetchall()
+        return [(key, pickle.loads(value), timestamp) for key, value, timestamp in rows]
+
+    def size(self):
+        self._db()
+        return self.row_count
+
+    def incr_stats(self, stats):
+        pass
+
+    def stats(self):
+        return None
+
+
+def create_cache_backend(backend, namespace, max_size, path=None):
+    """Config.CACHE_BACKEND 값에 맞는 백엔드를 생성합니다."""
+    from config import Config
+
+    if backend == 'sqlite':
+        return SqliteBackend(path, namespace, max_size=max_size)
+    if backend == 'shm':
+        directory = Config.CACHE_SHM_DIR or ('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+        path = os.path.join(directory, f"aivestor_{namespace}.cache")
+        # 선형 탐사 충돌을 줄이기 위해 슬롯 수를 최대 크기의 2배로 잡음
+        return SharedMemoryBackend(path, slot_count=max_size * 2, slot_size=Config.CACHE_SHM_SLOT_SIZE)
+    if backend == 'redis':
+        return RedisBackend(
+            Config.CACHE_REDIS_URL,
+            namespace,
+            max_size=max_size,
+            timeout=Config.CACHE_REDIS_TIMEOUT,
+            prefix=Config.CACHE_REDIS_PREFIX
+        )
+    if backend != 'memory':
+        logger.warning(f"Unknown cache backend '{backend}', falling back to memory")
+    return MemoryBackend(max_size)
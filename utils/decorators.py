@@ -1,5 +1,6 @@
 """데코레이터 유틸리티"""
 import time
+import inspect
 import logging
 from functools import wraps
 from config import Config
@@ -7,8 +8,8 @@ from config import Config
 logger = logging.getLogger(__name__)
 
 
-def retry_with_backoff(max_retries=None, backoff_factor=None):
-    """재시도 로직 데코레이터"""
+def retry_with_backoff(max_retries=None, backoff_factor=None, giveup=()):
+    """재시도 로직 데코레이터 (giveup에 지정한 예외는 재시도하지 않음)"""
     if max_retries is None:
         max_retries = Config.MAX_RETRIES
     if backoff_factor is None:
@@ -20,6 +21,8 @@ def retry_with_backoff(max_retries=None, backoff_factor=None):
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
+                except giveup:
+                    raise
                 except Exception as e:
                     if attempt == max_retries - 1:
                         logger.error(f"Final attempt failed for {func.__name__}: {str(e)}")
@@ -33,24 +36,61 @@ def retry_with_backoff(max_retries=None, backoff_factor=None):
     return decorator
 
 
+def _record_success(endpoint, start_time):
+    from utils.metrics import increment_request_count, add_response_time
+    
+    increment_request_count(endpoint)
+    response_time = time.time() - start_time
+    add_response_time(endpoint, response_time)
+    logger.info(f"{endpoint} completed in {response_time:.3f}s")
+
+
+def _record_error(endpoint, e):
+    from utils.metrics import increment_error_count
+    
+    increment_error_count(endpoint)
+    logger.error(f"Error in {endpoint}: {str(e)}")
+
+
 def track_performance(endpoint):
-    """성능 추적 데코레이터"""
+    """성능 추적 데코레이터 (async 뷰도 지원)
+    
+    요청 처리 중 기록되는 단계별 구간(utils.tracing)에 endpoint 라벨을 붙이고,
+    전체 처리 시간은 'total' 단계로 함께 기록합니다.
+    """
+    from utils.tracing import set_endpoint, reset_endpoint, stage_span
+    
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start_time = time.time()
+                token = set_endpoint(endpoint)
+                try:
+                    with stage_span('total'):
+                        result = await func(*args, **kwargs)
+                    _record_success(endpoint, start_time)
+                    return result
+                except Exception as e:
+                    _record_error(endpoint, e)
+                    raise
+                finally:
+                    reset_endpoint(token)
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            from utils.metrics import metrics
-            
             start_time = time.time()
+            token = set_endpoint(endpoint)
             try:
-                result = func(*args, **kwargs)
-                metrics['request_count'][endpoint] += 1
-                response_time = time.time() - start_time
-                metrics['response_times'][endpoint].append(response_time)
-                logger.info(f"{endpoint} completed in {response_time:.3f}s")
+                with stage_span('total'):
+                    result = func(*args, **kwargs)
+                _record_success(endpoint, start_time)
                 return result
             except Exception as e:
-                metrics['errors'][endpoint] += 1
-                logger.error(f"Error in {endpoint}: {str(e)}")
+                _record_error(endpoint, e)
                 raise
+            finally:
+                reset_endpoint(token)
         return wrapper
     return decorator
@@ -0,0 +1,162 @@
+"""가격 이력(OHLCV) 캐시
+
+티커별 일봉을 (6, n) float64 배열 하나로 보관합니다. 행은 OHLCV_FIELDS 순서
+(date, open, high, low, close, volume)이고 date는 1970-01-01 기준 일수입니다.
+각 행이 연속된 메모리라 열 단위 슬라이스/집계가 빠르며, directory를 지정하면
+티커별 .npy 파일로 저장해 다음 실행 때 memory-map으로 불러옵니다.
+"""
+import os
+import re
+import tempfile
+import threading
+import time
+import logging
+from collections import OrderedDict
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OHLCV_FIELDS = ('date', 'open', 'high', 'low', 'close', 'volume')
+DATE, OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(OHLCV_FIELDS))
+
+# 1970-01-01은 목요일이므로 (일수 + 3) // 7이 월요일 시작 주 번호
+_WEEK_OFFSET = 3
+
+
+def empty_series():
+    return np.empty((len(OHLCV_FIELDS), 0), dtype=np.float64)
+
+
+def merge_series(existing, new):
+    """기존 시리즈 뒤에 새 봉을 붙입니다. 겹치는 날짜는 새 값(장중에 바뀐 마지막 봉 등)으로 바꿉니다."""
+    if existing is None or existing.shape[1] == 0:
+        return np.array(new, dtype=np.float64)
+    if new.shape[1] == 0:
+        return existing
+    keep = existing[DATE] < new[DATE, 0]
+    return np.concatenate([existing[:, keep], new], axis=1)
+
+
+def slice_series(series, start_day=None, end_day=None):
+    """[start_day, end_day] 구간의 봉만 잘라냅니다 (날짜는 정렬돼 있으므로 이진 탐색)."""
+    dates = series[DATE]
+    lo = 0 if start_day is None else int(np.searchsorted(dates, start_day, side='left'))
+    hi = len(dates) if end_day is None else int(np.searchsorted(dates, end_day, side='right'))
+    return series[:, lo:hi]
+
+
+def resample_weekly(series):
+    """일봉을 주봉(월요일 날짜 라벨)으로 묶습니다."""
+    if series.shape[1] == 0:
+        return series
+    weeks = (series[DATE].astype(np.int64) + _WEEK_OFFSET) // 7
+    starts = np.flatnonzero(np.r_[True, weeks[1:] != weeks[:-1]])
+    ends = np.r_[starts[1:], series.shape[1]] - 1
+
+    weekly = np.empty((len(OHLCV_FIELDS), len(starts)), dtype=np.float64)
+    weekly[DATE] = weeks[starts] * 7 - _WEEK_OFFSET
+    weekly[OPEN] = series[OPEN, starts]
+    weekly[HIGH] = np.maximum.reduceat(series[HIGH], starts)
+    weekly[LOW] = np.minimum.reduceat(series[LOW], starts)
+    weekly[CLOSE] = series[CLOSE, ends]
+    weekly[VOLUME] = np.add.reduceat(series[VOLUME], starts)
+    return weekly
+
+
+class HistoryCache:
+    """티커별 OHLCV 시리즈 LRU 캐시 (선택적으로 디스크 .npy + memory-map)
+
+    마지막으로 업스트림을 확인한 시각을 함께 기록해, refresh_interval 안의
+    반복 요청은 업스트림을 호출하지 않고 메모리에서 바로 응답합니다.
+    """
+    def __init__(self, max_size=500, refresh_interval=300, directory=''):
+        self.max_size = max_size
+        self.refresh_interval = refresh_interval
+        self.directory = directory
+        self.lock = threading.Lock()
+        # {ticker: (series, checked_at)}
+        self.entries = OrderedDict()
+        self.counters = {'hits': 0, 'tail_fetches': 0, 'full_fetches': 0, 'disk_loads': 0}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ticker):
+        # 파일명으로 쓸 수 없는 문자는 치환 (티커는 validate_ticker를 통과한 값)
+        return os.path.join(self.directory, f"{re.sub(r'[^A-Za-z0-9.-]', '_', ticker.upper())}.npy")
+
+    def _load_from_disk(self, ticker):
+        if not self.directory:
+            return None
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            series = np.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable history file {path}: {e}")
+            return None
+        if series.ndim != 2 or series.shape[0] != len(OHLCV_FIELDS):
+            return None
+        self.counters['disk_loads'] += 1
+        # 디스크 파일은 저장 시각을 모르므로 바로 꼬리 구간을 확인하도록 checked_at=0
+        return series, 0.0
+
+    def _save_to_disk(self, ticker, series):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.history-', suffix='.npy')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, series)
+            os.replace(tmp_path, self._path(ticker))
+        except OSError as e:
+            logger.warning(f"Failed to save history for {ticker}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get(self, ticker):
+        """(series, needs_refresh)를 반환합니다. 없으면 (None, True)."""
+        with self.lock:
+            entry = self.entries.get(ticker)
+            if entry is None:
+                entry = self._load_from_disk(ticker)
+                if entry is None:
+                    return None, True
+                self._store_locked(ticker, entry)
+            else:
+                self.entries.move_to_end(ticker)
+
+            series, checked_at = entry
+            needs_refresh = time.time() - checked_at >= self.refresh_interval
+            if not needs_refresh:
+                self.counters['hits'] += 1
+            return series, needs_refresh
+
+    def _store_locked(self, ticker, entry):
+        self.entries[ticker] = entry
+        self.entries.move_to_end(ticker)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def update(self, ticker, base, new_rows):
+        """base(이전 시리즈, 전체를 새로 받았으면 None)에 업스트림에서 받은 봉을 합쳐 저장합니다."""
+        series = merge_series(base, new_rows)
+        with self.lock:
+            self.counters['full_fetches' if base is None else 'tail_fetches'] += 1
+            self._store_locked(ticker, (series, time.time()))
+
+        if self.directory and new_rows.shape[1]:
+            self._save_to_disk(ticker, series)
+        return series
+
+    def size(self):
+        with self.lock:
+            return len(self.entries)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "bars": int(sum(series.shape[1] for series, _ in self.entries.values())),
+                "directory": self.directory or None,
+                **self.counters
+            }
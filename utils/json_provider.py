@@ -0,0 +1,105 @@
+"""Flask JSON 프로바이더
+
+JSON_BACKEND가 auto/orjson이고 orjson이 설치돼 있으면 orjson으로, 아니면 표준
+json으로 직렬화합니다. 두 경우 모두 직렬화 시간은 'encode' 단계로 기록됩니다.
+"""
+import logging
+from flask.json.provider import DefaultJSONProvider
+from config import Config
+from utils.tracing import BACKGROUND_ENDPOINT, current_endpoint, stage_span
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+def _resolve_backend(name):
+    name = (name or 'auto').lower()
+    if name not in ('auto', 'orjson', 'stdlib'):
+        raise ValueError(f"Unknown JSON_BACKEND: {name}")
+    if name == 'stdlib':
+        return 'stdlib'
+    if orjson is None:
+        if name == 'orjson':
+            logger.warning("JSON_BACKEND=orjson but orjson is not installed, falling back to stdlib json")
+        return 'stdlib'
+    return 'orjson'
+
+
+# 앱 전체에서 사용하는 직렬화 백엔드 ('orjson' 또는 'stdlib')
+JSON_BACKEND = _resolve_backend(Config.JSON_BACKEND)
+
+# orjson.Fragment(미리 직렬화한 JSON 조각)는 orjson 3.9+에서만 지원
+FRAGMENTS_SUPPORTED = JSON_BACKEND == 'orjson' and hasattr(orjson, 'Fragment')
+
+# Flask 기본값(sort_keys=True)과 같은 출력을 내도록 키 정렬, datetime은 Flask 방식(HTTP date)으로
+_ORJSON_OPTIONS = (
+    orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson is not None else 0
+)
+
+
+def json_fragment(obj):
+    """obj를 한 번만 직렬화해 두고 응답 안 여러 곳에서 재사용할 수 있는 값으로 바꿉니다.
+
+    같은 시세 dict가 여러 기사에 들어갈 때 기사마다 다시 인코딩하지 않도록 씁니다.
+    Fragment를 쓸 수 없으면 obj를 그대로 반환합니다 (출력은 같음).
+    """
+    if not FRAGMENTS_SUPPORTED:
+        return obj
+    return orjson.Fragment(orjson.dumps(obj, option=_ORJSON_OPTIONS))
+
+
+def json_fragments(values):
+    """{key: obj}의 각 값을 json_fragment로 바꾼 새 dict를 반환합니다."""
+    if not FRAGMENTS_SUPPORTED:
+        return values
+    return {key: json_fragment(value) for key, value in values.items()}
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """jsonify 직렬화 시간을 'encode' 단계로 기록하는 JSON 프로바이더 (가능하면 orjson 사용)"""
+    backend = JSON_BACKEND
+
+    def _orjson_options(self, indent=False):
+        options = _ORJSON_OPTIONS if self.sort_keys else _ORJSON_OPTIONS & ~orjson.OPT_SORT_KEYS
+        return (options | orjson.OPT_INDENT_2) if indent else options
+
+    def _timed(self, func, *args, **kwargs):
+        # 성능 추적 대상이 아닌 요청(헬스체크 등)은 기록하지 않음
+        if current_endpoint() == BACKGROUND_ENDPOINT:
+            return func(*args, **kwargs)
+
+        with stage_span('encode'):
+            return func(*args, **kwargs)
+
+    def _dumps(self, obj, **kwargs):
+        # 표준 json 전용 인자(cls, separators 등)가 있으면 표준 json으로
+        if self.backend == 'orjson' and set(kwargs) <= {'indent'}:
+            option = self._orjson_options(bool(kwargs.get('indent')))
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+        return super().dumps(obj, **kwargs)
+
+    def dumps(self, obj, **kwargs):
+        return self._timed(self._dumps, obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.backend == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if self.backend != 'orjson':
+            return super().response(*args, **kwargs)
+
+        # str로 바꾸지 않고 orjson의 bytes를 그대로 응답 본문으로 사용
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = self._timed(
+            orjson.dumps, obj, default=self.default,
+            option=self._orjson_options(indent) | orjson.OPT_APPEND_NEWLINE
+        )
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -1,55 +1,222 @@
+import threading
+import time
+from bisect import bisect_left
 from collections import defaultdict
+from config import Config
+
+# 응답 시간 히스토그램 버킷 경계 (1ms부터 1.2배씩, 약 117초까지 / 상대 오차 ~10%)
+BUCKET_BOUNDS = tuple(0.001 * (1.2 ** i) for i in range(65))
+
+# 보관 기간(METRICS_RETENTION_HOURS)을 나누는 슬롯 수
+WINDOW_SLOTS = 24
+
+
+class LatencyHistogram:
+    """고정 버킷 히스토그램 - 기록 수와 관계없이 메모리와 집계 비용이 일정"""
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        self.counts[bisect_left(BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        for i, bucket_count in enumerate(other.counts):
+            self.counts[i] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, q):
+        """q(0~100) 백분위 값을 버킷 상한으로 근사합니다."""
+        if self.count == 0:
+            return 0
+
+        rank = q / 100 * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                upper = BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else self.max
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0,
+            "min": self.min or 0,
+            "max": self.max or 0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }
+
+
+class SlidingWindowHistogram:
+    """보관 기간을 WINDOW_SLOTS개 구간으로 나눈 링 버퍼 히스토그램
+
+    오래된 구간은 새 기록이 들어올 때 재사용되므로 메모리는 슬롯 수 x 버킷 수로 고정됩니다.
+    """
+    def __init__(self, window_seconds, slot_count=WINDOW_SLOTS):
+        self.slot_seconds = window_seconds / slot_count
+        self.slots = [LatencyHistogram() for _ in range(slot_count)]
+        self.slot_ids = [None] * slot_count
+        self.lock = threading.Lock()
+
+    def record(self, value, now=None):
+        slot_id = int((now or time.time()) // self.slot_seconds)
+        index = slot_id % len(self.slots)
+        with self.lock:
+            if self.slot_ids[index] != slot_id:
+                self.slots[index] = LatencyHistogram()
+                self.slot_ids[index] = slot_id
+            self.slots[index].record(value)
+
+    def snapshot(self, now=None):
+        """보관 기간 안의 구간들을 하나의 히스토그램으로 합칩니다."""
+        current_id = int((now or time.time()) // self.slot_seconds)
+        merged = LatencyHistogram()
+        with self.lock:
+            for slot_id, slot in zip(self.slot_ids, self.slots):
+                if slot_id is not None and current_id - slot_id < len(self.slots):
+                    merged.merge(slot)
+        return merged
+
+    def summary(self):
+        return self.snapshot().summary()
+
+
+def _new_window():
+    return SlidingWindowHistogram(Config.METRICS_RETENTION_HOURS * 3600)
+
+
+# 카운터 갱신/조회용 락 (여러 요청 스레드에서 동시에 증가시킴)
+_lock = threading.Lock()
 
 # 성능 메트릭스
 metrics = {
     'request_count': defaultdict(int),
-    'response_times': defaultdict(list),
+    'response_times': {},
     'cache_hits': 0,
     'cache_misses': 0,
+    'coalesced_requests': 0,
+    'stale_hits': 0,
+    'background_refreshes': 0,
+    'negative_cache_hits': 0,
+    'news_cache': defaultdict(int),
     'errors': defaultdict(int)
 }
 
 
+def _increment(name, count=1):
+    with _lock:
+        metrics[name] += count
+
+
+def _increment_keyed(name, key, count=1):
+    with _lock:
+        metrics[name][key] += count
+
+
 def increment_request_count(endpoint):
     """요청 카운트 증가"""
-    metrics['request_count'][endpoint] += 1
+    _increment_keyed('request_count', endpoint)
 
 
 def add_response_time(endpoint, response_time):
     """응답 시간 추가"""
-    metrics['response_times'][endpoint].append(response_time)
+    if not Config.ENABLE_METRICS:
+        return
+
+    with _lock:
+        histogram = metrics['response_times'].get(endpoint)
+        if histogram is None:
+            histogram = metrics['response_times'][endpoint] = _new_window()
+    histogram.record(response_time)
 
 
 def increment_error_count(endpoint):
     """에러 카운트 증가"""
-    metrics['errors'][endpoint] += 1
+    _increment_keyed('errors', endpoint)
 
 
-def increment_cache_hit():
+def increment_cache_hit(stale=False):
     """캐시 히트 증가"""
-    metrics['cache_hits'] += 1
+    with _lock:
+        metrics['cache_hits'] += 1
+        if stale:
+            metrics['stale_hits'] += 1
 
 
 def increment_cache_miss():
     """캐시 미스 증가"""
-    metrics['cache_misses'] += 1
+    _increment('cache_misses')
+
+
+def increment_coalesced_requests(count=1):
+    """in-flight 요청에 합류해 절약한 업스트림 호출 수 증가"""
+    _increment('coalesced_requests', count)
+
+
+def increment_background_refreshes(count=1):
+    """백그라운드 갱신으로 다시 가져온 티커 수 증가"""
+    _increment('background_refreshes', count)
+
+
+def increment_negative_cache_hit():
+    """negative cache로 업스트림 호출을 건너뛴 횟수 증가"""
+    _increment('negative_cache_hits')
+
+
+def increment_news_cache(event):
+    """뉴스 페이로드 캐시 이벤트(hit/miss/stale/not_modified) 카운트 증가"""
+    _increment_keyed('news_cache', event)
 
 
 def get_metrics():
-    """메트릭스 반환"""
-    return metrics
+    """메트릭스 스냅샷 반환 (응답 시간은 보관 기간 내 요약)"""
+    with _lock:
+        snapshot = {
+            name: dict(value) if isinstance(value, defaultdict) else value
+            for name, value in metrics.items()
+            if name != 'response_times'
+        }
+        histograms = dict(metrics['response_times'])
+
+    snapshot['response_times'] = {
+        endpoint: histogram.summary() for endpoint, histogram in histograms.items()
+    }
+    return snapshot
 
 
 def get_cache_hit_ratio():
     """캐시 히트 비율 계산"""
-    total = metrics['cache_hits'] + metrics['cache_misses']
-    return metrics['cache_hits'] / total if total > 0 else 0
+    with _lock:
+        hits, misses = metrics['cache_hits'], metrics['cache_misses']
+    total = hits + misses
+    return hits / total if total > 0 else 0
 
 
 def get_avg_response_times():
     """평균 응답 시간 계산"""
+    with _lock:
+        histograms = dict(metrics['response_times'])
+
     avg_response_times = {}
-    for endpoint, times in metrics['response_times'].items():
-        if times:
-            avg_response_times[endpoint] = sum(times) / len(times)
-    return avg_response_times
\ No newline at end of file
+    for endpoint, histogram in histograms.items():
+        summary = histogram.summary()
+        if summary['count']:
+            avg_response_times[endpoint] = summary['avg']
+    return avg_response_times
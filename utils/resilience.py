@@ -0,0 +1,261 @@
+"""업스트림 보호 유틸리티 (서킷 브레이커, 적응형 토큰 버킷)"""
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 업스트림이 요청을 제한했음을 나타내는 에러 메시지 조각
+THROTTLE_MARKERS = ('429', 'too many requests', 'rate limit', 'ratelimit')
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 업스트림을 호출하지 않았을 때"""
+
+
+class RateLimitExceeded(Exception):
+    """토큰 버킷에 여유가 없어 업스트림을 호출하지 않았을 때"""
+
+
+class UpstreamThrottledError(Exception):
+    """업스트림이 429 등으로 요청을 제한했을 때"""
+
+
+class UpstreamError(Exception):
+    """전송 에러(타임아웃, 연결/HTTP 실패)로 업스트림에서 데이터를 하나도 받지 못했을 때"""
+
+
+def is_throttle_error(exc):
+    """예외가 업스트림의 요청 제한(429)으로 인한 것인지 판단합니다."""
+    if isinstance(exc, UpstreamThrottledError) or type(exc).__name__ == 'YFRateLimitError':
+        return True
+    if getattr(getattr(exc, 'response', None), 'status_code', None) == 429:
+        return True
+    return is_throttle_message(str(exc))
+
+
+def is_throttle_message(message):
+    message = str(message).lower()
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+
+class CircuitBreaker:
+    """closed -> (연속 실패) -> open -> (recovery_timeout 경과) -> half_open -> closed/open
+
+    open 상태에서는 호출을 바로 거절하고, half_open 상태에서는 제한된 수의
+    시험 호출만 허용해 그 결과로 다시 닫거나 엽니다.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30, half_open_max_calls=1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.half_open_calls = 0
+        self.counters = {'rejected': 0, 'opened': 0}
+
+    def _transition(self, state):
+        if state != self.state:
+            logger.warning(f"Circuit breaker {self.state} -> {state}")
+        self.state = state
+        if state == self.OPEN:
+            self.opened_at = time.time()
+            self.counters['opened'] += 1
+        elif state == self.CLOSED:
+            self.failures = 0
+            self.opened_at = None
+        self.half_open_calls = 0
+
+    def allow(self):
+        """호출해도 되면 True. half_open 시험 호출 슬롯도 여기서 잡습니다."""
+        with self.lock:
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.recovery_timeout:
+                self._transition(self.HALF_OPEN)
+
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and self.half_open_calls < self.half_open_max_calls:
+                self.half_open_calls += 1
+                return True
+
+            self.counters['rejected'] += 1
+            return False
+
+    def release(self):
+        """allow()로 잡은 시험 호출 슬롯을 호출하지 않고 반납합니다."""
+        with self.lock:
+            if self.state == self.HALF_OPEN and self.half_open_calls > 0:
+                self.half_open_calls -= 1
+
+    def record_success(self):
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self._transition(self.CLOSED)
+            else:
+                self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self._transition(self.OPEN)
+                return
+
+            self.failures += 1
+            if self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._transition(self.OPEN)
+
+    def stats(self):
+        with self.lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(self.recovery_timeout - (time.time() - self.opened_at), 0)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_in": retry_in,
+                **self.counters
+            }
+
+
+class AdaptiveRateLimiter:
+    """업스트림 응답에 따라 속도를 조절하는 토큰 버킷 (AIMD)
+
+    429를 받으면 속도를 절반으로, 그 외 에러는 조금 줄이고,
+    성공할 때마다 max_rate까지 조금씩 되돌립니다.
+    """
+    THROTTLE_FACTOR = 0.5
+    ERROR_FACTOR = 0.9
+    RECOVERY_STEP = 0.05
+
+    def __init__(self, rate, burst, min_rate=0.5):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.counters = {'throttled': 0, 'rate_limited': 0, 'waited': 0}
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, max_wait=0):
+        """토큰을 하나 가져옵니다. max_wait(초) 안에 못 가져오면 False."""
+        deadline = time.monotonic() + max_wait
+        waited = False
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    if waited:
+                        self.counters['waited'] += 1
+                    return True
+
+                wait_time = (1 - self.tokens) / self.rate
+                if now + wait_time > deadline:
+                    self.counters['rate_limited'] += 1
+                    return False
+            waited = True
+            time.sleep(wait_time)
+
+    def reserve(self, max_wait=0):
+        """토큰 하나를 예약하고, 쓸 수 있을 때까지 기다려야 하는 시간(초)을 반환합니다.
+
+        max_wait 안에 쓸 수 없으면 예약하지 않고 None을 반환합니다. 스레드를 재우지
+        않으므로 이벤트 루프에서는 반환값만큼 asyncio.sleep한 뒤 호출하면 됩니다.
+        (예약분만큼 토큰이 음수가 되므로 뒤이은 acquire도 그만큼 더 기다림)
+        """
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait_time = max(0.0, (1 - self.tokens) / self.rate)
+            if wait_time > max_wait:
+                self.counters['rate_limited'] += 1
+                return None
+            self.tokens -= 1
+            if wait_time > 0:
+                self.counters['waited'] += 1
+            return wait_time
+
+    def on_success(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.RECOVERY_STEP)
+
+    def on_error(self, throttled=False):
+        with self.lock:
+            if throttled:
+                self.counters['throttled'] += 1
+            factor = self.THROTTLE_FACTOR if throttled else self.ERROR_FACTOR
+            self.rate = max(self.min_rate, self.rate * factor)
+
+    def stats(self):
+        with self.lock:
+            self._refill(time.monotonic())
+            return {
+                "rate": round(self.rate, 3),
+                "max_rate": self.max_rate,
+                "tokens": round(self.tokens, 2),
+                **self.counters
+            }
+
+
+class ProviderGuard:
+    """업스트림 호출을 서킷 브레이커와 토큰 버킷으로 감쌉니다."""
+    def __init__(self, breaker, limiter, max_wait=0):
+        self.breaker = breaker
+        self.limiter = limiter
+        self.max_wait = max_wait
+
+    def enter(self, wait=True):
+        """호출 전에 부릅니다. 호출할 수 없으면 CircuitOpenError/RateLimitExceeded를 던집니다."""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Upstream circuit is open")
+        if not self.limiter.acquire(self.max_wait if wait else 0):
+            self.breaker.release()
+            raise RateLimitExceeded("Upstream rate limit exceeded")
+
+    def reserve(self, max_wait):
+        """enter()와 같지만 토큰을 기다리지 않고 예약만 한 뒤 기다릴 시간(초)을 반환합니다."""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Upstream circuit is open")
+        wait_time = self.limiter.reserve(max_wait)
+        if wait_time is None:
+            self.breaker.release()
+            raise RateLimitExceeded("Upstream rate limit exceeded")
+        return wait_time
+
+    def success(self):
+        self.breaker.record_success()
+        self.limiter.on_success()
+
+    def failure(self, exc=None, throttled=None):
+        if throttled is None:
+            throttled = exc is not None and is_throttle_error(exc)
+        self.breaker.record_failure()
+        self.limiter.on_error(throttled=throttled)
+
+    def call(self, func, *args, **kwargs):
+        self.enter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.failure(e)
+            raise
+        self.success()
+        return result
+
+    def stats(self):
+        return {
+            "circuit_breaker": self.breaker.stats(),
+            "rate_limiter": self.limiter.stats()
+        }
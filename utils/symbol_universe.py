@@ -0,0 +1,165 @@
+"""종목 유니버스 인덱스
+
+SYMBOL_UNIVERSE_PATH의 CSV/JSON 파일에서 거래 가능한 종목 목록을 읽어
+티커 존재 여부 확인과 정규 표기 변환을 dict 조회 한 번으로 처리합니다.
+
+파일 형식
+- CSV: symbol 열(필수)과 aliases 열(선택, '|'로 구분)
+    symbol,name,aliases
+    BRK-B,Berkshire Hathaway,BRK.B|BRKB
+- JSON: 티커 목록, {"티커": [별칭...]} 맵, 또는 {"symbol", "aliases"} 객체 목록
+    ["AAPL", "MSFT"] / {"BRK-B": ["BRK.B"]} / [{"symbol": "GOOGL", "aliases": ["GOOG"]}]
+
+파일을 지정하지 않았거나 읽지 못했으면 형식 검증과 표기 정규화만 하고 모든 티커를 허용합니다.
+"""
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from config import Config
+from utils.validators import normalize_ticker
+
+logger = logging.getLogger(__name__)
+
+
+def _fold(ticker):
+    """표기 차이(BRK.B / BRK-B)를 무시하고 비교하기 위한 키"""
+    return ticker.replace('.', '-')
+
+
+def _read_entries(path):
+    """파일에서 (symbol, [aliases]) 목록을 읽습니다."""
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return [(symbol, aliases or []) for symbol, aliases in data.items()]
+        return [
+            (item, []) if isinstance(item, str) else (item.get('symbol'), item.get('aliases') or [])
+            for item in data
+        ]
+
+    with open(path, encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or 'symbol' not in reader.fieldnames:
+            raise ValueError("CSV must have a 'symbol' column")
+        return [
+            (row['symbol'], [alias for alias in (row.get('aliases') or '').split('|') if alias.strip()])
+            for row in reader
+        ]
+
+
+def _build_index(entries):
+    """(정규 티커 집합, {표기: 정규 티커}, {fold 키: 정규 티커})를 만듭니다."""
+    symbols = set()
+    lookup = {}
+    folded = {}
+    for symbol, aliases in entries:
+        canonical = normalize_ticker(symbol)
+        if canonical is None:
+            continue
+        symbols.add(canonical)
+        lookup[canonical] = canonical
+        folded.setdefault(_fold(canonical), canonical)
+        for alias in aliases:
+            key = alias.strip().upper() if isinstance(alias, str) else None
+            if key:
+                lookup[key] = canonical
+                folded.setdefault(_fold(key), canonical)
+    return frozenset(symbols), lookup, folded
+
+
+class SymbolUniverse:
+    """종목 유니버스 (파일이 바뀌면 refresh_interval마다 다시 읽음)"""
+    def __init__(self, path='', refresh_interval=3600):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.reload_lock = threading.Lock()
+        self.lock = threading.Lock()
+        # (symbols, lookup, folded) - 다시 읽을 때 통째로 교체하므로 조회에는 락이 필요 없음
+        self.index = None
+        self.loaded_mtime = None
+        self.loaded_at = None
+        self.checked_at = 0.0
+        self.counters = {'resolved': 0, 'aliased': 0, 'rejected': 0, 'reloads': 0}
+        if path:
+            self.refresh()
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def refresh(self):
+        """파일이 바뀌었으면 다시 읽습니다. 실패하면 이전 인덱스를 유지합니다."""
+        self.checked_at = time.time()
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime == self.loaded_mtime:
+                return False
+            index = _build_index(_read_entries(self.path))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Failed to load symbol universe from {self.path}: {e}")
+            return False
+
+        self.index = index
+        self.loaded_mtime = mtime
+        self.loaded_at = self.checked_at
+        self._count('reloads')
+        logger.info(f"Loaded {len(index[0])} symbols ({len(index[1])} spellings) from {self.path}")
+        return True
+
+    def _maybe_refresh(self):
+        if not self.path or time.time() - self.checked_at < self.refresh_interval:
+            return
+        # 다른 스레드가 읽는 중이면 기다리지 않고 기존 인덱스로 응답
+        if self.reload_lock.acquire(blocking=False):
+            try:
+                self.refresh()
+            finally:
+                self.reload_lock.release()
+
+    @property
+    def loaded(self):
+        return self.index is not None
+
+    def resolve(self, ticker):
+        """정규 티커를 반환합니다. 형식이 잘못됐거나 유니버스에 없으면 None."""
+        normalized = normalize_ticker(ticker)
+        if normalized is None:
+            return None
+
+        self._maybe_refresh()
+        index = self.index
+        if index is None:
+            return normalized
+
+        _, lookup, folded = index
+        key = ticker.strip().upper()
+        canonical = lookup.get(key) or lookup.get(normalized) or folded.get(_fold(normalized))
+        if canonical is None:
+            self._count('rejected')
+        else:
+            self._count('resolved' if canonical == normalized else 'aliased')
+        return canonical
+
+    def __contains__(self, ticker):
+        return self.resolve(ticker) is not None
+
+    def stats(self):
+        index = self.index
+        with self.lock:
+            counters = dict(self.counters)
+        return {
+            "path": self.path or None,
+            "loaded": index is not None,
+            "symbols": len(index[0]) if index else 0,
+            "spellings": len(index[1]) if index else 0,
+            "loaded_at": self.loaded_at,
+            **counters
+        }
+
+
+# 앱 전체에서 공유하는 종목 유니버스
+symbol_universe = SymbolUniverse(Config.SYMBOL_UNIVERSE_PATH, Config.SYMBOL_UNIVERSE_REFRESH)
@@ -0,0 +1,322 @@
+"""요청 단계별 지연 시간 측정 및 Prometheus 텍스트 포맷 내보내기
+
+track_performance가 요청의 엔드포인트 이름을 contextvar에 기록하고,
+stage_span/trace_stage로 감싼 구간(백엔드 호출, 티커 일괄 조회, 업스트림 호출,
+응답 인코딩 등)은 그 엔드포인트와 단계 이름을 라벨로 히스토그램에 누적됩니다.
+
+gunicorn처럼 워커 프로세스가 여러 개면 METRICS_MULTIPROC_DIR에 워커별 파일을
+주기적으로 저장하고, 스크레이프 시 모든 파일을 합산해 내보냅니다.
+종료된 워커의 파일은 gunicorn child_exit 훅(gunicorn.conf.py)에서 보관 파일 하나에
+합친 뒤 지우므로, 카운터는 줄어들지 않고 파일 수는 살아 있는 워커 수로 유지됩니다.
+"""
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+import logging
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows 등
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Prometheus 히스토그램 버킷 상한 (초)
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 요청 밖(백그라운드 갱신, 스냅샷 등)에서 실행된 구간의 엔드포인트 라벨
+BACKGROUND_ENDPOINT = 'background'
+
+_current_endpoint = ContextVar('endpoint', default=BACKGROUND_ENDPOINT)
+
+# {(endpoint, stage): [버킷별 개수..., +Inf 개수, 합계]} - 프로세스 시작 이후 누적
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_stage_stats = {}
+_last_flush = 0.0
+# 워커 재시작으로 pid가 재사용돼도 이전 워커의 누적값을 덮어쓰지 않도록 생성 시각을 붙임
+_worker_file = None
+_worker_pid = None
+
+# 종료된 워커들의 누적값을 합쳐 둔 파일 (collect_stage_stats의 glob에 함께 걸림)
+ARCHIVE_FILE = 'stages_archive.json'
+
+
+def current_endpoint():
+    return _current_endpoint.get()
+
+
+def set_endpoint(endpoint):
+    """현재 요청(스레드/코루틴)의 엔드포인트 라벨을 설정하고 reset용 토큰을 반환합니다."""
+    return _current_endpoint.set(endpoint)
+
+
+def reset_endpoint(token):
+    _current_endpoint.reset(token)
+
+
+def with_current_endpoint(func):
+    """executor에서 실행될 함수가 호출한 요청의 엔드포인트 라벨을 이어받도록 감쌉니다."""
+    endpoint = _current_endpoint.get()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current_endpoint.set(endpoint)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_endpoint.reset(token)
+    return wrapper
+
+
+def trace_stream(iterable, stage='stream'):
+    """요청 함수가 반환된 뒤에 소비되는 스트리밍 응답 이터레이터를 감쌉니다.
+
+    매 단계마다 반환 시점의 엔드포인트 라벨을 다시 설정하고, 마지막 항목까지
+    보내는 데 걸린 시간을 stage 단계로 기록합니다.
+    """
+    endpoint = _current_endpoint.get()
+
+    def generate():
+        start_time = time.perf_counter()
+        iterator = iter(iterable)
+        try:
+            while True:
+                token = _current_endpoint.set(endpoint)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    _current_endpoint.reset(token)
+                yield item
+        finally:
+            record_stage(stage, time.perf_counter() - start_time, endpoint=endpoint)
+    return generate()
+
+
+def record_stage(stage, seconds, endpoint=None):
+    """단계 소요 시간을 히스토그램에 누적합니다."""
+    if not Config.ENABLE_METRICS:
+        return
+
+    key = (endpoint or _current_endpoint.get(), stage)
+    with _lock:
+        stats = _stage_stats.get(key)
+        if stats is None:
+            stats = _stage_stats[key] = [0] * (len(STAGE_BUCKETS) + 1) + [0.0]
+        stats[bisect_left(STAGE_BUCKETS, seconds)] += 1
+        stats[-1] += seconds
+
+    _maybe_flush()
+
+
+@contextmanager
+def stage_span(stage):
+    """with 블록의 실행 시간을 현재 엔드포인트의 stage 단계로 기록합니다 (예외가 나도 기록)."""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start_time)
+
+
+def trace_stage(stage):
+    """함수 전체를 stage 단계로 기록하는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_stage_async(stage):
+    """코루틴 함수용 trace_stage"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with stage_span(stage):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _multiproc_dir():
+    return Config.METRICS_MULTIPROC_DIR
+
+
+def _worker_path():
+    """이 프로세스의 파일 경로 (fork된 워커는 새 파일을 씀)"""
+    global _worker_file, _worker_pid
+    if _worker_pid != os.getpid():
+        _worker_pid = os.getpid()
+        _worker_file = os.path.join(_multiproc_dir(), f"stages_{_worker_pid}_{time.time_ns()}.json")
+    return _worker_file
+
+
+def _serialize(stats):
+    return [[endpoint, stage, values] for (endpoint, stage), values in stats.items()]
+
+
+def flush_stage_stats():
+    """이 워커의 누적값을 METRICS_MULTIPROC_DIR의 워커별 파일에 저장합니다."""
+    global _last_flush
+    if not _multiproc_dir():
+        return
+
+    # 오래된 값이 최신 파일을 덮어쓰지 않도록 저장은 한 번에 하나씩
+    with _flush_lock:
+        with _lock:
+            payload = _serialize(_stage_stats)
+            _last_flush = time.time()
+            path = _worker_path()
+
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            _write_entries(path, payload)
+        except OSError as e:
+            logger.warning(f"Failed to write stage metrics to {directory}: {e}")
+
+
+@contextmanager
+def _directory_lock(exclusive):
+    """보관 파일로 합치는 동안 합산이 같은 값을 두 번 읽거나 빠뜨리지 않도록 거는 디렉토리 락"""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(_multiproc_dir(), '.stages.lock'), 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _read_entries(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Skipping unreadable stage metrics file {path}: {e}")
+        return []
+
+
+def _write_entries(path, entries):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.stages-')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(entries, f)
+    os.replace(tmp_path, path)
+
+
+def retire_worker_stats(pid):
+    """종료된 워커(pid)의 파일을 보관 파일에 합치고 지웁니다 (gunicorn child_exit 훅에서 호출)."""
+    directory = _multiproc_dir()
+    if not directory or not os.path.isdir(directory):
+        return
+
+    paths = glob.glob(os.path.join(directory, f'stages_{pid}_*.json'))
+    if not paths:
+        return
+
+    archive_path = os.path.join(directory, ARCHIVE_FILE)
+    try:
+        with _directory_lock(exclusive=True):
+            total = {}
+            for path in [archive_path] + paths:
+                if path == archive_path and not os.path.exists(path):
+                    continue
+                for endpoint, stage, values in _read_entries(path):
+                    _merge(total, endpoint, stage, values)
+            _write_entries(archive_path, _serialize(total))
+            for path in paths:
+                os.remove(path)
+    except OSError as e:
+        logger.warning(f"Failed to retire stage metrics of worker {pid}: {e}")
+
+
+def reset_stage_files():
+    """이전 실행이 남긴 워커별/보관 파일을 지웁니다 (gunicorn 마스터 시작 시 호출).
+
+    새 마스터는 새 프로세스이므로 다른 카운터처럼 0에서 다시 시작합니다.
+    저장 도중 종료된 워커가 남긴 임시 파일도 함께 지웁니다.
+    """
+    directory = _multiproc_dir()
+    if not directory or not os.path.isdir(directory):
+        return
+    stale = glob.glob(os.path.join(directory, 'stages_*.json')) + glob.glob(os.path.join(directory, '.stages-*'))
+    for path in stale:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Failed to remove stale stage metrics file {path}: {e}")
+
+
+def _maybe_flush():
+    if _multiproc_dir() and time.time() - _last_flush >= Config.METRICS_FLUSH_INTERVAL:
+        flush_stage_stats()
+
+
+def _merge(total, endpoint, stage, values):
+    key = (endpoint, stage)
+    merged = total.get(key)
+    if merged is None:
+        total[key] = list(values)
+        return
+    for i, value in enumerate(values):
+        merged[i] += value
+
+
+def collect_stage_stats():
+    """모든 워커의 누적값을 합산해 {(endpoint, stage): values}로 반환합니다.
+
+    종료된 워커의 값(보관 파일)도 합산에 포함해 카운터가 줄어들지 않게 합니다.
+    """
+    if not _multiproc_dir():
+        with _lock:
+            return {key: list(values) for key, values in _stage_stats.items()}
+
+    # 이 워커의 최신 값을 먼저 저장한 뒤 파일만 읽어서 합산
+    flush_stage_stats()
+    total = {}
+    if not os.path.isdir(_multiproc_dir()):
+        return total
+    with _directory_lock(exclusive=False):
+        for path in glob.glob(os.path.join(_multiproc_dir(), 'stages_*.json')):
+            for endpoint, stage, values in _read_entries(path):
+                _merge(total, endpoint, stage, values)
+    return total
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(name='aivestor_stage_duration_seconds'):
+    """단계별 히스토그램을 Prometheus 텍스트 포맷(0.0.4)으로 만듭니다."""
+    lines = [
+        f"# HELP {name} Time spent in each processing stage, by endpoint.",
+        f"# TYPE {name} histogram"
+    ]
+    for (endpoint, stage), values in sorted(collect_stage_stats().items()):
+        labels = f'endpoint="{_escape_label(endpoint)}",stage="{_escape_label(stage)}"'
+        cumulative = 0
+        for bound, count in zip(STAGE_BUCKETS, values):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        cumulative += values[len(STAGE_BUCKETS)]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {values[-1]}')
+        lines.append(f'{name}_count{{{labels}}} {cumulative}')
+    return '\n'.join(lines) + '\n'
@@ -1,16 +1,34 @@
 """유효성 검증 유틸리티"""
+import re
 from datetime import datetime
 
+# 기본적인 알파벳과 숫자, 점, 하이픈만 허용 (1~10자)
+_TICKER_PATTERN = re.compile(r'[A-Za-z0-9.\-]{1,10}')
+
+# BRK.B처럼 점 뒤에 한 글자가 오는 주식 클래스 표기 (Yahoo 형식은 BRK-B)
+_SHARE_CLASS_PATTERN = re.compile(r'([A-Z0-9]+)\.([A-Z])')
+# 한 글자 거래소 접미사 (VOD.L, 7203.T 등)는 주식 클래스로 보지 않음
+_SINGLE_LETTER_EXCHANGES = frozenset('FLTV')
+
 
 def validate_ticker(ticker):
     """티커 형식을 검증합니다."""
     if not ticker or not isinstance(ticker, str):
         return False
-    if len(ticker) > 10 or len(ticker) < 1:
-        return False
-    # 기본적인 알파벳과 숫자, 점, 하이픈만 허용
-    allowed_chars = set('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-')
-    return all(c.upper() in allowed_chars for c in ticker)
+    return _TICKER_PATTERN.fullmatch(ticker) is not None
+
+
+def normalize_ticker(ticker):
+    """티커를 정규 표기(대문자, 주식 클래스는 하이픈)로 바꿉니다. 형식이 잘못됐으면 None."""
+    if not isinstance(ticker, str):
+        return None
+    ticker = ticker.strip().upper()
+    if not validate_ticker(ticker):
+        return None
+    match = _SHARE_CLASS_PATTERN.fullmatch(ticker)
+    if match and match.group(2) not in _SINGLE_LETTER_EXCHANGES:
+        return f"{match.group(1)}-{match.group(2)}"
+    return ticker
 
 
 def validate_date_format(date_str):
@@ -22,19 +40,21 @@ def validate_date_format(date_str):
         return False
 
 
+def get_current_price(info):
+    """regularMarketPrice, currentPrice 순서로 처음 값이 있는 필드를 반환합니다 (키가 있어도 None이면 건너뜀)."""
+    for field in ('regularMarketPrice', 'currentPrice'):
+        if info.get(field) is not None:
+            return info[field]
+    return None
+
+
 def validate_stock_data(info):
     """주식 데이터 검증"""
     if not info or not isinstance(info, dict):
         return False, "데이터가 없거나 올바르지 않은 형식입니다"
     
     # 가격 검증
-    price_fields = ['regularMarketPrice', 'currentPrice']
-    current_price = None
-    for field in price_fields:
-        if field in info and info[field] is not None:
-            current_price = info[field]
-            break
-    
+    current_price = get_current_price(info)
     if current_price is None:
         return False, "현재 가격 정보가 없습니다"
     